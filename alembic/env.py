@@ -27,8 +27,14 @@ from app.db.base import Base
 from app.models import (
     audit_log,
     communication_log,
+    integration_health,
+    job,
     organization,
+    outbox,
+    parked_event,
+    reconciliation,
     subscription,
+    sync_watermark,
     user,
     webhooks,
 )
@@ -0,0 +1,56 @@
+"""Keyset pagination indexes
+
+Revision ID: 3f9c2a71d8e4
+Revises: b44dfd07e3da
+Create Date: 2026-10-19 09:12:04.118230
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c2a71d8e4"
+down_revision: Union[str, None] = "b44dfd07e3da"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_users_org_created_id",
+        "users",
+        ["org_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_logs_org_timestamp_id",
+        "audit_logs",
+        ["org_id", "timestamp", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_webhook_logs_org_created_id",
+        "webhook_logs",
+        ["org_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_logs_org_created_id", table_name="webhook_logs")
+    op.drop_index("ix_audit_logs_org_timestamp_id", table_name="audit_logs")
+    op.drop_index("ix_users_org_created_id", table_name="users")
+    op.drop_column("users", "created_at")
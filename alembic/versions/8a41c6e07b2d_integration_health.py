@@ -0,0 +1,83 @@
+"""Integration health table
+
+Revision ID: 8a41c6e07b2d
+Revises: 3f9c2a71d8e4
+Create Date: 2026-10-19 12:31:47.502114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a41c6e07b2d"
+down_revision: Union[str, None] = "3f9c2a71d8e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL = """
+WITH scopes AS (
+    SELECT service, org_id, status, event_id, created_at FROM webhook_logs
+    UNION ALL
+    SELECT service, '*', status, event_id, created_at FROM webhook_logs
+),
+last_success AS (
+    SELECT DISTINCT ON (service, org_id) service, org_id, created_at, event_id
+    FROM scopes WHERE status = 'processed'
+    ORDER BY service, org_id, created_at DESC
+),
+last_failure AS (
+    SELECT DISTINCT ON (service, org_id) service, org_id, created_at, event_id
+    FROM scopes WHERE status = 'failed'
+    ORDER BY service, org_id, created_at DESC
+),
+counts AS (
+    SELECT service, org_id,
+        count(*) FILTER (WHERE status = 'processed') AS processed_count,
+        count(*) FILTER (WHERE status = 'failed') AS failed_count
+    FROM scopes GROUP BY service, org_id
+)
+INSERT INTO integration_health (
+    service, org_id, last_success_at, last_event_id, last_failure_at,
+    last_failed_event_id, processed_count, failed_count
+)
+SELECT c.service, c.org_id, s.created_at, s.event_id, f.created_at, f.event_id,
+    c.processed_count, c.failed_count
+FROM counts c
+LEFT JOIN last_success s ON s.service = c.service AND s.org_id = c.org_id
+LEFT JOIN last_failure f ON f.service = c.service AND f.org_id = c.org_id
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "integration_health",
+        sa.Column(
+            "service",
+            postgresql.ENUM(name="servicetype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("org_id", sa.String(), nullable=False),
+        sa.Column("last_success_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_event_id", sa.String(), nullable=True),
+        sa.Column("last_failure_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_failed_event_id", sa.String(), nullable=True),
+        sa.Column("processed_count", sa.BigInteger(), nullable=False),
+        sa.Column("failed_count", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("service", "org_id"),
+    )
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_table("integration_health")
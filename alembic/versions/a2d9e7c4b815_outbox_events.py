@@ -0,0 +1,82 @@
+"""Outbox events and organization webhook endpoints
+
+Revision ID: a2d9e7c4b815
+Revises: f1c6d8e3a940
+Create Date: 2026-10-19 18:40:51.207734
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a2d9e7c4b815"
+down_revision: Union[str, None] = "f1c6d8e3a940"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("organizations", sa.Column("webhook_url", sa.String(), nullable=True))
+    op.add_column(
+        "organizations", sa.Column("webhook_secret", sa.String(), nullable=True)
+    )
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("org_id", sa.UUID(), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "failed", name="outboxstatus"),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(["org_id"], ["organizations.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_outbox_events_pending",
+        "outbox_events",
+        ["org_id", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        "ix_outbox_events_entity",
+        "outbox_events",
+        ["org_id", "entity_type", "entity_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_events_entity", table_name="outbox_events")
+    op.drop_index(
+        "ix_outbox_events_pending",
+        table_name="outbox_events",
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.drop_table("outbox_events")
+    sa.Enum(name="outboxstatus").drop(op.get_bind())
+    op.drop_column("organizations", "webhook_secret")
+    op.drop_column("organizations", "webhook_url")
@@ -0,0 +1,31 @@
+"""Audit log details and the imported_users action
+
+Revision ID: b6e1f3d9a527
+Revises: a2d9e7c4b815
+Create Date: 2026-10-19 19:58:14.330612
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e1f3d9a527"
+down_revision: Union[str, None] = "a2d9e7c4b815"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("audit_logs", sa.Column("details", sa.JSON(), nullable=True))
+    # Enum members are stored by name
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE auditaction ADD VALUE IF NOT EXISTS 'IMPORTED_USERS'")
+
+
+def downgrade() -> None:
+    # Postgres cannot drop an enum value; IMPORTED_USERS stays in the type
+    op.drop_column("audit_logs", "details")
@@ -0,0 +1,52 @@
+"""Webhook stage timings
+
+Revision ID: c5d18e94f3a7
+Revises: 8a41c6e07b2d
+Create Date: 2026-10-19 13:05:12.840337
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d18e94f3a7"
+down_revision: Union[str, None] = "8a41c6e07b2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # received_at was stamped with the app's import time in local (UTC) time.
+    op.alter_column(
+        "webhook_logs",
+        "received_at",
+        type_=sa.DateTime(timezone=True),
+        existing_type=sa.DateTime(),
+        postgresql_using="received_at AT TIME ZONE 'UTC'",
+        server_default=sa.text("now()"),
+    )
+    op.add_column(
+        "webhook_logs",
+        sa.Column("stage_ms", postgresql.ARRAY(sa.Integer()), nullable=True),
+    )
+    op.create_index(
+        "ix_webhook_logs_created_at", "webhook_logs", ["created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_logs_created_at", table_name="webhook_logs")
+    op.drop_column("webhook_logs", "stage_ms")
+    op.alter_column(
+        "webhook_logs",
+        "received_at",
+        type_=sa.DateTime(),
+        existing_type=sa.DateTime(timezone=True),
+        postgresql_using="received_at AT TIME ZONE 'UTC'",
+        server_default=None,
+    )
@@ -0,0 +1,80 @@
+"""Jobs
+
+Revision ID: c8f4a1e6d392
+Revises: b6e1f3d9a527
+Create Date: 2026-10-19 19:04:51.270318
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c8f4a1e6d392"
+down_revision: Union[str, None] = "b6e1f3d9a527"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("kind", sa.Enum("webhook_replay", name="jobkind"), nullable=False),
+        sa.Column("org_id", sa.UUID(), nullable=False),
+        sa.Column("created_by", sa.UUID(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "queued",
+                "running",
+                "completed",
+                "failed",
+                "cancelled",
+                name="jobstatus",
+            ),
+            nullable=False,
+        ),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("checkpoint", sa.JSON(), nullable=True),
+        sa.Column("processed_count", sa.BigInteger(), nullable=False),
+        sa.Column("total_count", sa.BigInteger(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_jobs_org_created_id",
+        "jobs",
+        ["org_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_jobs_status_updated", "jobs", ["status", "updated_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_updated", table_name="jobs")
+    op.drop_index("ix_jobs_org_created_id", table_name="jobs")
+    op.drop_table("jobs")
+    sa.Enum(name="jobstatus").drop(op.get_bind())
+    sa.Enum(name="jobkind").drop(op.get_bind())
@@ -0,0 +1,46 @@
+"""Organization offboarding jobs and user foreign key indexes
+
+Revision ID: d4a7b2c9e158
+Revises: c8f4a1e6d392
+Create Date: 2026-10-19 20:11:37.402961
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a7b2c9e158"
+down_revision: Union[str, None] = "c8f4a1e6d392"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Offboarding finds a user's rows through these, and deleting a user checks them
+USER_FK_INDEXES = (
+    ("ix_audit_logs_user_id", "audit_logs"),
+    ("ix_subscriptions_user_id", "subscriptions"),
+    ("ix_communication_logs_user_id", "communication_logs"),
+)
+
+
+def upgrade() -> None:
+    # Built without blocking writes to the tables
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE jobkind ADD VALUE IF NOT EXISTS 'org_offboarding'")
+        for name, table in USER_FK_INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["user_id"],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    # Postgres cannot drop an enum value; org_offboarding stays in the type
+    with op.get_context().autocommit_block():
+        for name, table in USER_FK_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,67 @@
+"""User reconciliations
+
+Revision ID: d7e2a4b91c06
+Revises: c5d18e94f3a7
+Create Date: 2026-10-19 14:12:40.118305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7e2a4b91c06"
+down_revision: Union[str, None] = "c5d18e94f3a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_reconciliations",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("org_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("running", "completed", "failed", name="reconciliationstatus"),
+            nullable=False,
+        ),
+        sa.Column("next_page", sa.Integer(), nullable=False),
+        sa.Column("total_pages", sa.Integer(), nullable=True),
+        sa.Column("fetched_count", sa.BigInteger(), nullable=False),
+        sa.Column("created_count", sa.BigInteger(), nullable=False),
+        sa.Column("updated_count", sa.BigInteger(), nullable=False),
+        sa.Column("conflict_count", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "started_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["org_id"], ["organizations.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_user_reconciliations_org_started",
+        "user_reconciliations",
+        ["org_id", "started_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_user_reconciliations_org_started", table_name="user_reconciliations"
+    )
+    op.drop_table("user_reconciliations")
+    sa.Enum(name="reconciliationstatus").drop(op.get_bind())
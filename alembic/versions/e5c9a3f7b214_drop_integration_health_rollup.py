@@ -0,0 +1,41 @@
+"""Drop the service-wide integration health rows
+
+Revision ID: e5c9a3f7b214
+Revises: d4a7b2c9e158
+Create Date: 2026-10-19 21:02:14.318650
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5c9a3f7b214"
+down_revision: Union[str, None] = "d4a7b2c9e158"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP = """
+INSERT INTO integration_health (
+    service, org_id, last_success_at, last_event_id, last_failure_at,
+    last_failed_event_id, processed_count, failed_count
+)
+SELECT service, '*',
+    max(last_success_at),
+    (array_agg(last_event_id ORDER BY last_success_at DESC NULLS LAST))[1],
+    max(last_failure_at),
+    (array_agg(last_failed_event_id ORDER BY last_failure_at DESC NULLS LAST))[1],
+    sum(processed_count), sum(failed_count)
+FROM integration_health
+GROUP BY service
+"""
+
+
+def upgrade() -> None:
+    # Service-wide health is now summed from the organizations' rows
+    op.execute("DELETE FROM integration_health WHERE org_id = '*'")
+
+
+def downgrade() -> None:
+    op.execute(ROLLUP)
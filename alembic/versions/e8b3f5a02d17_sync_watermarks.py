@@ -0,0 +1,46 @@
+"""Sync watermarks
+
+Revision ID: e8b3f5a02d17
+Revises: d7e2a4b91c06
+Create Date: 2026-10-19 16:05:12.402877
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b3f5a02d17"
+down_revision: Union[str, None] = "d7e2a4b91c06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_watermarks",
+        sa.Column("org_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "service",
+            postgresql.ENUM(name="servicetype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("watermark_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("watermark_id", sa.String(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(["org_id"], ["organizations.id"]),
+        sa.PrimaryKeyConstraint("org_id", "service"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sync_watermarks")
@@ -0,0 +1,66 @@
+"""Parked events
+
+Revision ID: f1c6d8e3a940
+Revises: e8b3f5a02d17
+Create Date: 2026-10-19 17:22:08.613540
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c6d8e3a940"
+down_revision: Union[str, None] = "e8b3f5a02d17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "parked_events",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("event_id", sa.String(), nullable=False),
+        sa.Column(
+            "service",
+            postgresql.ENUM(name="servicetype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("org_id", sa.String(), nullable=False),
+        sa.Column(
+            "dependency",
+            sa.Enum("customer", "subscription", name="eventdependency"),
+            nullable=False,
+        ),
+        sa.Column("dependency_key", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "parked_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("event_id"),
+    )
+    op.create_index(
+        "ix_parked_events_dependency",
+        "parked_events",
+        ["dependency", "dependency_key"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_parked_events_expires_at", "parked_events", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_parked_events_expires_at", table_name="parked_events")
+    op.drop_index("ix_parked_events_dependency", table_name="parked_events")
+    op.drop_table("parked_events")
+    sa.Enum(name="eventdependency").drop(op.get_bind())
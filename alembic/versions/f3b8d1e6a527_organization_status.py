@@ -0,0 +1,35 @@
+"""Organization status, set while an organization is offboarded
+
+Revision ID: f3b8d1e6a527
+Revises: e5c9a3f7b214
+Create Date: 2026-10-19 22:14:51.207384
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b8d1e6a527"
+down_revision: Union[str, None] = "e5c9a3f7b214"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+organization_status = sa.Enum("active", "offboarding", name="organizationstatus")
+
+
+def upgrade() -> None:
+    organization_status.create(op.get_bind())
+    op.add_column(
+        "organizations",
+        sa.Column(
+            "status", organization_status, server_default="active", nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("organizations", "status")
+    organization_status.drop(op.get_bind())
@@ -0,0 +1,58 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_active_user, resolve_org_scope
+from app.core.config import settings
+from app.core.enums import AuditAction
+from app.core.principal import Principal
+from app.db.session import get_db
+from app.models.audit_log import AuditLog
+from app.schemas.audit_log import AuditLogRead
+from app.schemas.pagination import CursorPage
+from app.utils.pagination import paginate_keyset
+
+router = APIRouter()
+
+
+@router.get("/", response_model=CursorPage[AuditLogRead])
+def list_audit_logs(
+    org_id: Optional[UUID] = None,
+    action: Optional[AuditAction] = None,
+    user_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    List an organization's audit trail, newest first, using cursor pagination.
+
+    Admins list their own organization; superadmins must pass `org_id`.
+
+    Args:
+        org_id: Organization to list (required for superadmins).
+        action: Optional audit action filter.
+        user_id: Optional filter on the acting user.
+        cursor: Opaque cursor returned as `next_cursor` by the previous page.
+        limit: Maximum number of entries to return.
+        db: Database session dependency.
+        current_user: Current authenticated user.
+
+    Returns:
+        A page of audit log entries and the cursor for the next page, if any.
+    """
+    scoped_org_id = resolve_org_scope(current_user, org_id)
+
+    query = db.query(AuditLog).filter(AuditLog.org_id == scoped_org_id)
+    if action:
+        query = query.filter(AuditLog.action == action)
+    if user_id:
+        query = query.filter(AuditLog.user_id == user_id)
+
+    items, next_cursor = paginate_keyset(
+        query, AuditLog.timestamp, AuditLog.id, cursor, limit
+    )
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,20 +1,25 @@
+from typing import Optional
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.core.auth import get_current_active_user
-from app.core.enums import ServiceType, UserRole, WebhookStatus
+from app.core.auth import get_current_active_user, resolve_org_scope
+from app.core.enums import ServiceType, UserRole
+from app.core.principal import Principal
 from app.db.session import get_db
-from app.models.user import User
-from app.models.webhooks import WebhookLog
+from app.models.organization import Organization
 from app.schemas.integrations import IntegrationStatusResponse, ServiceIntegrationStatus
+from app.services.integration_health import get_integration_health, health_status
 
 router = APIRouter()
 
 
 @router.get("/status", response_model=IntegrationStatusResponse)
 def integration_status(
+    org_id: Optional[UUID] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ):
     """
     Retrieve the current health status of all external service integrations.
@@ -24,11 +29,18 @@ def integration_status(
     This endpoint provides a per-service summary including:
     - Timestamp of the last successfully processed event (`last_success`)
     - ID of the last successful event (`last_event_id`)
+    - Timestamp of the last failure and processed/failed event counts
     - Overall health status, which can be:
         - 'healthy': Most recent event was successfully processed, no newer failures
         - 'degraded': Last success exists, but there is a more recent failure
         - 'error': No successful events found
 
+    The figures come from the `integration_health` table, which
+    `create_webhook_log` keeps up to date, one row per service and
+    organization, summed per service by the database rather than scanning
+    the webhook logs. Pass `org_id` to break health down to one
+    organization; admins may only do so for their own.
+
     The statuses help administrators quickly determine if any integration is failing
     or requires investigation.
 
@@ -40,45 +52,36 @@ def integration_status(
             status_code=403, detail="Only admins can view integration status."
         )
 
-    statuses = {}
+    health_org = None
+    if org_id is not None:
+        scoped_org_id = resolve_org_scope(current_user, org_id)
+        org = db.query(Organization).filter(Organization.id == scoped_org_id).first()
+        if not org:
+            raise HTTPException(status_code=404, detail="Organization not found")
+        health_org = org.slug
 
-    for service in ServiceType:
-        success_log = (
-            db.query(WebhookLog)
-            .filter(
-                WebhookLog.service == service,
-                WebhookLog.status == WebhookStatus.processed,
-            )
-            .order_by(WebhookLog.created_at.desc())
-            .first()
-        )
+    health_by_service = get_integration_health(db, health_org)
 
-        recent_failure = (
-            db.query(WebhookLog)
-            .filter(
-                WebhookLog.service == service, WebhookLog.status == WebhookStatus.failed
+    statuses = {}
+    for service in ServiceType:
+        health = health_by_service.get(service)
+        if health is None:
+            statuses[service.value] = ServiceIntegrationStatus(
+                last_success=None, last_event_id=None, status=health_status(None)
             )
-            .order_by(WebhookLog.created_at.desc())
-            .first()
-        )
-
-        if success_log:
-            last_success = success_log.created_at.isoformat()
-            event_id = success_log.event_id
-
-            if recent_failure and recent_failure.created_at > success_log.created_at:
-                status = "degraded"
-            else:
-                status = "healthy"
-        else:
-            last_success = None
-            event_id = None
-            status = "error"
+            continue
 
         statuses[service.value] = ServiceIntegrationStatus(
-            last_success=last_success,
-            last_event_id=event_id,
-            status=status,
+            last_success=(
+                health.last_success_at.isoformat() if health.last_success_at else None
+            ),
+            last_event_id=health.last_event_id,
+            status=health_status(health),
+            last_failure=(
+                health.last_failure_at.isoformat() if health.last_failure_at else None
+            ),
+            processed_count=health.processed_count,
+            failed_count=health.failed_count,
         )
 
     return statuses
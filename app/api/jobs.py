@@ -0,0 +1,144 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_active_user, resolve_org_scope
+from app.core.config import settings
+from app.core.enums import JobKind, JobStatus, UserRole
+from app.core.principal import Principal
+from app.db.session import get_db
+from app.models.job import Job
+from app.schemas.job import JOB_PARAMS, JobCreate, JobRead
+from app.schemas.pagination import CursorPage
+from app.services.jobs import cancel_job, submit_job
+from app.utils.pagination import paginate_keyset
+
+router = APIRouter()
+
+
+def load_job(db: Session, job_id: UUID, current_user: Principal) -> Job:
+    """
+    Fetch a job the caller may see: any job for superadmins, their own
+    organization's for admins.
+
+    Raises:
+        HTTPException: If the user is not an admin or superadmin.
+        HTTPException: If the job does not exist or belongs to another organization.
+    """
+    if current_user.role != UserRole.superadmin:
+        resolve_org_scope(current_user)
+    job = db.get(Job, job_id)
+    if job is None or (
+        current_user.role != UserRole.superadmin and job.org_id != current_user.org_id
+    ):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/", response_model=JobRead, status_code=202)
+def create_job(
+    job_in: JobCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    Submit a background job for an organization.
+
+    Admins submit jobs for their own organization; superadmins must pass
+    `org_id`. The job runs in chunks on the admin workers; poll it with
+    `GET /jobs/{job_id}`.
+
+    Args:
+        job_in: Job kind, organization and kind-specific parameters.
+        db: Database session dependency.
+        current_user: Current authenticated user.
+
+    Returns:
+        The queued job as JobRead schema.
+
+    Raises:
+        HTTPException: If the job kind has its own endpoint.
+        HTTPException: If the parameters are invalid for the job kind.
+    """
+    scoped_org_id = resolve_org_scope(current_user, job_in.org_id)
+    if job_in.kind not in JOB_PARAMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Submit {job_in.kind.value} jobs through their own endpoint.",
+        )
+    try:
+        params = JOB_PARAMS[job_in.kind](**job_in.params)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail=exc.errors(include_url=False, include_context=False),
+        )
+
+    return submit_job(
+        db,
+        job_in.kind,
+        scoped_org_id,
+        params.model_dump(mode="json", exclude_none=True),
+        created_by=current_user.id,
+    )
+
+
+@router.get("/", response_model=CursorPage[JobRead])
+def list_jobs(
+    org_id: Optional[UUID] = None,
+    kind: Optional[JobKind] = None,
+    job_status: Optional[JobStatus] = Query(None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    List an organization's jobs, newest first, using cursor pagination.
+
+    Admins list their own organization; superadmins must pass `org_id`.
+    """
+    scoped_org_id = resolve_org_scope(current_user, org_id)
+
+    query = db.query(Job).filter(Job.org_id == scoped_org_id)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    if job_status:
+        query = query.filter(Job.status == job_status)
+
+    items, next_cursor = paginate_keyset(query, Job.created_at, Job.id, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/{job_id}", response_model=JobRead)
+def read_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    Poll a job's status and progress.
+    """
+    return load_job(db, job_id, current_user)
+
+
+@router.post("/{job_id}/cancel", response_model=JobRead, status_code=202)
+def cancel(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    Cancel a job. A queued job is cancelled at once; a running one stops
+    before its next chunk, keeping the work it has committed.
+
+    Raises:
+        HTTPException: If the job has already finished.
+    """
+    job = load_job(db, job_id, current_user)
+    if job.status not in (JobStatus.queued, JobStatus.running):
+        raise HTTPException(status_code=409, detail="Job has already finished.")
+    return cancel_job(db, job)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Expose Prometheus metrics for this API process (or all processes sharing
+    PROMETHEUS_MULTIPROC_DIR).
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
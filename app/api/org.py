@@ -3,13 +3,27 @@ from uuid import UUID, uuid4
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.core.auth import get_current_active_user, get_password_hash
-from app.core.enums import AuditAction, UserRole
+from app.core.auth import (
+    get_current_active_user,
+    get_password_hash,
+    resolve_org_scope,
+)
+from app.core.enums import AuditAction, JobKind, JobStatus, UserRole
+from app.core.principal import Principal
 from app.db.session import get_db
+from app.models.job import Job
 from app.models.organization import Organization
 from app.models.user import User
-from app.schemas.organization import OrgCreate, OrgRead
+from app.schemas.job import JobRead, OrgOffboardingParams
+from app.schemas.organization import (
+    OrgCreate,
+    OrgRead,
+    OrgWebhookRead,
+    OrgWebhookUpdate,
+)
+from app.services.jobs import submit_job
 from app.utils.audit import log_audit
+from app.utils.urls import check_public_url
 
 router = APIRouter()
 
@@ -18,7 +32,7 @@ router = APIRouter()
 def create_org(
     org_in: OrgCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ):
     """
     Create a new organization and its initial admin user.
@@ -95,3 +109,118 @@ def get_org(org_id: UUID, db: Session = Depends(get_db)):
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
     return org
+
+
+@router.put("/{org_id}/webhook", response_model=OrgWebhookRead)
+def set_org_webhook(
+    org_id: UUID,
+    webhook_in: OrgWebhookUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    Set or clear the endpoint that receives the organization's change feed.
+
+    Changes to the organization's users, subscriptions and messages are then
+    POSTed to it in batches, signed with `secret` (HMAC-SHA256 of the body in
+    `X-Webhook-Signature`) when one is set. Clearing the URL stops recording
+    changes.
+
+    Accessible by the organization's admins and by superadmins. The URL must
+    be https and resolve only to public addresses.
+
+    Args:
+        org_id: UUID of the organization.
+        webhook_in: Endpoint URL and optional signing secret.
+        db: Database session dependency.
+        current_user: Current authenticated user.
+
+    Returns:
+        The endpoint and whether deliveries are signed.
+
+    Raises:
+        HTTPException: If the user may not manage this organization.
+        HTTPException: If organization is not found.
+        HTTPException: If the URL points at a private or unresolvable host.
+    """
+    resolve_org_scope(current_user, org_id)
+    org = db.query(Organization).filter(Organization.id == org_id).first()
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    if webhook_in.url:
+        try:
+            check_public_url(str(webhook_in.url))
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=f"Webhook {exc}.")
+
+    org.webhook_url = str(webhook_in.url) if webhook_in.url else None
+    org.webhook_secret = webhook_in.secret if webhook_in.url else None
+    db.commit()
+
+    log_audit(db, AuditAction.UPDATED_ORG, current_user.id, org.id)
+
+    return OrgWebhookRead(url=org.webhook_url, signed=bool(org.webhook_secret))
+
+
+@router.delete("/{org_id}", response_model=JobRead, status_code=202)
+def offboard_org(
+    org_id: UUID,
+    keep_audit_logs: bool = True,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    Remove an organization and all of its data, as a background job.
+
+    Only accessible by superadmins. The organization's rows are deleted in
+    small chunks, in foreign key order, with pauses between chunks and while
+    replicas lag, so large tables are never locked for long. Poll the
+    returned job with `GET /jobs/{job_id}`; a cancelled job can be submitted
+    again and continues where the data was left.
+
+    Args:
+        org_id: UUID of the organization to remove.
+        keep_audit_logs: Keep the audit trail, with its user and organization
+            references cleared, instead of deleting it.
+        db: Database session dependency.
+        current_user: Current authenticated user.
+
+    Returns:
+        The queued offboarding job as JobRead schema.
+
+    Raises:
+        HTTPException: If current user is not a superadmin.
+        HTTPException: If organization is not found.
+        HTTPException: If the organization is already being offboarded.
+    """
+    if current_user.role != UserRole.superadmin:
+        raise HTTPException(
+            status_code=403, detail="Only superadmin can remove organizations."
+        )
+
+    org = db.query(Organization).filter(Organization.id == org_id).first()
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+
+    running = (
+        db.query(Job.id)
+        .filter(
+            Job.org_id == org_id,
+            Job.kind == JobKind.org_offboarding,
+            Job.status.in_((JobStatus.queued, JobStatus.running)),
+        )
+        .first()
+    )
+    if running:
+        raise HTTPException(
+            status_code=409, detail="Organization is already being offboarded."
+        )
+
+    params = OrgOffboardingParams(keep_audit_logs=keep_audit_logs)
+    return submit_job(
+        db,
+        JobKind.org_offboarding,
+        org_id,
+        params.model_dump(mode="json"),
+        created_by=current_user.id,
+    )
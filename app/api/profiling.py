@@ -0,0 +1,100 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from redis.exceptions import RedisError
+
+from app.core.auth import get_current_active_user
+from app.core.enums import ProfileFormat, ProfileTarget, ServiceType, UserRole
+from app.core.principal import Principal
+from app.core.profiling import profiling_switch
+from app.schemas.profiling import ProfileArmRead, ProfileArmRequest
+
+router = APIRouter()
+
+
+def require_superadmin(current_user: Principal):
+    if current_user.role != UserRole.superadmin:
+        raise HTTPException(
+            status_code=403, detail="Only superadmin can manage profiling."
+        )
+
+
+def redis_unavailable(exc: RedisError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Profiling switch unavailable: {exc}",
+    )
+
+
+@router.post("/", response_model=ProfileArmRead, status_code=201)
+def arm_profiling(
+    arm_in: ProfileArmRequest,
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    Profile the next `count` requests to a path, or tasks of a service.
+
+    Only accessible by superadmins. Profiles are written under PROFILE_DIR on
+    whichever API or worker process handles them. Request profiles sample all
+    threads and are always collapsed stacks; task profiles can also be cProfile
+    pstats.
+
+    Args:
+        arm_in: Target, count and output format.
+        current_user: Current authenticated user.
+
+    Returns:
+        The armed target as ProfileArmRead schema.
+    """
+    require_superadmin(current_user)
+
+    if arm_in.kind == ProfileTarget.service:
+        try:
+            ServiceType(arm_in.target)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Unknown service.")
+    elif arm_in.format == ProfileFormat.pstats:
+        raise HTTPException(
+            status_code=400, detail="Request profiles only support collapsed stacks."
+        )
+
+    try:
+        profiling_switch.arm(arm_in.kind, arm_in.target, arm_in.count, arm_in.format)
+    except RedisError as exc:
+        raise redis_unavailable(exc)
+
+    return ProfileArmRead(
+        kind=arm_in.kind,
+        target=arm_in.target,
+        remaining=arm_in.count,
+        format=arm_in.format,
+    )
+
+
+@router.get("/", response_model=List[ProfileArmRead])
+def list_profiling(current_user: Principal = Depends(get_current_active_user)):
+    """
+    List targets with profiles still to capture. Superadmins only.
+    """
+    require_superadmin(current_user)
+    try:
+        return profiling_switch.armed()
+    except RedisError as exc:
+        raise redis_unavailable(exc)
+
+
+@router.delete("/", status_code=204)
+def disarm_profiling(
+    kind: ProfileTarget,
+    target: str,
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    Stop profiling a target before its count runs out. Superadmins only.
+    """
+    require_superadmin(current_user)
+    try:
+        profiling_switch.disarm(kind, target)
+    except RedisError as exc:
+        raise redis_unavailable(exc)
+    return Response(status_code=204)
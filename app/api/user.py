@@ -1,6 +1,9 @@
-from uuid import uuid4
+from typing import Iterator, Optional
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -8,13 +11,24 @@ from app.core.auth import (
     create_access_token,
     get_current_active_user,
     get_password_hash,
-    verify_password,
+    resolve_org_scope,
+    verify_and_update_password,
 )
-from app.core.enums import AuditAction, UserRole
+from app.core.config import settings
+from app.core.enums import AuditAction, ExportFormat, UserRole, UserStatus
+from app.core.principal import Principal
 from app.db.session import get_db
 from app.models.user import User
-from app.schemas.user import UserCreateInOrg, UserRead
+from app.schemas.pagination import CursorPage
+from app.schemas.user import (
+    UserCreateInOrg,
+    UserImportResult,
+    UserRead,
+    UserSummary,
+)
+from app.services.user_import import ImportFormatError, UserImporter
 from app.utils.audit import log_audit
+from app.utils.pagination import paginate_keyset
 
 router = APIRouter()
 
@@ -23,7 +37,7 @@ router = APIRouter()
 def create_user_in_org(
     user_in: UserCreateInOrg,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ):
     """
     Create a new user (or admin) within the current organization.
@@ -71,6 +85,98 @@ def create_user_in_org(
     return new_user
 
 
+@router.post("/import", response_model=UserImportResult)
+async def import_users(
+    request: Request,
+    org_id: Optional[UUID] = None,
+    import_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    Bulk-create the users of an organization from a CSV or NDJSON upload.
+
+    Admins import into their own organization; superadmins must pass `org_id`.
+
+    The request body is read as it streams in and imported in chunks of
+    `USER_IMPORT_CHUNK_SIZE` rows, each committed on its own, so a large file
+    never sits in memory. Each row needs an `email` and may carry `password`,
+    `role` (`user` or `admin`), `first_name`, `last_name`, `department` and
+    `title`; users without a password are created `pending`. Rows that fail
+    validation or whose email is taken are reported in `errors` without
+    stopping the import, and one audit entry records the whole import.
+
+    Args:
+        request: The incoming request, whose body is the upload.
+        org_id: Organization to import into (required for superadmins).
+        import_format: Body encoding, `ndjson` or `csv` with a header line.
+        db: Database session dependency.
+        current_user: Current authenticated admin user.
+
+    Returns:
+        How many users were created and failed, with the first row errors.
+
+    Raises:
+        HTTPException: If current user is not an admin or superadmin.
+        HTTPException: If a CSV body has no `email` column.
+    """
+    scoped_org_id = resolve_org_scope(current_user, org_id)
+    body = request.stream()
+
+    def chunks() -> Iterator[bytes]:
+        # Runs in the worker thread; pulls each chunk from the event loop
+        while True:
+            try:
+                yield anyio.from_thread.run(body.__anext__)
+            except StopAsyncIteration:
+                return
+
+    importer = UserImporter(db, scoped_org_id, current_user.id)
+    try:
+        return await run_in_threadpool(importer.run, chunks(), import_format)
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/", response_model=CursorPage[UserSummary])
+def list_users(
+    org_id: Optional[UUID] = None,
+    role: Optional[UserRole] = None,
+    user_status: Optional[UserStatus] = Query(None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    List the users of an organization, newest first, using cursor pagination.
+
+    Admins list their own organization; superadmins must pass `org_id`.
+
+    Args:
+        org_id: Organization to list (required for superadmins).
+        role: Optional role filter.
+        user_status: Optional lifecycle status filter.
+        cursor: Opaque cursor returned as `next_cursor` by the previous page.
+        limit: Maximum number of users to return.
+        db: Database session dependency.
+        current_user: Current authenticated user.
+
+    Returns:
+        A page of users and the cursor for the next page, if any.
+    """
+    scoped_org_id = resolve_org_scope(current_user, org_id)
+
+    query = db.query(User).filter(User.org_id == scoped_org_id)
+    if role:
+        query = query.filter(User.role == role)
+    if user_status:
+        query = query.filter(User.status == user_status)
+
+    items, next_cursor = paginate_keyset(query, User.created_at, User.id, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+
 @router.post("/login")
 def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
@@ -78,6 +184,9 @@ def login_user(
     """
     Authenticate a user and return a JWT access token.
 
+    Users without a local password (e.g. synced from an external directory and
+    not yet activated) cannot log in with credentials.
+
     Args:
         form_data: OAuth2 form data containing username and password.
         db: Database session dependency.
@@ -89,14 +198,28 @@ def login_user(
         HTTPException: If credentials are invalid.
     """
     user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not user.hashed_password:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    valid, new_hash = verify_and_update_password(
+        form_data.password, user.hashed_password
+    )
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    access_token = create_access_token(data={"sub": str(user.id)})
+    if new_hash:
+        # Transparently upgrade hashes made with a deprecated scheme or cost.
+        user.hashed_password = new_hash
+        db.commit()
+
+    claims = {"sub": str(user.id)}
+    if settings.PRINCIPAL_CLAIMS_IN_TOKEN:
+        claims = Principal.from_user(user).to_claims()
+    access_token = create_access_token(data=claims)
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserRead)
-def read_me(current_user: User = Depends(get_current_active_user)) -> UserRead:
+def read_me(current_user: Principal = Depends(get_current_active_user)) -> UserRead:
     """
     Retrieve the currently authenticated user's profile.
 
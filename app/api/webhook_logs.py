@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_active_user, resolve_org_scope
+from app.core.config import settings
+from app.core.enums import ServiceType, UserRole, WebhookStatus
+from app.core.principal import Principal
+from app.db.session import get_db
+from app.models.organization import Organization
+from app.models.webhooks import WebhookLog
+from app.schemas.pagination import CursorPage
+from app.schemas.webhooks import StageLatencyReport, WebhookLogRead
+from app.utils.pagination import paginate_keyset
+from app.utils.timeline import STAGES
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+router = APIRouter()
+
+
+@router.get("/", response_model=CursorPage[WebhookLogRead])
+def list_webhook_logs(
+    org_id: Optional[UUID] = None,
+    service: Optional[ServiceType] = None,
+    webhook_status: Optional[WebhookStatus] = Query(None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    List an organization's webhook history, newest first, using cursor pagination.
+
+    Admins list their own organization; superadmins must pass `org_id`.
+    Webhook logs reference organizations by slug, so the organization is resolved
+    once before the paginated query runs.
+
+    Args:
+        org_id: Organization to list (required for superadmins).
+        service: Optional service filter.
+        webhook_status: Optional processing status filter.
+        cursor: Opaque cursor returned as `next_cursor` by the previous page.
+        limit: Maximum number of entries to return.
+        db: Database session dependency.
+        current_user: Current authenticated user.
+
+    Returns:
+        A page of webhook log entries and the cursor for the next page, if any.
+
+    Raises:
+        HTTPException: If the organization does not exist.
+    """
+    scoped_org_id = resolve_org_scope(current_user, org_id)
+
+    org = db.query(Organization).filter(Organization.id == scoped_org_id).first()
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+
+    query = db.query(WebhookLog).filter(WebhookLog.org_id == org.slug)
+    if service:
+        query = query.filter(WebhookLog.service == service)
+    if webhook_status:
+        query = query.filter(WebhookLog.status == webhook_status)
+
+    items, next_cursor = paginate_keyset(
+        query, WebhookLog.created_at, WebhookLog.id, cursor, limit
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/latency", response_model=StageLatencyReport)
+def stage_latency(
+    org_id: Optional[UUID] = None,
+    service: Optional[ServiceType] = None,
+    window_minutes: int = Query(60, ge=1, le=7 * 24 * 60),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """
+    Report p50/p95/p99 milliseconds per pipeline stage and service over a window.
+
+    Stages are `ingest` (API receipt to broker publish), `queue` (waiting in
+    Redis), `external` (external service call), `persist` (local sync up to the
+    log write) and `total`. They are aggregated in one pass over the window's
+    `stage_ms` arrays.
+
+    Admins see their own organization; superadmins see every organization
+    unless they pass `org_id`.
+
+    Args:
+        org_id: Organization to report on (superadmins only; optional).
+        service: Optional service filter.
+        window_minutes: How far back to look.
+        db: Database session dependency.
+        current_user: Current authenticated user.
+
+    Returns:
+        Percentiles and sample counts keyed by service, then stage.
+
+    Raises:
+        HTTPException: If the organization does not exist.
+    """
+    since = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
+    query_filters = [WebhookLog.created_at >= since, WebhookLog.stage_ms.isnot(None)]
+
+    if current_user.role != UserRole.superadmin or org_id is not None:
+        scoped_org_id = resolve_org_scope(current_user, org_id)
+        org = db.query(Organization).filter(Organization.id == scoped_org_id).first()
+        if not org:
+            raise HTTPException(status_code=404, detail="Organization not found")
+        query_filters.append(WebhookLog.org_id == org.slug)
+    if service:
+        query_filters.append(WebhookLog.service == service)
+
+    stage_values = {
+        name: WebhookLog.stage_ms[position]
+        for position, name in enumerate(STAGES, start=1)
+    }
+    stage_values["total"] = sum(
+        func.coalesce(value, 0) for value in stage_values.values()
+    )
+
+    columns = []
+    for value in stage_values.values():
+        columns.append(func.count(value))
+        columns.append(func.percentile_cont(array(PERCENTILES)).within_group(value))
+
+    rows = (
+        db.query(WebhookLog.service, *columns)
+        .filter(*query_filters)
+        .group_by(WebhookLog.service)
+        .all()
+    )
+
+    report = {}
+    for service_value, *aggregates in rows:
+        stages = {}
+        for index, name in enumerate(stage_values):
+            count, percentiles = aggregates[2 * index], aggregates[2 * index + 1]
+            p50, p95, p99 = percentiles or (None, None, None)
+            stages[name] = {"count": count, "p50": p50, "p95": p95, "p99": p99}
+        report[ServiceType(service_value).value] = stages
+    return report
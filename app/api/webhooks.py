@@ -1,31 +1,63 @@
+import time
+
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 
+from app.core.admission import admission_controller
 from app.core.config import settings
 from app.core.enums import ServiceType
-from app.core.rate_limit import limiter
+from app.core.metrics import (
+    WEBHOOK_BATCH_SIZE,
+    WEBHOOK_ENQUEUE_SECONDS,
+    WEBHOOK_EVENTS_RECEIVED,
+)
+from app.core.rate_limit import enforce_webhook_rate_limit
+from app.core.redis import get_broker_redis
+from app.core.tracing import TRACEPARENT_HEADER, correlation_context, tracer
 from app.schemas.webhooks import (
     BatchWebhookEvents,
     CommunicationServiceEvent,
     PaymentServiceEvent,
     UserServiceEvent,
 )
+from app.services.event_streams import publish_event
+from app.services.payloads import offload_event
 from app.services.tasks import process_event
+from app.utils.timeline import ENQUEUED_AT_HEADER, RECEIVED_AT_HEADER
 
 router = APIRouter()
 
 
-def enqueue_event(event: dict, service_enum: ServiceType):
-    try:
-        process_event.apply_async(
-            (event, service_enum.value), queue="integration_queue"
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+def enqueue_event(event: dict, service_enum: ServiceType, received_at: float):
+    metadata = event.get("metadata") or {}
+    with (
+        correlation_context(metadata.get("correlation_id")),
+        tracer.start_span(
+            f"{settings.EVENT_TRANSPORT}.enqueue",
+            {"event_id": event.get("event_id"), "service": service_enum.value},
+        ) as span,
+    ):
+        headers = {RECEIVED_AT_HEADER: received_at}
+        if span is not None:
+            headers[TRACEPARENT_HEADER] = span.traceparent
+        try:
+            with WEBHOOK_ENQUEUE_SECONDS.labels(service_enum.value).time():
+                message = offload_event(event)
+                headers[ENQUEUED_AT_HEADER] = time.time()
+                if settings.EVENT_TRANSPORT == "streams":
+                    publish_event(get_broker_redis(), message, service_enum, headers)
+                else:
+                    process_event.apply_async(
+                        (message, service_enum.value),
+                        queue="integration_queue",
+                        headers=headers,
+                    )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    WEBHOOK_EVENTS_RECEIVED.labels(service_enum.value).inc()
 
 
 @router.post("/user-service")
-@limiter.limit(settings.webhook_rate_limit)
 async def user_service_webhook(
     request: Request, payload: UserServiceEvent | BatchWebhookEvents
 ):
@@ -43,15 +75,23 @@ async def user_service_webhook(
 
     Raises:
         HTTPException: If payload type is invalid.
+        HTTPException: If the tenant's event rate limit is exhausted.
+        HTTPException: If the event queue is backed up (429/503).
     """
+    received_at = time.time()
     service_enum = ServiceType.USER
+    admission_controller.check(service_enum)
 
     match payload:
         case BatchWebhookEvents(events=events):
+            enforce_webhook_rate_limit(service_enum, events)
+            WEBHOOK_BATCH_SIZE.labels(service_enum.value).observe(len(events))
             for event in events:
-                enqueue_event(event.model_dump(), service_enum)
+                enqueue_event(event.model_dump(mode="json"), service_enum, received_at)
         case UserServiceEvent():
-            enqueue_event(payload.model_dump(), service_enum)
+            enforce_webhook_rate_limit(service_enum, [payload])
+            WEBHOOK_BATCH_SIZE.labels(service_enum.value).observe(1)
+            enqueue_event(payload.model_dump(mode="json"), service_enum, received_at)
         case _:
             raise HTTPException(status_code=400, detail="Invalid payload type")
 
@@ -59,7 +99,6 @@ async def user_service_webhook(
 
 
 @router.post("/payment-service")
-@limiter.limit(settings.webhook_rate_limit)
 async def payment_service_webhook(
     request: Request, payload: PaymentServiceEvent | BatchWebhookEvents
 ):
@@ -77,15 +116,23 @@ async def payment_service_webhook(
 
     Raises:
         HTTPException: If payload type is invalid.
+        HTTPException: If the tenant's event rate limit is exhausted.
+        HTTPException: If the event queue is backed up (429/503).
     """
+    received_at = time.time()
     service_enum = ServiceType.PAYMENT
+    admission_controller.check(service_enum)
 
     match payload:
         case BatchWebhookEvents(events=events):
+            enforce_webhook_rate_limit(service_enum, events)
+            WEBHOOK_BATCH_SIZE.labels(service_enum.value).observe(len(events))
             for event in events:
-                enqueue_event(event.model_dump(), service_enum)
+                enqueue_event(event.model_dump(mode="json"), service_enum, received_at)
         case PaymentServiceEvent():
-            enqueue_event(payload.model_dump(), service_enum)
+            enforce_webhook_rate_limit(service_enum, [payload])
+            WEBHOOK_BATCH_SIZE.labels(service_enum.value).observe(1)
+            enqueue_event(payload.model_dump(mode="json"), service_enum, received_at)
         case _:
             raise HTTPException(status_code=400, detail="Invalid payload type")
 
@@ -93,7 +140,6 @@ async def payment_service_webhook(
 
 
 @router.post("/communication-service")
-@limiter.limit(settings.webhook_rate_limit)
 async def communication_service_webhook(
     request: Request, payload: CommunicationServiceEvent | BatchWebhookEvents
 ):
@@ -111,15 +157,23 @@ async def communication_service_webhook(
 
     Raises:
         HTTPException: If payload type is invalid.
+        HTTPException: If the tenant's event rate limit is exhausted.
+        HTTPException: If the event queue is backed up (429/503).
     """
+    received_at = time.time()
     service_enum = ServiceType.COMMUNICATION
+    admission_controller.check(service_enum)
 
     match payload:
         case BatchWebhookEvents(events=events):
+            enforce_webhook_rate_limit(service_enum, events)
+            WEBHOOK_BATCH_SIZE.labels(service_enum.value).observe(len(events))
             for event in events:
-                enqueue_event(event.model_dump(), service_enum)
+                enqueue_event(event.model_dump(mode="json"), service_enum, received_at)
         case CommunicationServiceEvent():
-            enqueue_event(payload.model_dump(), service_enum)
+            enforce_webhook_rate_limit(service_enum, [payload])
+            WEBHOOK_BATCH_SIZE.labels(service_enum.value).observe(1)
+            enqueue_event(payload.model_dump(mode="json"), service_enum, received_at)
         case _:
             raise HTTPException(status_code=400, detail="Invalid payload type")
 
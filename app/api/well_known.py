@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+
+from app.core.tokens import get_key_ring
+
+router = APIRouter()
+
+
+@router.get("/jwks.json")
+def jwks():
+    """
+    Publish the public keys that verify access tokens, as a JWKS document.
+
+    Other services can verify tokens locally, selecting the key by the token's
+    `kid` header. With an HMAC algorithm there is nothing to publish and the key
+    set is empty.
+
+    Returns:
+        A JSON Web Key Set.
+    """
+    return get_key_ring().jwks()
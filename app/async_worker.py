@@ -0,0 +1,51 @@
+"""
+asyncio event worker, used with EVENT_TRANSPORT=streams.
+
+Runs up to ASYNC_MAX_CONCURRENCY events at once in one process, instead of one
+event per process (prefork) or per thread. It can run instead of, or next to,
+`python -m app.stream_worker`; both join the same consumer group.
+
+Usage:
+    python -m app.async_worker
+"""
+
+import asyncio
+import os
+import signal
+import socket
+
+from app.core.config import settings
+from app.core.redis import get_stream_redis
+from app.services.async_events import AsyncStreamConsumer
+from app.utils.logger import configure_logging, get_logger, stop_logging
+
+logger = get_logger("async_worker")
+
+
+async def serve(name: str):
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+
+    logger.info(
+        "Async worker started",
+        extra={"consumer": name, "concurrency": settings.ASYNC_MAX_CONCURRENCY},
+    )
+    await AsyncStreamConsumer(get_stream_redis(), name).run(stop)
+    logger.info("Async worker stopped", extra={"consumer": name})
+
+
+def main():
+    configure_logging()
+    if settings.WORKER_METRICS_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(settings.WORKER_METRICS_PORT)
+
+    asyncio.run(serve(f"{socket.gethostname()}-{os.getpid()}-async"))
+    stop_logging()
+
+
+if __name__ == "__main__":
+    main()
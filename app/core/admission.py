@@ -0,0 +1,203 @@
+import json
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.enums import ServiceType
+from app.core.metrics import BROKER_OLDEST_MESSAGE_AGE_SECONDS, BROKER_QUEUE_DEPTH
+from app.core.redis import REDIS_RETRY_AFTER_SECONDS, get_broker_redis
+from app.utils.logger import get_logger
+from app.utils.timeline import ENQUEUED_AT_HEADER
+
+logger = get_logger("admission")
+
+INTEGRATION_QUEUE = "integration_queue"
+
+
+@dataclass(frozen=True)
+class BrokerSnapshot:
+    depth: int
+    lag_seconds: float
+    memory_ratio: Optional[float]
+    sampled_at: float
+
+
+@dataclass(frozen=True)
+class Watermarks:
+    queue_soft: int
+    queue_hard: int
+    max_lag_seconds: float
+    memory_hard_ratio: float
+
+
+def watermarks_for(service: ServiceType) -> Watermarks:
+    """
+    Default watermarks, with any ADMISSION_WATERMARK_OVERRIDES for the service applied.
+
+    The overrides' services and keys are checked when the settings load.
+    """
+    defaults = Watermarks(
+        queue_soft=settings.ADMISSION_QUEUE_SOFT_LIMIT,
+        queue_hard=settings.ADMISSION_QUEUE_HARD_LIMIT,
+        max_lag_seconds=settings.ADMISSION_MAX_LAG_SECONDS,
+        memory_hard_ratio=settings.ADMISSION_MEMORY_HARD_RATIO,
+    )
+    return replace(
+        defaults, **settings.ADMISSION_WATERMARK_OVERRIDES.get(service.value, {})
+    )
+
+
+def sample_broker(client) -> BrokerSnapshot:
+    """
+    Read queue depth, the age of the oldest queued message and memory pressure.
+
+    Kombu LPUSHes onto the queue list and workers BRPOP from the tail, so the
+    oldest message is at index -1. Its age comes from the `enqueued_at` header
+    stamped by the webhook routes.
+    """
+    pipe = client.pipeline(transaction=False)
+    pipe.llen(INTEGRATION_QUEUE)
+    pipe.lindex(INTEGRATION_QUEUE, -1)
+    pipe.info("memory")
+    depth, oldest, memory = pipe.execute()
+
+    now = time.time()
+    lag = 0.0
+    if oldest:
+        try:
+            enqueued_at = json.loads(oldest)["headers"].get(ENQUEUED_AT_HEADER)
+            if enqueued_at:
+                lag = max(0.0, now - float(enqueued_at))
+        except (ValueError, KeyError, TypeError):
+            pass
+
+    memory_ratio = None
+    if memory.get("maxmemory"):
+        memory_ratio = memory["used_memory"] / memory["maxmemory"]
+
+    return BrokerSnapshot(
+        depth=depth, lag_seconds=lag, memory_ratio=memory_ratio, sampled_at=now
+    )
+
+
+class AdmissionController:
+    """
+    Sheds webhook traffic when the broker is backed up.
+
+    A snapshot of broker state is refreshed at most every
+    ADMISSION_SAMPLE_INTERVAL_SECONDS on a background thread, so requests only
+    compare numbers in memory. Above a service's soft watermark (queue depth or
+    oldest-message lag) requests get a 429; above the hard watermark, or when
+    broker memory nears `maxmemory`, they get a 503. Both carry Retry-After so
+    providers back off instead of pushing the broker into OOM.
+
+    The controller fails open: with no recent snapshot, because Redis is down or
+    sampling is slow, every request is admitted.
+    """
+
+    def __init__(self, sampler=None):
+        self._sampler = sampler or (lambda: sample_broker(get_broker_redis()))
+        self._snapshot: Optional[BrokerSnapshot] = None
+        self._next_sample_at = 0.0
+        self._refreshing = threading.Lock()
+
+    @property
+    def snapshot(self) -> Optional[BrokerSnapshot]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        max_age = 3 * settings.ADMISSION_SAMPLE_INTERVAL_SECONDS
+        if time.time() - snapshot.sampled_at > max_age:
+            return None
+        return snapshot
+
+    def refresh(self):
+        try:
+            self._snapshot = self._sampler()
+            BROKER_QUEUE_DEPTH.set(self._snapshot.depth)
+            BROKER_OLDEST_MESSAGE_AGE_SECONDS.set(self._snapshot.lag_seconds)
+            self._next_sample_at = (
+                time.monotonic() + settings.ADMISSION_SAMPLE_INTERVAL_SECONDS
+            )
+        except RedisError as exc:
+            logger.warning(f"Broker sampling failed, admitting all traffic: {exc}")
+            self._sampling_failed()
+        except Exception:
+            # e.g. an unexpected INFO reply
+            logger.exception("Broker sampling failed, admitting all traffic")
+            self._sampling_failed()
+
+    def _sampling_failed(self):
+        self._snapshot = None
+        self._next_sample_at = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            self._refreshing.release()
+
+    def _maybe_refresh(self):
+        if time.monotonic() < self._next_sample_at:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+        threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def check(self, service: ServiceType):
+        """
+        Raises:
+            HTTPException: 429 above the soft watermarks, 503 above the hard ones.
+        """
+        if not settings.ADMISSION_CONTROL_ENABLED:
+            return
+        self._maybe_refresh()
+
+        snapshot = self.snapshot
+        if snapshot is None:
+            return
+
+        marks = watermarks_for(service)
+        if (
+            snapshot.memory_ratio is not None
+            and snapshot.memory_ratio >= marks.memory_hard_ratio
+        ):
+            self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                f"Broker memory at {snapshot.memory_ratio:.0%} of maxmemory",
+            )
+        if snapshot.depth >= marks.queue_hard:
+            self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                f"Event queue holds {snapshot.depth} messages",
+            )
+        if snapshot.depth >= marks.queue_soft:
+            self._reject(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                f"Event queue holds {snapshot.depth} messages",
+            )
+        if snapshot.lag_seconds >= marks.max_lag_seconds:
+            self._reject(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                f"Event processing is {snapshot.lag_seconds:.0f}s behind",
+            )
+
+    @staticmethod
+    def _reject(status_code: int, reason: str):
+        raise HTTPException(
+            status_code=status_code,
+            detail=f"Not accepting events right now: {reason}",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+
+    def reset(self):
+        self._snapshot = None
+        self._next_sample_at = 0.0
+
+
+admission_controller = AdmissionController()
@@ -1,17 +1,20 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import JWTError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.enums import UserRole
+from app.core.hashing import HashingBusyError, password_hasher
+from app.core.principal import Principal, principal_cache
+from app.core.tokens import decode_token, encode_token
 from app.db.session import get_db
 from app.models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
 
@@ -21,41 +24,117 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
     to_encode.update({"exp": expire})
-    return jwt.encode(
-        to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+    return encode_token(to_encode)
+
+
+def hashing_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent password operations. Please retry shortly.",
+        headers={"Retry-After": "1"},
     )
 
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return verify_and_update_password(plain_password, hashed_password)[0]
+
+
+def verify_and_update_password(
+    plain_password, hashed_password
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses a deprecated scheme or cost,
+    return a replacement hash to store.
+    """
+    try:
+        return password_hasher.verify_and_update(plain_password, hashed_password)
+    except HashingBusyError:
+        raise hashing_busy_exception()
 
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    try:
+        return password_hasher.hash(password)
+    except HashingBusyError:
+        raise hashing_busy_exception()
+
+
+def load_principal(db: Session, user_id: str) -> Optional[Principal]:
+    user = db.query(User).filter(User.id == user_id).first()
+    return Principal.from_user(user) if user else None
 
 
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-):
+) -> Principal:
+    """
+    Resolve the bearer token into the calling Principal.
+
+    Lookup order, cheapest first:
+    - Claims embedded in the token itself, when PRINCIPAL_CLAIMS_IN_TOKEN is on.
+    - The principal cache (in-process LRU, then Redis).
+    - The users table, after which the principal is cached.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = decode_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+
+    if settings.PRINCIPAL_CLAIMS_IN_TOKEN and "role" in payload:
+        return Principal.from_claims(payload)
+
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        principal = principal_cache.get(user_id, token)
+        if principal is not None:
+            return principal
+
+    principal = load_principal(db, user_id)
+    if principal is None:
         raise credentials_exception
-    return user
 
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        principal_cache.set(user_id, token, principal)
+    return principal
 
-def get_current_active_user(current_user: User = Depends(get_current_user)):
+
+def get_current_active_user(current_user: Principal = Depends(get_current_user)):
     return current_user
+
+
+def resolve_org_scope(current_user: Principal, org_id: Optional[UUID] = None) -> UUID:
+    """
+    Resolve the organization an admin-level request operates on.
+
+    Admins are always pinned to their own organization; superadmins have no
+    organization of their own and must name one explicitly.
+
+    Raises:
+        HTTPException: If the user is not an admin or superadmin.
+        HTTPException: If an admin targets another organization.
+        HTTPException: If a superadmin does not provide an org_id.
+    """
+    if current_user.role == UserRole.superadmin:
+        if org_id is None:
+            raise HTTPException(
+                status_code=400, detail="org_id is required for superadmin requests."
+            )
+        return org_id
+
+    if current_user.role != UserRole.admin:
+        raise HTTPException(
+            status_code=403, detail="Only admins can access organization data."
+        )
+
+    if org_id is not None and org_id != current_user.org_id:
+        raise HTTPException(
+            status_code=403, detail="Cannot access another organization's data."
+        )
+    return current_user.org_id
@@ -1,5 +1,11 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
+from app.core.enums import ServiceType
+
+# Fields of app.core.admission.Watermarks, which imports these settings
+WATERMARK_KEYS = {"queue_soft", "queue_hard", "max_lag_seconds", "memory_hard_ratio"}
+
 
 class Settings(BaseSettings):
     DATABASE_URL: str
@@ -7,10 +13,51 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = "your_secret_key"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
+    JWT_PRIVATE_KEYS_DIR: str | None = None
+    JWT_ACTIVE_KID: str | None = None
+    JWT_VERIFY_CACHE_ENABLED: bool = True
+    JWT_VERIFY_CACHE_MAX_ENTRIES: int = 10_000
+    JWT_VERIFY_CACHE_MAX_TTL_SECONDS: int = 300
+
+    PASSWORD_HASH_SCHEMES: list[str] = ["bcrypt"]
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_REDIS_TTL_SECONDS: int = 300
+    PRINCIPAL_CLAIMS_IN_TOKEN: bool = False
 
     LOG_LEVEL: str = "INFO"
-    LOG_FORMAT: str = "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s"
+    LOG_FORMAT: str = (
+        "[%(asctime)s] [%(levelname)s] %(name)s "
+        "[trace=%(trace_id)s correlation=%(correlation_id)s]: %(message)s"
+    )
     LOG_DATE_FORMAT: str = "%Y-%m-%d %H:%M:%S"
+    # JSON lines by default; set to false for LOG_FORMAT text lines
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10_000
+    # Fraction of INFO-and-below records kept per logger, e.g. {"tasks": 0.1}
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+
+    TRACING_ENABLED: bool = False
+    TRACE_SAMPLE_RATIO: float = 0.01
+    TRACE_SERVICE_NAME: str = "rayda"
+    TRACE_EXPORTER: str = "file"  # "file" or "otlp"
+    TRACE_FILE_PATH: str = "traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACE_EXPORT_INTERVAL_SECONDS: float = 2.0
+    TRACE_SQL_MAX_LENGTH: int = 1000
+
+    PROFILE_DIR: str = "profiles"
+    PROFILE_SAMPLE_INTERVAL_SECONDS: float = 0.01
+    PROFILE_POLL_SECONDS: float = 1.0
+    PROFILE_ARM_TTL_SECONDS: int = 3600
+    PROFILE_MAX_COUNT: int = 100
+    # Keep a sampled profile of any task slower than this; 0 disables
+    PROFILE_SLOW_TASK_SECONDS: float = 0
 
     INITIAL_SUPERADMIN_EMAIL: str = "superadmin@example.com"
     INITIAL_SUPERADMIN_PASSWORD: str = "SuperSecretPassword123!"
@@ -20,15 +67,158 @@ class Settings(BaseSettings):
 
     REDIS_BROKER_URL: str = "redis://localhost:6379/0"
     REDIS_BACKEND_URL: str = "redis://localhost:6379/1"
+    REDIS_CACHE_URL: str = "redis://localhost:6379/2"
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+
+    # Port for the worker's Prometheus exporter; 0 disables it
+    WORKER_METRICS_PORT: int = 9100
+
+    # "celery", or "streams" for per-service Redis Streams (python -m app.stream_worker)
+    EVENT_TRANSPORT: str = "celery"
+    STREAM_MAX_LENGTH: int = 1_000_000
+    STREAM_BATCH_SIZE: int = 100
+    STREAM_BLOCK_MS: int = 1000
+    STREAM_CLAIM_IDLE_MS: int = 30_000
+    STREAM_CLAIM_INTERVAL_SECONDS: float = 5.0
+
+    # "json" or "msgpack" (needs the msgpack package)
+    CELERY_TASK_SERIALIZER: str = "json"
+    # zlib-compress task messages at least this big; 0 disables
+    CELERY_COMPRESSION_THRESHOLD_BYTES: int = 0
+    CELERY_COMPRESSION_LEVEL: int = 6
+    # Events at least this big are stored once in Redis and passed by reference; 0 disables
+    PAYLOAD_OFFLOAD_THRESHOLD_BYTES: int = 64 * 1024
+    PAYLOAD_OFFLOAD_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # Storing results and STARTED states costs Redis writes per event that nobody reads
+    CELERY_IGNORE_RESULTS: bool = True
+    CELERY_TRACK_STARTED: bool = False
+
+    # Only used with `celery worker --autoscale=max,min`
+    AUTOSCALE_INTERVAL_SECONDS: float = 10.0
+    AUTOSCALE_WINDOW_SECONDS: int = 120
+    # Size the pool to drain the current backlog within this long
+    AUTOSCALE_TARGET_DRAIN_SECONDS: float = 60.0
+    AUTOSCALE_MAX_STEP: int = 4
+    # Above any of these, shrink instead of adding load to the slow dependency
+    AUTOSCALE_MAX_DB_PROBE_MS: float = 100.0
+    AUTOSCALE_MAX_PERSIST_P95_MS: float = 1000.0
+    AUTOSCALE_MAX_EXTERNAL_P95_MS: float = 5000.0
+    AUTOSCALE_MAX_FAILURE_RATIO: float = 0.2
 
     CELERY_MAX_RETRIES: int = 3
     CELERY_RETRY_BACKOFF_BASE: int = 2
 
+    # asyncio worker (python -m app.async_worker, with EVENT_TRANSPORT=streams)
+    ASYNC_MAX_CONCURRENCY: int = 200
+    ASYNC_SERVICE_DEFAULT_CONCURRENCY: int = 100
+    # Per-service caps on concurrent external calls, e.g. {"payment_service": 20}
+    ASYNC_SERVICE_CONCURRENCY: dict[str, int] = {}
+    # Threads for the blocking Postgres work; keep within the SQLAlchemy pool
+    ASYNC_DB_THREADS: int = 10
+
+    # Directory reconciliation against the user service's list_users
+    # Seconds between scheduled runs (celery beat); 0 disables the schedule
+    RECONCILE_INTERVAL_SECONDS: int = 7 * 24 * 3600
+    # Seconds between incremental syncs from the sync watermarks; 0 disables
+    INCREMENTAL_SYNC_INTERVAL_SECONDS: int = 24 * 3600
+    RECONCILE_PAGE_SIZE: int = 500
+    RECONCILE_PAGE_CONCURRENCY: int = 8
+    RECONCILE_FETCH_RETRIES: int = 3
+    # A running reconciliation not checkpointed for this long is taken over
+    RECONCILE_STALE_SECONDS: int = 600
+
+    # Events waiting on an entity that has not been synced yet
+    # Parked events not released within this are logged as failed
+    PARKING_TTL_SECONDS: int = 24 * 3600
+    # Seconds between sweeps for expired parked events (celery beat)
+    PARKING_SWEEP_INTERVAL_SECONDS: int = 300
+
+    # Change feed relay (python -m app.outbox_relay)
+    # Most events per organization per round; one POST per lane
+    OUTBOX_BATCH_SIZE: int = 500
+    # Organizations relayed in parallel
+    OUTBOX_RELAY_WORKERS: int = 8
+    # Concurrent POSTs to one endpoint; an entity always uses the same one
+    OUTBOX_ENDPOINT_CONCURRENCY: int = 4
+    # Connection pool shared by all endpoints
+    OUTBOX_MAX_CONNECTIONS: int = 100
+    OUTBOX_HTTP_TIMEOUT_SECONDS: float = 10.0
+    # Attempts before an event is marked failed; retries back off exponentially
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_MAX_BACKOFF_SECONDS: int = 3600
+    # Wait between rounds when nothing was due
+    OUTBOX_POLL_SECONDS: float = 1.0
+
+    # Background jobs (POST /jobs/), run on the admin_queue workers
+    # Rows handled per chunk; each chunk commits with the job's checkpoint
+    JOB_CHUNK_SIZE: int = 1000
+    # A task runs chunks for up to this long, then queues the job again
+    JOB_SLICE_SECONDS: int = 30
+    # Failed chunks in a row before the job is marked failed; retries back off
+    JOB_MAX_ATTEMPTS: int = 5
+    # Running jobs not updated for this long are queued again (worker lost)
+    JOB_STALE_SECONDS: int = 600
+    # Seconds between sweeps for stalled jobs (celery beat)
+    JOB_SWEEP_INTERVAL_SECONDS: int = 60
+
+    # Organization offboarding jobs (DELETE /orgs/{org_id})
+    # Pause after each chunk, giving replicas and other writers room
+    OFFBOARDING_PAUSE_SECONDS: float = 0.2
+    # Chunks wait while replica replay lag exceeds this; 0 disables the check
+    OFFBOARDING_MAX_REPLICATION_LAG_SECONDS: float = 5.0
+    OFFBOARDING_LAG_POLL_SECONDS: float = 1.0
+
+    # Simulated round trip of the mocked external services
+    EXTERNAL_MOCK_LATENCY_MS: int = 0
+    # Users per organization in the mocked list_users directory
+    EXTERNAL_MOCK_DIRECTORY_SIZE: int = 150
     FORCE_SERVICE_FAILURES: int = 0
     ENABLE_RANDOM_FAILURES: bool = False
 
     WEBHOOK_RATE_LIMIT_COUNT: int = 10
     WEBHOOK_RATE_LIMIT_PERIOD: str = "minute"  # could be "second", "hour", "day"
+    # Per-service overrides, e.g. {"payment_service": "500/minute"}
+    WEBHOOK_RATE_LIMIT_OVERRIDES: dict[str, str] = {}
+    # Shared by every API process and replica; memory:// (per process) is only
+    # fit for a single process, e.g. the tests
+    RATE_LIMIT_STORAGE_URI: str = "redis://localhost:6379/3"
+
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_SAMPLE_INTERVAL_SECONDS: float = 2.0
+    ADMISSION_QUEUE_SOFT_LIMIT: int = 100_000
+    ADMISSION_QUEUE_HARD_LIMIT: int = 500_000
+    ADMISSION_MAX_LAG_SECONDS: float = 300.0
+    ADMISSION_MEMORY_HARD_RATIO: float = 0.9
+    ADMISSION_RETRY_AFTER_SECONDS: int = 30
+    # Per-service overrides, e.g. {"payment_service": {"queue_soft": 400000}}
+    ADMISSION_WATERMARK_OVERRIDES: dict[str, dict[str, float]] = {}
+
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+
+    EXPORT_YIELD_PER: int = 1000
+    EXPORT_CHUNK_BYTES: int = 64 * 1024
+
+    # Bulk user import (POST /users/import)
+    # Rows validated, checked for duplicates and inserted together
+    USER_IMPORT_CHUNK_SIZE: int = 500
+    USER_IMPORT_MAX_ROWS: int = 100_000
+    # Row errors listed in the response; all are counted
+    USER_IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    @field_validator("ADMISSION_WATERMARK_OVERRIDES")
+    @classmethod
+    def known_watermarks(cls, overrides: dict) -> dict:
+        for service, marks in overrides.items():
+            if service not in ServiceType._value2member_map_:
+                raise ValueError(f"Unknown service {service!r}")
+            unknown = set(marks) - WATERMARK_KEYS
+            if unknown:
+                raise ValueError(
+                    f"Unknown watermarks for {service}: {', '.join(sorted(unknown))}"
+                )
+        return overrides
 
     @property
     def webhook_rate_limit(self) -> str:
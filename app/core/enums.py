@@ -18,6 +18,7 @@ class AuditAction(str, enum.Enum):
     CREATED_USER = "created_user"
     UPDATED_USER = "updated_user"
     DELETED_USER = "deleted_user"
+    IMPORTED_USERS = "imported_users"
     CREATED_ORG = "created_org"
     UPDATED_ORG = "updated_org"
     DELETED_ORG = "deleted_org"
@@ -109,3 +110,60 @@ class IntegrationHealthStatus(str, enum.Enum):
     healthy = "healthy"
     degraded = "degraded"
     error = "error"
+
+
+class ExportResource(str, enum.Enum):
+    users = "users"
+    audit_logs = "audit_logs"
+    subscriptions = "subscriptions"
+    communication_logs = "communication_logs"
+
+
+class ExportFormat(str, enum.Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ProfileTarget(str, enum.Enum):
+    route = "route"
+    service = "service"
+
+
+class ProfileFormat(str, enum.Enum):
+    collapsed = "collapsed"
+    pstats = "pstats"
+
+
+class ReconciliationStatus(str, enum.Enum):
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class EventDependency(str, enum.Enum):
+    customer = "customer"
+    subscription = "subscription"
+
+
+class OutboxStatus(str, enum.Enum):
+    pending = "pending"
+    failed = "failed"
+
+
+class OrganizationStatus(str, enum.Enum):
+    active = "active"
+    # Being removed by an offboarding job; nothing new is synced for it
+    offboarding = "offboarding"
+
+
+class JobKind(str, enum.Enum):
+    webhook_replay = "webhook_replay"
+    org_offboarding = "org_offboarding"
+
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+    cancelled = "cancelled"
@@ -0,0 +1,139 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+_context: Optional[CryptContext] = None
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing pool already has its maximum number of pending jobs."""
+
+
+def build_context() -> CryptContext:
+    """
+    Build the password CryptContext from settings.
+
+    The first scheme in PASSWORD_HASH_SCHEMES is used for new hashes; the others
+    are still accepted but reported by `needs_update`. BCRYPT_ROUNDS doubles as the
+    minimum cost, so raising it upgrades existing hashes on their next login.
+    """
+    return CryptContext(
+        schemes=settings.PASSWORD_HASH_SCHEMES,
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    )
+
+
+def get_context() -> CryptContext:
+    global _context
+    if _context is None:
+        _context = build_context()
+    return _context
+
+
+def hash_password(password: str) -> str:
+    return get_context().hash(password)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    context = get_context()
+    return [context.hash(password) for password in passwords]
+
+
+def verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return get_context().verify_and_update(password, hashed)
+
+
+class PasswordHasher:
+    """
+    Runs password hashing in a bounded process pool.
+
+    Hashing is deliberately slow CPU work; running it on API threads lets a login
+    burst starve every other route. Jobs go to PASSWORD_HASH_WORKERS processes, and
+    at most PASSWORD_HASH_MAX_PENDING further jobs may wait. Beyond that the caller
+    gets `HashingBusyError` straight away instead of queueing unboundedly.
+
+    With PASSWORD_HASH_WORKERS=0, or inside a daemonic process such as a Celery
+    prefork child (which cannot start children), hashing runs inline.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(
+            max(1, settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_PENDING)
+        )
+
+    @property
+    def inline(self) -> bool:
+        return (
+            settings.PASSWORD_HASH_WORKERS <= 0
+            or multiprocessing.current_process().daemon
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=get_context,
+                )
+            return self._executor
+
+    def submit(self, fn, *args, wait: bool = False) -> Future:
+        """
+        Queue a job; with `wait`, block for a free slot instead of raising.
+        """
+        if not self._slots.acquire(blocking=wait):
+            raise HashingBusyError("Password hashing queue is full.")
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def hash(self, password: str) -> str:
+        if self.inline:
+            return hash_password(password)
+        return self.submit(hash_password, password).result()
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hash a batch as one job per worker, in order.
+
+        Bulk callers wait for slots rather than fail, and hold at most
+        PASSWORD_HASH_WORKERS of them, so logins still get the rest.
+        """
+        if self.inline or not passwords:
+            return hash_passwords(passwords)
+        size = -(-len(passwords) // settings.PASSWORD_HASH_WORKERS)
+        jobs = [
+            self.submit(hash_passwords, passwords[start : start + size], wait=True)
+            for start in range(0, len(passwords), size)
+        ]
+        return [hashed for job in jobs for hashed in job.result()]
+
+    def verify_and_update(
+        self, password: str, hashed: str
+    ) -> Tuple[bool, Optional[str]]:
+        if self.inline:
+            return verify_and_update(password, hashed)
+        return self.submit(verify_and_update, password, hashed).result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,169 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Metrics are process-global. With PROMETHEUS_MULTIPROC_DIR set (Celery prefork,
+# multi-worker uvicorn) every process writes its samples to mmapped files in that
+# directory and a scrape aggregates them; otherwise the default registry is used.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+LAG_BUCKETS = (0.1, 0.5, 1, 5, 15, 30, 60, 300, 900, 3600)
+BATCH_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status code.",
+    ["route", "method", "status_code"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and method.",
+    ["route", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+
+WEBHOOK_EVENTS_RECEIVED = Counter(
+    "webhook_events_received_total",
+    "Webhook events accepted for processing.",
+    ["service"],
+)
+WEBHOOK_BATCH_SIZE = Histogram(
+    "webhook_batch_size",
+    "Events per webhook request.",
+    ["service"],
+    buckets=BATCH_BUCKETS,
+)
+WEBHOOK_ENQUEUE_SECONDS = Histogram(
+    "webhook_enqueue_duration_seconds",
+    "Time to publish one event to the broker.",
+    ["service"],
+    buckets=LATENCY_BUCKETS,
+)
+
+EVENT_QUEUE_LAG_SECONDS = Histogram(
+    "event_queue_lag_seconds",
+    "Time between enqueueing an event and a worker starting on it.",
+    ["service"],
+    buckets=LAG_BUCKETS,
+)
+EVENT_STAGE_SECONDS = Histogram(
+    "event_stage_duration_seconds",
+    "process_event time per stage (parse, external, sync, log).",
+    ["service", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+EVENT_DUPLICATES = Counter(
+    "event_duplicates_total",
+    "Events skipped because they were already processed.",
+    ["service"],
+)
+EVENT_RETRIES = Counter(
+    "event_retries_total",
+    "process_event retries scheduled.",
+    ["service"],
+)
+EVENT_FAILURES = Counter(
+    "event_failures_total",
+    "Events that failed permanently after exhausting retries.",
+    ["service"],
+)
+
+BROKER_QUEUE_DEPTH = Gauge(
+    "broker_queue_depth",
+    "Messages waiting in integration_queue at the last admission sample.",
+    multiprocess_mode="max",
+)
+BROKER_OLDEST_MESSAGE_AGE_SECONDS = Gauge(
+    "broker_oldest_message_age_seconds",
+    "Age of the oldest message in integration_queue at the last admission sample.",
+    multiprocess_mode="max",
+)
+
+EVENTS_PARKED = Counter(
+    "events_parked_total",
+    "Events parked until an entity they depend on is synced.",
+    ["service", "dependency"],
+)
+EVENTS_UNPARKED = Counter(
+    "events_unparked_total",
+    "Parked events released for processing or expired.",
+    ["dependency", "outcome"],
+)
+PARKED_EVENTS = Gauge(
+    "parked_events",
+    "Events waiting on a dependency at the last parking sweep.",
+    ["dependency"],
+    multiprocess_mode="max",
+)
+OUTBOX_EVENTS = Counter(
+    "outbox_events_total",
+    "Change feed events by delivery outcome (delivered, retried, failed).",
+    ["outcome"],
+)
+OUTBOX_DELIVERY_SECONDS = Histogram(
+    "outbox_delivery_duration_seconds",
+    "Time to POST one batch of change feed events to an endpoint.",
+    buckets=LATENCY_BUCKETS,
+)
+OUTBOX_DELIVERY_BATCH_SIZE = Histogram(
+    "outbox_delivery_batch_size",
+    "Change feed events per POST.",
+    buckets=BATCH_BUCKETS,
+)
+JOB_CHUNKS = Counter(
+    "job_chunks_total",
+    "Background job chunks run, by job kind and outcome (completed, failed).",
+    ["kind", "outcome"],
+)
+JOB_CHUNK_SECONDS = Histogram(
+    "job_chunk_duration_seconds",
+    "Time to run and commit one background job chunk.",
+    ["kind"],
+    buckets=LATENCY_BUCKETS,
+)
+JOBS_FINISHED = Counter(
+    "jobs_finished_total",
+    "Background jobs that finished, by kind and final status.",
+    ["kind", "status"],
+)
+OFFBOARDED_ROWS = Counter(
+    "offboarded_rows_total",
+    "Rows removed or anonymized by organization offboarding, by table and action.",
+    ["table", "action"],
+)
+OFFBOARDING_LAG_WAITS = Counter(
+    "offboarding_replication_lag_waits_total",
+    "Offboarding chunks held back because replica lag was over the limit.",
+)
+
+WORKER_TARGET_CONCURRENCY = Gauge(
+    "worker_target_concurrency",
+    "Pool size chosen by the worker autoscaler at its last decision.",
+    multiprocess_mode="max",
+)
+WORKER_AUTOSCALE_BACKOFFS = Counter(
+    "worker_autoscale_backoffs_total",
+    "Autoscaler decisions that shrank or held the pool because a dependency was slow.",
+    ["bottleneck"],
+)
+
+
+def metrics_registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
@@ -0,0 +1,147 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.enums import UserRole, UserStatus
+from app.core.redis import RedisBreaker
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated caller: just enough of the User row to authorize a request.
+    """
+
+    id: UUID
+    email: str
+    role: UserRole
+    status: UserStatus
+    org_id: Optional[UUID]
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=UserRole(user.role),
+            status=UserStatus(user.status),
+            org_id=user.org_id,
+        )
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "Principal":
+        return cls(
+            id=UUID(claims["sub"]),
+            email=claims["email"],
+            role=UserRole(claims["role"]),
+            status=UserStatus(claims["status"]),
+            org_id=UUID(claims["org_id"]) if claims.get("org_id") else None,
+        )
+
+    def to_claims(self) -> dict:
+        return {
+            "sub": str(self.id),
+            "email": self.email,
+            "role": self.role.value,
+            "status": self.status.value,
+            "org_id": str(self.org_id) if self.org_id else None,
+        }
+
+
+def token_fingerprint(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PrincipalCache:
+    """
+    Two-level cache of principals keyed by user id and token.
+
+    The in-process LRU answers most requests without any I/O; Redis shares
+    principals between API workers. Each user's entries live in one Redis hash
+    (`principal:{user_id}`, one field per token), so invalidating a user is a
+    single DEL. Other processes see an invalidation once their short local TTL
+    runs out.
+
+    Redis is an optimisation only: when it errors, the cache stops using it for a
+    while and callers fall back to the database.
+    """
+
+    def __init__(self):
+        self.local = TTLCache(
+            maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+            ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+        )
+        self.redis = RedisBreaker("Principal cache")
+
+    @staticmethod
+    def _redis_key(user_id) -> str:
+        return f"principal:{user_id}"
+
+    def get(self, user_id: str, token: str) -> Optional[Principal]:
+        fingerprint = token_fingerprint(token)
+        principal = self.local.get((user_id, fingerprint))
+        if principal is not None:
+            return principal
+
+        client = self.redis.client()
+        if client is None:
+            return None
+        try:
+            raw = client.hget(self._redis_key(user_id), fingerprint)
+        except RedisError as exc:
+            self.redis.failed(exc)
+            return None
+        if raw is None:
+            return None
+
+        principal = Principal.from_claims(json.loads(raw))
+        self.local.set((user_id, fingerprint), principal)
+        return principal
+
+    def set(self, user_id: str, token: str, principal: Principal):
+        fingerprint = token_fingerprint(token)
+        self.local.set((user_id, fingerprint), principal)
+
+        client = self.redis.client()
+        if client is None:
+            return
+        key = self._redis_key(user_id)
+        try:
+            pipe = client.pipeline()
+            pipe.hset(key, fingerprint, json.dumps(principal.to_claims()))
+            pipe.expire(key, settings.PRINCIPAL_CACHE_REDIS_TTL_SECONDS)
+            pipe.execute()
+        except RedisError as exc:
+            self.redis.failed(exc)
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        self.local.delete_where(lambda key, _: key[0] == user_id)
+
+        client = self.redis.client()
+        if client is None:
+            return
+        try:
+            client.delete(self._redis_key(user_id))
+        except RedisError as exc:
+            self.redis.failed(exc)
+
+    def clear(self):
+        self.local.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+def invalidate_principal(user_id):
+    """
+    Drop cached principals for a user after their role, status or org changes.
+    """
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        principal_cache.invalidate(user_id)
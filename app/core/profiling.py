@@ -0,0 +1,334 @@
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.enums import ProfileFormat, ProfileTarget
+from app.core.redis import RedisBreaker, get_redis
+from app.utils.logger import get_logger
+
+logger = get_logger("profiling")
+
+REMAINING_KEY = "profiling:remaining"
+FORMAT_KEY = "profiling:format"
+
+
+@dataclass(frozen=True)
+class ProfileArm:
+    kind: ProfileTarget
+    target: str
+    remaining: int
+    format: ProfileFormat
+
+
+def _field(kind: ProfileTarget, target: str) -> str:
+    return f"{kind.value}:{target}"
+
+
+class ProfilingSwitch:
+    """
+    Counts of profiles still to capture, per route or service, shared via Redis.
+
+    An admin arms a target for the next N requests or tasks; whichever API or
+    worker process picks one up claims it with an atomic HINCRBY, so N profiles
+    are captured in total, not N per process. Processes re-read the armed set
+    every PROFILE_POLL_SECONDS on a background thread, so unarmed traffic pays
+    a dict lookup and the event loop never waits on Redis for it.
+
+    Redis is required to arm anything; when it is unavailable nothing is
+    profiled (except slow tasks, which don't need arming).
+    """
+
+    def __init__(self):
+        self._armed: Dict[str, int] = {}
+        self._next_poll_at = 0.0
+        self._polling = threading.Lock()
+        self.redis = RedisBreaker("Profiling switch", lambda: get_redis())
+
+    def _redis_failed(self, exc: Exception):
+        self.redis.failed(exc)
+        self._armed = {}
+
+    def arm(self, kind: ProfileTarget, target: str, count: int, fmt: ProfileFormat):
+        """
+        Raises:
+            RedisError: When the switch can't be stored.
+        """
+        field = _field(kind, target)
+        pipe = get_redis().pipeline()
+        pipe.hset(REMAINING_KEY, field, count)
+        pipe.hset(FORMAT_KEY, field, fmt.value)
+        pipe.expire(REMAINING_KEY, settings.PROFILE_ARM_TTL_SECONDS)
+        pipe.expire(FORMAT_KEY, settings.PROFILE_ARM_TTL_SECONDS)
+        pipe.execute()
+        # Other processes see it at their next poll
+        self._armed = {**self._armed, field: count}
+
+    def disarm(self, kind: ProfileTarget, target: str):
+        field = _field(kind, target)
+        pipe = get_redis().pipeline()
+        pipe.hdel(REMAINING_KEY, field)
+        pipe.hdel(FORMAT_KEY, field)
+        pipe.execute()
+        self._armed = {key: n for key, n in self._armed.items() if key != field}
+
+    def armed(self) -> List[ProfileArm]:
+        client = get_redis()
+        remaining = client.hgetall(REMAINING_KEY)
+        formats = client.hgetall(FORMAT_KEY)
+        arms = []
+        for field, count in remaining.items():
+            if int(count) <= 0:
+                continue
+            kind, _, target = _decode(field).partition(":")
+            fmt = _decode(formats.get(field, b"collapsed"))
+            arms.append(
+                ProfileArm(ProfileTarget(kind), target, int(count), ProfileFormat(fmt))
+            )
+        return arms
+
+    def poll(self):
+        """
+        Re-read the armed set from Redis.
+        """
+        client = self.redis.client()
+        if client is None:
+            return
+        try:
+            self._armed = {
+                _decode(field): int(count)
+                for field, count in client.hgetall(REMAINING_KEY).items()
+                if int(count) > 0
+            }
+        except RedisError as exc:
+            self._redis_failed(exc)
+
+    def _poll_in_background(self):
+        try:
+            self.poll()
+        finally:
+            self._polling.release()
+
+    def _maybe_poll(self):
+        if time.monotonic() < self._next_poll_at:
+            return
+        if not self._polling.acquire(blocking=False):
+            return
+        self._next_poll_at = time.monotonic() + settings.PROFILE_POLL_SECONDS
+        threading.Thread(target=self._poll_in_background, daemon=True).start()
+
+    def is_armed(self, kind: ProfileTarget, target: str) -> bool:
+        """
+        Whether the target was armed at the last poll; never waits on Redis.
+        """
+        self._maybe_poll()
+        return _field(kind, target) in self._armed
+
+    def claim(self, kind: ProfileTarget, target: str) -> Optional[ProfileFormat]:
+        """
+        Take one armed profile for the target; returns its format, or None.
+
+        Claiming an armed target is a Redis round trip, so on the event loop
+        check `is_armed` first and claim from a thread.
+        """
+        if not self.is_armed(kind, target):
+            return None
+        field = _field(kind, target)
+        client = self.redis.client()
+        if client is None:
+            return None
+        try:
+            pipe = client.pipeline()
+            pipe.hincrby(REMAINING_KEY, field, -1)
+            pipe.hget(FORMAT_KEY, field)
+            remaining, fmt = pipe.execute()
+            if remaining <= 0:
+                self._armed = {key: n for key, n in self._armed.items() if key != field}
+                client.hdel(REMAINING_KEY, field)
+        except RedisError as exc:
+            self._redis_failed(exc)
+            return None
+        if remaining < 0:
+            return None
+        return ProfileFormat(_decode(fmt)) if fmt else ProfileFormat.collapsed
+
+    def reset(self):
+        self._armed = {}
+        self._next_poll_at = 0.0
+        self.redis.reset()
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _frame_label(code) -> str:
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+def collapse_stack(frame) -> str:
+    """
+    Render a frame's stack root-first as `outer;inner;leaf`, the collapsed
+    format read by flamegraph.pl and speedscope.
+    """
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code).replace(";", ":"))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Statistical profiler: a thread snapshots the stacks of the watched threads
+    every PROFILE_SAMPLE_INTERVAL_SECONDS and counts identical stacks.
+
+    Unlike cProfile it adds no per-call overhead and sees every thread, which
+    matters for API requests whose sync endpoints run in the threadpool.
+    """
+
+    format = ProfileFormat.collapsed
+
+    def __init__(self, thread_ids: Optional[Iterable[int]] = None):
+        self.thread_ids = set(thread_ids) if thread_ids is not None else None
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(settings.PROFILE_SAMPLE_INTERVAL_SECONDS):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                self.stacks[collapse_stack(frame)] += 1
+
+    def write(self, path: str):
+        with open(path, "w") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+
+class CallProfiler:
+    """
+    Deterministic cProfile profile of the calling thread, saved as pstats.
+    """
+
+    format = ProfileFormat.pstats
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, path: str):
+        self.profile.dump_stats(path)
+
+
+def make_profiler(fmt: ProfileFormat, thread_ids: Optional[Iterable[int]] = None):
+    if fmt == ProfileFormat.pstats:
+        return CallProfiler()
+    return StackSampler(thread_ids)
+
+
+def save_profile(profiler, kind: str, target: str, elapsed: float) -> Optional[str]:
+    """
+    Write a profile under PROFILE_DIR; returns its path.
+    """
+    extension = "prof" if profiler.format == ProfileFormat.pstats else "collapsed"
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", target).strip("_") or "root"
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    path = os.path.join(
+        settings.PROFILE_DIR,
+        f"{kind}-{name}-{stamp}-{os.getpid()}-{round(elapsed * 1000)}ms.{extension}",
+    )
+    try:
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        profiler.write(path)
+    except OSError as exc:
+        logger.warning(f"Could not write profile {path}: {exc}")
+        return None
+    logger.info(
+        "Profile captured",
+        extra={"profile": path, "target": target, "elapsed_ms": round(elapsed * 1000)},
+    )
+    return path
+
+
+profiling_switch = ProfilingSwitch()
+
+
+@contextmanager
+def profile_task(service_name: str):
+    """
+    Profile one task if its service is armed, or if it runs longer than
+    PROFILE_SLOW_TASK_SECONDS.
+
+    Slow-task capture samples every task (the overhead is one sampler thread
+    waking at PROFILE_SAMPLE_INTERVAL_SECONDS) and only writes the profile when
+    the threshold was exceeded.
+    """
+    fmt = profiling_switch.claim(ProfileTarget.service, service_name)
+    slow_after = settings.PROFILE_SLOW_TASK_SECONDS
+    if fmt is None and not slow_after:
+        yield
+        return
+
+    thread_ids = [threading.get_ident()]
+    profiler = make_profiler(fmt or ProfileFormat.collapsed, thread_ids)
+    started = time.perf_counter()
+    try:
+        profiler.start()
+    except ValueError:
+        # Python 3.12+ refuses a second cProfile (e.g. under a debugger).
+        profiler = StackSampler(thread_ids)
+        profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        elapsed = time.perf_counter() - started
+        if fmt is not None or elapsed >= slow_after:
+            save_profile(profiler, "task", service_name, elapsed)
+
+
+@contextmanager
+def profile_request(path: str):
+    """
+    Sample all threads while a request for `path`, whose profile has been
+    claimed, is in flight.
+    """
+    sampler = StackSampler()
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        save_profile(sampler, "route", path, time.perf_counter() - started)
@@ -1,4 +1,68 @@
+import math
+import time
+from collections import Counter
+from typing import Iterable
+
+from fastapi import HTTPException, status
+from limits import RateLimitItem, parse
+from limits.strategies import SlidingWindowCounterRateLimiter
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address)
+from app.core.config import settings
+from app.core.enums import ServiceType
+from app.schemas.webhooks import BaseWebhookEvent
+
+limiter = Limiter(
+    key_func=get_remote_address, storage_uri=settings.RATE_LIMIT_STORAGE_URI
+)
+
+# Shares the limiter's storage, so every API process and replica draws from the
+# same buckets in Redis. The sliding window counter keeps two counters per key
+# and accepts a per-call cost, which makes it behave like a token bucket that
+# refills continuously over the period. A negative cost hands units back.
+event_limiter = SlidingWindowCounterRateLimiter(limiter._storage)
+
+
+def webhook_limit_for(service: ServiceType) -> RateLimitItem:
+    return parse(
+        settings.WEBHOOK_RATE_LIMIT_OVERRIDES.get(
+            service.value, settings.webhook_rate_limit
+        )
+    )
+
+
+def enforce_webhook_rate_limit(
+    service: ServiceType, events: Iterable[BaseWebhookEvent]
+):
+    """
+    Charge a webhook request against its tenants' budgets, one unit per event.
+
+    Budgets are keyed by (organization_id, service), so providers sharing an
+    egress IP don't share a bucket and a 1,000-event batch costs 1,000 units.
+    A batch is admitted only if every tenant in it has enough budget left.
+
+    Raises:
+        HTTPException: 429 with a Retry-After header when a budget is exhausted.
+    """
+    limit = webhook_limit_for(service)
+    costs = Counter(event.organization_id for event in events)
+
+    charged = []
+    for org_id, cost in costs.items():
+        # Each hit checks and takes the budget in one step in the storage, so
+        # concurrent requests can't both pass on the same remaining units
+        if event_limiter.hit(limit, org_id, service.value, cost=cost):
+            charged.append((org_id, cost))
+            continue
+        # Hand back what the batch's other tenants were charged
+        for charged_org_id, charged_cost in charged:
+            event_limiter.hit(limit, charged_org_id, service.value, cost=-charged_cost)
+        reset_time, _ = event_limiter.get_window_stats(limit, org_id, service.value)
+        retry_after = max(1, math.ceil(reset_time - time.time()))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded: {limit} events for organization "
+            f"{org_id} on {service.value}",
+            headers={"Retry-After": str(retry_after)},
+        )
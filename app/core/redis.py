@@ -0,0 +1,80 @@
+import time
+from functools import lru_cache
+from typing import Callable, Optional
+
+import redis
+
+from app.core.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("redis")
+
+# How long an optional Redis client is left alone after an error
+REDIS_RETRY_AFTER_SECONDS = 30
+
+
+@lru_cache
+def get_redis() -> redis.Redis:
+    """
+    Shared Redis client for caches and coordination state (not the Celery broker).
+
+    The client connects lazily and uses short socket timeouts so that callers can
+    treat Redis as an optimisation and fall back when it is unavailable.
+    """
+    return redis.Redis.from_url(
+        settings.REDIS_CACHE_URL,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    )
+
+
+@lru_cache
+def get_broker_redis() -> redis.Redis:
+    """
+    Client for the Celery broker, used only to observe queue depth and memory.
+    """
+    return redis.Redis.from_url(
+        settings.REDIS_BROKER_URL,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    )
+
+
+@lru_cache
+def get_stream_redis() -> redis.Redis:
+    """
+    Broker client for the stream consumers, whose XREADGROUP blocks for up to
+    STREAM_BLOCK_MS, longer than the usual socket timeout.
+    """
+    return redis.Redis.from_url(
+        settings.REDIS_BROKER_URL,
+        socket_timeout=settings.STREAM_BLOCK_MS / 1000 + settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    )
+
+
+class RedisBreaker:
+    """
+    Gate for callers that treat Redis as optional.
+
+    After an error the breaker hands out no client for
+    REDIS_RETRY_AFTER_SECONDS, so callers fall back at once instead of each
+    waiting out a socket timeout.
+    """
+
+    def __init__(self, name: str, get_client: Callable[[], redis.Redis] = get_redis):
+        self.name = name
+        self._get_client = get_client
+        self._down_until = 0.0
+
+    def client(self) -> Optional[redis.Redis]:
+        if time.monotonic() < self._down_until:
+            return None
+        return self._get_client()
+
+    def failed(self, exc: Exception):
+        logger.warning(f"{self.name} Redis unavailable: {exc}")
+        self._down_until = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+
+    def reset(self):
+        self._down_until = 0.0
@@ -0,0 +1,119 @@
+import hashlib
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from jose import JWTError, jwk, jwt
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+
+class KeyRing:
+    """
+    Signing and verification keys for access tokens.
+
+    With an HMAC algorithm (HS256, the default) this is just `JWT_SECRET_KEY`.
+    With an asymmetric algorithm (RS256/ES256) every `<kid>.pem` file in
+    `JWT_PRIVATE_KEYS_DIR` is loaded: `JWT_ACTIVE_KID` signs new tokens, and
+    every key, including retired ones that only ship their public half, can still
+    verify tokens carrying its `kid`. The public halves are published as a JWKS
+    document so other services verify tokens without sharing a secret.
+    """
+
+    def __init__(self):
+        self.algorithm = settings.JWT_ALGORITHM
+        self.asymmetric = not self.algorithm.startswith("HS")
+        self.keys: Dict[str, jwk.Key] = {}
+        self.public_keys: Dict[str, jwk.Key] = {}
+        self.active_kid: Optional[str] = None
+
+        if self.asymmetric:
+            if not settings.JWT_PRIVATE_KEYS_DIR or not settings.JWT_ACTIVE_KID:
+                raise RuntimeError(
+                    f"JWT_PRIVATE_KEYS_DIR and JWT_ACTIVE_KID must be set for {self.algorithm}"
+                )
+            for path in sorted(Path(settings.JWT_PRIVATE_KEYS_DIR).glob("*.pem")):
+                key = jwk.construct(path.read_bytes(), self.algorithm)
+                self.keys[path.stem] = key
+                self.public_keys[path.stem] = (
+                    key if key.is_public() else key.public_key()
+                )
+            self.active_kid = settings.JWT_ACTIVE_KID
+            signing_key = self.keys.get(self.active_kid)
+            if signing_key is None or signing_key.is_public():
+                raise RuntimeError(
+                    f"No private key found for active kid '{self.active_kid}'"
+                )
+
+    def sign(self, claims: dict) -> str:
+        if not self.asymmetric:
+            return jwt.encode(claims, settings.JWT_SECRET_KEY, algorithm=self.algorithm)
+        return jwt.encode(
+            claims,
+            self.keys[self.active_kid],
+            algorithm=self.algorithm,
+            headers={"kid": self.active_kid},
+        )
+
+    def verify(self, token: str) -> dict:
+        if not self.asymmetric:
+            return jwt.decode(
+                token, settings.JWT_SECRET_KEY, algorithms=[self.algorithm]
+            )
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.public_keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown key id: {kid}")
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+    def jwks(self) -> dict:
+        keys = []
+        for kid, key in self.public_keys.items():
+            keys.append({**key.to_dict(), "kid": kid, "use": "sig"})
+        return {"keys": keys}
+
+
+@lru_cache
+def get_key_ring() -> KeyRing:
+    return KeyRing()
+
+
+verification_cache = TTLCache(
+    maxsize=settings.JWT_VERIFY_CACHE_MAX_ENTRIES,
+    ttl=settings.JWT_VERIFY_CACHE_MAX_TTL_SECONDS,
+)
+
+
+def encode_token(claims: dict) -> str:
+    return get_key_ring().sign(claims)
+
+
+def decode_token(token: str) -> dict:
+    """
+    Verify a token and return its claims.
+
+    Verified claims are cached under the token's SHA-256 until the token's `exp`
+    (capped at JWT_VERIFY_CACHE_MAX_TTL_SECONDS), so repeat requests with the same
+    token skip signature verification entirely.
+
+    Raises:
+        JWTError: If the token is invalid or expired.
+    """
+    if not settings.JWT_VERIFY_CACHE_ENABLED:
+        return get_key_ring().verify(token)
+
+    key = hashlib.sha256(token.encode()).digest()
+    claims = verification_cache.get(key)
+    if claims is not None:
+        return claims
+
+    claims = get_key_ring().verify(token)
+    exp = claims.get("exp")
+    ttl = settings.JWT_VERIFY_CACHE_MAX_TTL_SECONDS
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        verification_cache.set(key, claims, ttl=ttl)
+    return claims
@@ -0,0 +1,327 @@
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+TRACEPARENT_HEADER = "traceparent"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+_correlation_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "correlation_id", default=None
+)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    sampled: bool
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key: str, value: Any):
+        if self.sampled:
+            self.attributes[key] = value
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple[str, str, bool]]:
+    """
+    Parse a W3C `traceparent` header into (trace_id, parent span_id, sampled).
+    """
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+class SpanExporter:
+    """
+    Batches finished spans on a background thread and writes them as OTLP/JSON.
+
+    TRACE_EXPORTER=file appends one `ExportTraceServiceRequest` document per line
+    to TRACE_FILE_PATH, which works offline and can be replayed into any OTLP
+    collector; TRACE_EXPORTER=otlp POSTs the same document to
+    TRACE_OTLP_ENDPOINT. Spans are dropped, never blocked on, when the buffer is
+    full.
+    """
+
+    def __init__(self, max_queue: int = 10_000, batch_size: int = 512):
+        self.service_name = settings.TRACE_SERVICE_NAME
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self):
+        # Threads don't survive fork, so each (prefork) process starts its own.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def export(self, span: Span):
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + settings.TRACE_EXPORT_INTERVAL_SECONDS
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self.write(batch)
+            except Exception as exc:
+                logging.getLogger("tracing").warning(f"Span export failed: {exc}")
+
+    def document(self, spans: List[Span]) -> dict:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self.service_name},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "app.core.tracing"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def write(self, spans: List[Span]):
+        document = self.document(spans)
+        if settings.TRACE_EXPORTER == "otlp":
+            import httpx
+
+            httpx.post(settings.TRACE_OTLP_ENDPOINT, json=document, timeout=5)
+        else:
+            with open(settings.TRACE_FILE_PATH, "a") as fh:
+                fh.write(json.dumps(document) + "\n")
+
+
+class Tracer:
+    """
+    Minimal W3C-compatible tracer.
+
+    The sampling decision is made once per trace, at the root span, from
+    TRACE_SAMPLE_RATIO (or inherited from an incoming `traceparent`). Unsampled
+    spans still carry ids so context keeps propagating, but record nothing and
+    are never exported.
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        self.exporter = exporter or SpanExporter()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.TRACING_ENABLED
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        traceparent: Optional[str] = None,
+    ):
+        """
+        Open a span as a child of the current span, or of `traceparent` if given.
+
+        Yields None when tracing is disabled.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        remote = parse_traceparent(traceparent)
+        if remote:
+            trace_id, parent_id, sampled = remote
+        elif parent:
+            trace_id, parent_id, sampled = (
+                parent.trace_id,
+                parent.span_id,
+                parent.sampled,
+            )
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+            sampled = random.random() < settings.TRACE_SAMPLE_RATIO
+
+        span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent_id,
+            sampled=sampled,
+        )
+        if sampled and attributes:
+            span.attributes.update(attributes)
+        correlation_id = _correlation_id.get()
+        if correlation_id:
+            span.set_attribute("correlation_id", correlation_id)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            if span.sampled:
+                self.exporter.export(span)
+
+
+tracer = Tracer()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_traceparent() -> Optional[str]:
+    span = _current_span.get()
+    return span.traceparent if span else None
+
+
+@contextmanager
+def correlation_context(correlation_id: Optional[str]):
+    """
+    Tag spans and log records in this context with an event's correlation id.
+    """
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield
+    finally:
+        _correlation_id.reset(token)
+
+
+def _install_log_record_factory():
+    # Every record gets trace_id/span_id/correlation_id ("-" when unset), so log
+    # formats can reference them without a filter on each handler.
+    base_factory = logging.getLogRecordFactory()
+
+    def factory(*args, **kwargs):
+        record = base_factory(*args, **kwargs)
+        span = _current_span.get()
+        record.trace_id = span.trace_id if span else "-"
+        record.span_id = span.span_id if span else "-"
+        record.correlation_id = _correlation_id.get() or "-"
+        return record
+
+    logging.setLogRecordFactory(factory)
+
+
+def instrument_sqlalchemy(engine_class):
+    """
+    Emit a child span for every SQL statement executed inside a sampled trace.
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine_class, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        parent = _current_span.get()
+        if parent is None or not parent.sampled:
+            return
+        span_cm = tracer.start_span(
+            "db.query",
+            {
+                "db.system": "postgresql",
+                "db.statement": statement[: settings.TRACE_SQL_MAX_LENGTH],
+            },
+        )
+        span_cm.__enter__()
+        conn.info.setdefault("trace_spans", []).append(span_cm)
+
+    @event.listens_for(engine_class, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            spans.pop().__exit__(None, None, None)
+
+    @event.listens_for(engine_class, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("trace_spans") if conn is not None else None
+        if spans:
+            error = exception_context.original_exception
+            spans.pop().__exit__(type(error), error, None)
+
+
+_install_log_record_factory()
@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+
+@contextmanager
+def advisory_lock(db: Session, *key: int):
+    """
+    Hold a session-level advisory lock; yields whether it was taken.
+
+    The lock lives on its own connection, outside any transaction, so the
+    session can commit as it goes, and no connection sits idle in a
+    transaction while the holder does slow work.
+    """
+    with db.get_bind().connect() as conn:
+        locked = conn.scalar(select(func.pg_try_advisory_lock(*key)))
+        conn.commit()
+        try:
+            yield locked
+        finally:
+            if locked:
+                conn.scalar(select(func.pg_advisory_unlock(*key)))
+            conn.commit()
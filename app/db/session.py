@@ -1,7 +1,11 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from app.core.config import settings
+from app.core.tracing import instrument_sqlalchemy
+
+instrument_sqlalchemy(Engine)
 
 engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
 SessionLocal = scoped_session(
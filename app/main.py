@@ -1,27 +1,38 @@
-import logging
-import sys
-
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
-from app.core.config import settings
 from app.core.rate_limit import limiter
+from app.core.tracing import TRACEPARENT_HEADER, tracer
+from app.utils.logger import configure_logging, stop_logging
 
-logging.basicConfig(
-    level=settings.LOG_LEVEL,
-    format=settings.LOG_FORMAT,
-    datefmt=settings.LOG_DATE_FORMAT,
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
+configure_logging()
 
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import integrations, org, user, webhooks
+from app.api import (
+    audit_logs,
+    exports,
+    integrations,
+    jobs,
+    metrics,
+    org,
+    profiling,
+    user,
+    webhook_logs,
+    webhooks,
+    well_known,
+)
 from app.commands.bootstrap import create_initial_superadmin
 from app.commands.migrate import run_migrations
+from app.core.enums import ProfileTarget
+from app.core.hashing import password_hasher
+from app.core.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+from app.core.profiling import profile_request, profiling_switch
 from app.utils.logger import get_logger
 
 logger = get_logger("startup")
@@ -40,6 +51,8 @@ async def lifespan(app_instance: FastAPI):
 
     yield
     logger.info("Application shutting down...")
+    password_hasher.shutdown()
+    stop_logging()
 
 
 app = FastAPI(title="Multi-Tenant SaaS Platform", lifespan=lifespan)
@@ -52,6 +65,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # Label by route template so path parameters don't explode cardinality.
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_REQUEST_SECONDS.labels(route, request.method).observe(
+            time.perf_counter() - started
+        )
+        HTTP_REQUESTS.labels(route, request.method, str(status_code)).inc()
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    with tracer.start_span(
+        f"HTTP {request.method}",
+        {"http.method": request.method, "http.target": request.url.path},
+        traceparent=request.headers.get(TRACEPARENT_HEADER),
+    ) as span:
+        response = await call_next(request)
+        if span is not None:
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            span.name = f"HTTP {request.method} {route}"
+            span.set_attribute("http.route", route)
+            span.set_attribute("http.status_code", response.status_code)
+        return response
+
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    path = request.url.path
+    if not profiling_switch.is_armed(ProfileTarget.route, path):
+        return await call_next(request)
+    # Claiming talks to Redis, so it runs off the event loop
+    if await run_in_threadpool(profiling_switch.claim, ProfileTarget.route, path):
+        with profile_request(path):
+            return await call_next(request)
+    return await call_next(request)
+
+
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -59,3 +118,10 @@ app.include_router(org.router, prefix="/orgs", tags=["Organizations"])
 app.include_router(user.router, prefix="/users", tags=["Users"])
 app.include_router(webhooks.router, prefix="/webhooks", tags=["Webhooks"])
 app.include_router(integrations.router, prefix="/integrations", tags=["Integrations"])
+app.include_router(audit_logs.router, prefix="/audit-logs", tags=["Audit Logs"])
+app.include_router(webhook_logs.router, prefix="/webhook-logs", tags=["Webhook Logs"])
+app.include_router(exports.router, prefix="/exports", tags=["Exports"])
+app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+app.include_router(well_known.router, prefix="/.well-known", tags=["Auth"])
+app.include_router(metrics.router, tags=["Monitoring"])
+app.include_router(profiling.router, prefix="/profiling", tags=["Monitoring"])
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, String
+from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -10,9 +10,15 @@ from app.db.base import Base
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_org_timestamp_id", "org_id", "timestamp", "id"),
+        Index("ix_audit_logs_user_id", "user_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     action = Column(Enum(AuditAction), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"))
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    # Summary of an action that covers many rows, e.g. a bulk import
+    details = Column(JSON, nullable=True)
@@ -12,7 +12,9 @@ class CommunicationLog(Base):
     __tablename__ = "communication_logs"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True
+    )
     message_id = Column(String, unique=True, index=True, nullable=False)
     status = Column(Enum(CommunicationStatus), nullable=False)
     template = Column(String, nullable=True)
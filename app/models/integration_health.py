@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, DateTime
+from sqlalchemy import Enum as SqlEnum
+from sqlalchemy import String, func
+
+from app.core.enums import ServiceType
+from app.db.base import Base
+
+
+class IntegrationHealth(Base):
+    """
+    Running webhook outcome counters per (service, organization).
+
+    Maintained by `create_webhook_log` in the same transaction as the log row, so
+    health reads never have to scan webhook_logs.
+    """
+
+    __tablename__ = "integration_health"
+
+    service = Column(SqlEnum(ServiceType), primary_key=True)
+    org_id = Column(String, primary_key=True)
+    last_success_at = Column(DateTime(timezone=True), nullable=True)
+    last_event_id = Column(String, nullable=True)
+    last_failure_at = Column(DateTime(timezone=True), nullable=True)
+    last_failed_event_id = Column(String, nullable=True)
+    processed_count = Column(BigInteger, nullable=False, default=0)
+    failed_count = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
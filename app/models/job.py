@@ -0,0 +1,54 @@
+import uuid
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.enums import JobKind, JobStatus
+from app.db.base import Base
+
+
+class Job(Base):
+    """
+    A long-running admin operation, run in chunks on the admin_queue workers.
+
+    `checkpoint` is written in the same transaction as each chunk's work, so a
+    job interrupted at any point resumes after its last committed chunk.
+    `org_id` is deliberately not a foreign key: a job's record outlives the
+    organization it operated on.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_org_created_id", "org_id", "created_at", "id"),
+        Index("ix_jobs_status_updated", "status", "updated_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(Enum(JobKind), nullable=False)
+    org_id = Column(UUID(as_uuid=True), nullable=False)
+    created_by = Column(UUID(as_uuid=True), nullable=True)
+    status = Column(Enum(JobStatus), default=JobStatus.queued, nullable=False)
+    params = Column(JSON, nullable=False, default=dict)
+    checkpoint = Column(JSON, nullable=True)
+    processed_count = Column(BigInteger, nullable=False, default=0)
+    total_count = Column(BigInteger, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
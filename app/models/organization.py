@@ -1,9 +1,10 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Enum, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
+from app.core.enums import OrganizationStatus
 from app.db.base import Base
 
 
@@ -14,3 +15,12 @@ class Organization(Base):
     name = Column(String, unique=True, index=True, nullable=False)
     slug = Column(String, unique=True, index=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    status = Column(
+        Enum(OrganizationStatus),
+        default=OrganizationStatus.active,
+        server_default=OrganizationStatus.active.name,
+        nullable=False,
+    )
+    # Change feed endpoint (app.services.outbox); no feed when unset
+    webhook_url = Column(String, nullable=True)
+    webhook_secret = Column(String, nullable=True)
@@ -0,0 +1,52 @@
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.enums import OutboxStatus
+from app.db.base import Base
+
+
+class OutboxEvent(Base):
+    """
+    A change to a user, subscription or message, waiting to be delivered to
+    its organization's webhook endpoint.
+
+    Rows are written in the transaction that makes the change and deleted
+    once delivered. `id` orders the changes of an entity.
+    """
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_pending",
+            "org_id",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index("ix_outbox_events_entity", "org_id", "entity_type", "entity_id", "id"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
+    event_type = Column(String, nullable=False)
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(Enum(OutboxStatus), default=OutboxStatus.pending, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
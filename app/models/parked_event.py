@@ -0,0 +1,34 @@
+import uuid
+
+from sqlalchemy import JSON, Column, DateTime, Enum, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.enums import EventDependency, ServiceType
+from app.db.base import Base
+
+
+class ParkedEvent(Base):
+    """
+    An event waiting for an entity it refers to, e.g. a subscription event
+    whose customer has not been synced yet.
+
+    Rows are keyed by the missing dependency so that syncing it finds its
+    waiting events in one index lookup.
+    """
+
+    __tablename__ = "parked_events"
+    __table_args__ = (
+        Index("ix_parked_events_dependency", "dependency", "dependency_key"),
+        Index("ix_parked_events_expires_at", "expires_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    event_id = Column(String, nullable=False, unique=True)
+    service = Column(Enum(ServiceType), nullable=False)
+    org_id = Column(String, nullable=False)
+    dependency = Column(Enum(EventDependency), nullable=False)
+    dependency_key = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    parked_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,41 @@
+import uuid
+
+from sqlalchemy import BigInteger, Column, DateTime, Enum, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.enums import ReconciliationStatus
+from app.db.base import Base
+
+
+class UserReconciliation(Base):
+    """
+    One pass of an organization's users against the external user directory.
+
+    `next_page` is the checkpoint: every page before it has been applied, in
+    the same transaction that advanced it, so an interrupted run resumes there.
+    """
+
+    __tablename__ = "user_reconciliations"
+    __table_args__ = (
+        Index("ix_user_reconciliations_org_started", "org_id", "started_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
+    status = Column(
+        Enum(ReconciliationStatus),
+        default=ReconciliationStatus.running,
+        nullable=False,
+    )
+    next_page = Column(Integer, nullable=False, default=1)
+    total_pages = Column(Integer, nullable=True)
+    fetched_count = Column(BigInteger, nullable=False, default=0)
+    created_count = Column(BigInteger, nullable=False, default=0)
+    updated_count = Column(BigInteger, nullable=False, default=0)
+    conflict_count = Column(BigInteger, nullable=False, default=0)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
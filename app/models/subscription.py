@@ -11,7 +11,9 @@ class Subscription(Base):
     __tablename__ = "subscriptions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+    )
     external_subscription_id = Column(String, unique=True, index=True, nullable=False)
     plan = Column(Enum(SubscriptionPlan), nullable=False)
     status = Column(String, nullable=False)
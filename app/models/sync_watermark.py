@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.enums import ServiceType
+from app.db.base import Base
+
+
+class SyncWatermark(Base):
+    """
+    How far incremental sync has read an external service for an organization.
+
+    The watermark is the (last_updated, external id) of the last applied
+    entity. It advances in the same transaction as that entity's writes, and
+    the next sync asks the service only for entities after it.
+    """
+
+    __tablename__ = "sync_watermarks"
+
+    org_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id"), primary_key=True
+    )
+    service = Column(Enum(ServiceType), primary_key=True)
+    watermark_at = Column(DateTime(timezone=True), nullable=True)
+    watermark_id = Column(String, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,41 @@
+"""
+Change feed relay: delivers outbox events to organizations' webhook endpoints.
+
+Several relays can run side by side; each organization is relayed by one of
+them at a time.
+
+Usage:
+    python -m app.outbox_relay
+"""
+
+import signal
+import threading
+
+from app.core.config import settings
+from app.services.outbox import OutboxRelay
+from app.utils.logger import configure_logging, get_logger, stop_logging
+
+logger = get_logger("outbox_relay")
+
+
+def main():
+    configure_logging()
+    if settings.WORKER_METRICS_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(settings.WORKER_METRICS_PORT)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    logger.info(
+        "Outbox relay started", extra={"workers": settings.OUTBOX_RELAY_WORKERS}
+    )
+    OutboxRelay().run(stop)
+    logger.info("Outbox relay stopped")
+    stop_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.core.enums import AuditAction
+
+
+class AuditLogRead(BaseModel):
+    id: UUID
+    action: AuditAction
+    user_id: Optional[UUID]
+    org_id: Optional[UUID]
+    timestamp: Optional[datetime]
+    details: Optional[dict] = None
+
+    class Config:
+        from_attributes = True
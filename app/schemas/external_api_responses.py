@@ -35,6 +35,7 @@ class ExternalUserSummary(BaseModel):
     first_name: Optional[str]
     last_name: Optional[str]
     status: str
+    last_updated: Optional[datetime] = None
 
 
 class Pagination(BaseModel):
@@ -9,6 +9,9 @@ class ServiceIntegrationStatus(BaseModel):
     last_success: Optional[str]
     last_event_id: Optional[str]
     status: IntegrationHealthStatus
+    last_failure: Optional[str] = None
+    processed_count: int = 0
+    failed_count: int = 0
 
 
 class IntegrationStatusResponse(RootModel[Dict[str, ServiceIntegrationStatus]]):
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.core.enums import JobKind, JobStatus, ServiceType
+
+
+class JobCreate(BaseModel):
+    kind: JobKind
+    # Required for superadmins; admins always target their own organization
+    org_id: Optional[UUID] = None
+    params: Dict[str, Any] = {}
+
+
+class WebhookReplayParams(BaseModel):
+    """
+    Replay an organization's failed webhook events, optionally one service's
+    or only those logged since a point in time.
+    """
+
+    service: Optional[ServiceType] = None
+    since: Optional[datetime] = None
+
+
+class OrgOffboardingParams(BaseModel):
+    """
+    Remove an organization and its data. With `keep_audit_logs` its audit
+    trail is kept, with the user and organization references cleared.
+    """
+
+    keep_audit_logs: bool = True
+
+
+# Parameters of the job kinds submitted through POST /jobs/
+JOB_PARAMS = {
+    JobKind.webhook_replay: WebhookReplayParams,
+}
+
+
+class JobRead(BaseModel):
+    id: UUID
+    kind: JobKind
+    org_id: UUID
+    status: JobStatus
+    params: Dict[str, Any]
+    processed_count: int
+    total_count: Optional[int]
+    checkpoint: Optional[Dict[str, Any]]
+    attempts: int
+    cancel_requested: bool
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
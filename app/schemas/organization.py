@@ -1,6 +1,7 @@
+from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, HttpUrl, field_validator
 
 
 class OrgBase(BaseModel):
@@ -20,3 +21,20 @@ class OrgRead(OrgBase):
 
     class Config:
         from_attributes = True
+
+
+class OrgWebhookUpdate(BaseModel):
+    url: Optional[HttpUrl] = None
+    secret: Optional[str] = None
+
+    @field_validator("url")
+    @classmethod
+    def https_only(cls, url: Optional[HttpUrl]) -> Optional[HttpUrl]:
+        if url is not None and url.scheme != "https":
+            raise ValueError("Webhook URL must use https.")
+        return url
+
+
+class OrgWebhookRead(BaseModel):
+    url: Optional[str]
+    signed: bool
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.core.enums import ProfileFormat, ProfileTarget
+
+
+class ProfileArmRequest(BaseModel):
+    kind: ProfileTarget
+    # A request path such as "/webhooks/user-service", or a service name
+    target: str
+    count: int = Field(1, ge=1, le=settings.PROFILE_MAX_COUNT)
+    format: ProfileFormat = ProfileFormat.collapsed
+
+
+class ProfileArmRead(BaseModel):
+    kind: ProfileTarget
+    target: str
+    remaining: int
+    format: ProfileFormat
+
+    class Config:
+        from_attributes = True
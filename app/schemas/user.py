@@ -1,8 +1,10 @@
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 
-from app.core.enums import UserRole
+from app.core.enums import Department, Title, UserRole, UserStatus
 
 
 class UserBase(BaseModel):
@@ -17,6 +19,14 @@ class UserRead(UserBase):
         from_attributes = True
 
 
+class UserSummary(UserRead):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    status: UserStatus
+    external_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
@@ -26,3 +36,36 @@ class UserCreateInOrg(BaseModel):
     email: EmailStr
     password: str
     role: UserRole = UserRole.admin
+
+
+class UserImportRow(BaseModel):
+    """
+    One row of a bulk import. Users without a password are created pending.
+    """
+
+    email: EmailStr
+    password: Optional[str] = None
+    role: UserRole = UserRole.user
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    department: Optional[Department] = None
+    title: Optional[Title] = None
+
+    @field_validator("role")
+    @classmethod
+    def org_role(cls, role: UserRole) -> UserRole:
+        if role not in (UserRole.user, UserRole.admin):
+            raise ValueError("Invalid role. Must be 'user' or 'admin'.")
+        return role
+
+
+class UserImportError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    error: str
+
+
+class UserImportResult(BaseModel):
+    created: int
+    failed: int
+    errors: List[UserImportError]
@@ -1,9 +1,16 @@
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, RootModel
 
-from app.core.enums import BillingCycle, CommunicationStatus, SubscriptionPlan
+from app.core.enums import (
+    BillingCycle,
+    CommunicationStatus,
+    ServiceType,
+    SubscriptionPlan,
+    WebhookStatus,
+)
 
 # --- Common base event ---
 
@@ -139,3 +146,31 @@ class CommunicationServiceEvent(BaseWebhookEvent):
 
 class BatchWebhookEvents(BaseModel):
     events: List[BaseWebhookEvent]
+
+
+# --- Webhook log read model ---
+
+
+class WebhookLogRead(BaseModel):
+    id: UUID
+    event_id: str
+    service: ServiceType
+    org_id: str
+    status: WebhookStatus
+    received_at: Optional[datetime]
+    created_at: Optional[datetime]
+    stage_ms: Optional[List[Optional[int]]] = None
+
+    class Config:
+        from_attributes = True
+
+
+class StagePercentiles(BaseModel):
+    count: int
+    p50: Optional[float]
+    p95: Optional[float]
+    p99: Optional[float]
+
+
+class StageLatencyReport(RootModel[Dict[str, Dict[str, StagePercentiles]]]):
+    pass
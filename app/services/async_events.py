@@ -0,0 +1,267 @@
+import asyncio
+import contextvars
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
+
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.enums import ServiceType
+from app.services import tasks
+from app.services.event_streams import (
+    CONSUMER_GROUP,
+    REDIS_RETRY_SECONDS,
+    Message,
+    StreamConsumer,
+    decode_entry,
+    entry_context,
+    entry_failed,
+    entry_timeline,
+    service_for,
+    stream_key,
+)
+from app.services.external_mocks.payment_service import process_subscription_async
+from app.services.external_mocks.user_service import process_user_async
+from app.utils.logger import get_logger
+from app.utils.timeline import EventTimeline
+
+logger = get_logger("async_events")
+
+
+def external_call_async(service_enum: ServiceType):
+    """
+    The async external client call for a service, or None when it has none.
+    """
+    if service_enum == ServiceType.USER:
+        return process_user_async
+    if service_enum == ServiceType.PAYMENT:
+        return process_subscription_async
+    return None
+
+
+def in_session(fn, *args):
+    """
+    Call `fn(db, *args)` with the calling thread's session, closing it after.
+    """
+    db = tasks.SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+class AsyncEventRunner:
+    """
+    Runs event pipelines concurrently on one event loop.
+
+    At most ASYNC_MAX_CONCURRENCY events are in flight per process. Within
+    that, each service allows ASYNC_SERVICE_CONCURRENCY[service] (default
+    ASYNC_SERVICE_DEFAULT_CONCURRENCY) concurrent external calls, so one slow
+    provider cannot hold every slot. External calls are awaited on the loop.
+    The Postgres steps use the same sync services as the other workers, on a
+    pool of ASYNC_DB_THREADS threads, because the driver (psycopg2) blocks.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        service_limits: Optional[Dict[str, int]] = None,
+        db_threads: Optional[int] = None,
+    ):
+        self.slots = asyncio.Semaphore(
+            max_concurrency or settings.ASYNC_MAX_CONCURRENCY
+        )
+        limits = {**settings.ASYNC_SERVICE_CONCURRENCY, **(service_limits or {})}
+        self.service_slots = {
+            service: asyncio.Semaphore(
+                limits.get(service.value, settings.ASYNC_SERVICE_DEFAULT_CONCURRENCY)
+            )
+            for service in ServiceType
+        }
+        self.executor = ThreadPoolExecutor(
+            db_threads or settings.ASYNC_DB_THREADS, thread_name_prefix="event-db"
+        )
+
+    async def db(self, fn, *args):
+        """
+        Run blocking database work on the pool, keeping log and trace context.
+        """
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, context.run, fn, *args
+        )
+
+    async def handle_event(
+        self,
+        event: dict,
+        parsed_event,
+        service_enum: ServiceType,
+        timeline: EventTimeline,
+    ):
+        """
+        The steps of `tasks.handle_event`, with the external call awaited.
+        """
+        service_name = service_enum.value
+        if await self.db(in_session, tasks.is_duplicate, parsed_event, service_enum):
+            return
+
+        service_event = tasks.parse_service_event(event, service_enum)
+        response = None
+        call = external_call_async(service_enum)
+        if call is not None:
+            async with self.service_slots[service_enum]:
+                with tasks.stage(service_name, "external"):
+                    response = await call(service_event.data)
+            timeline.mark("external_done")
+
+        if not await self.db(
+            in_session,
+            tasks.sync_or_park,
+            event,
+            service_enum,
+            service_event,
+            response,
+        ):
+            return
+        timeline.mark("committed")
+        await self.db(
+            in_session,
+            tasks.log_event_processed,
+            event,
+            parsed_event,
+            service_enum,
+            timeline,
+        )
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class AsyncStreamConsumer:
+    """
+    Stream consumer that keeps up to ASYNC_MAX_CONCURRENCY entries in flight.
+
+    Reading, claiming and retries work as in `StreamConsumer` (through a
+    thread, with the same sync client), but each entry gets its own task and
+    more entries are read only while slots are free. Finished entries are
+    acknowledged with one XACK per stream per poll. Failed ones stay pending
+    for XAUTOCLAIM; entries still running here are never claimed twice.
+    """
+
+    def __init__(
+        self,
+        client,
+        name: str,
+        services: Iterable[ServiceType] = tuple(ServiceType),
+        runner: Optional[AsyncEventRunner] = None,
+    ):
+        self.streams = StreamConsumer(client, name, services)
+        self.runner = runner or AsyncEventRunner()
+        self.in_flight: Set[asyncio.Task] = set()
+        self._running: Set[bytes] = set()
+        self._acks: Dict[str, List[bytes]] = defaultdict(list)
+        self._next_claim_at = 0.0
+
+    async def dispatch(
+        self,
+        key,
+        messages: List[Message],
+        deliveries: Optional[Dict[bytes, int]] = None,
+    ):
+        service = service_for(key)
+        for message_id, fields in messages:
+            if message_id in self._running:
+                continue
+            await self.runner.slots.acquire()
+            self._running.add(message_id)
+            attempt = (deliveries or {}).get(message_id, 1)
+            task = asyncio.create_task(self._run(service, message_id, fields, attempt))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
+
+    async def _run(self, service: ServiceType, message_id: bytes, fields, attempt: int):
+        try:
+            if await self.handle(service, fields, attempt):
+                self._acks[stream_key(service)].append(message_id)
+        finally:
+            self._running.discard(message_id)
+            self.runner.slots.release()
+
+    async def handle(
+        self, service: ServiceType, fields: Dict[bytes, bytes], attempt: int
+    ) -> bool:
+        """
+        Process one entry; True when it should be acknowledged.
+        """
+        event, ack = await asyncio.to_thread(decode_entry, service, fields)
+        if event is None:
+            return ack
+        timeline = entry_timeline(fields)
+        if attempt == 1:
+            tasks.observe_queue_lag(service.value, timeline)
+
+        with entry_context(service, event, fields, attempt):
+            try:
+                parsed_event, service_enum = tasks.parse_event(event, service.value)
+            except ValidationError:
+                logger.exception("Dropping malformed stream event")
+                return True
+
+            try:
+                await self.runner.handle_event(
+                    event, parsed_event, service_enum, timeline
+                )
+                return True
+            except Exception:
+                logger.exception("Error in process_event")
+                return await self.runner.db(
+                    in_session, entry_failed, event, service_enum, timeline, attempt
+                )
+
+    async def flush_acks(self):
+        acks, self._acks = self._acks, defaultdict(list)
+        for key, ids in acks.items():
+            await asyncio.to_thread(self.streams.client.xack, key, CONSUMER_GROUP, *ids)
+
+    async def poll(self):
+        if time.monotonic() >= self._next_claim_at:
+            self._next_claim_at = (
+                time.monotonic() + settings.STREAM_CLAIM_INTERVAL_SECONDS
+            )
+            for key, messages, deliveries in await asyncio.to_thread(
+                self.streams.claim
+            ):
+                await self.dispatch(key, messages, deliveries)
+        for key, messages in await asyncio.to_thread(self.streams.read):
+            await self.dispatch(key, messages)
+        await self.flush_acks()
+
+    async def drain(self):
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight, return_exceptions=True)
+        await self.flush_acks()
+
+    async def run(self, stop: asyncio.Event):
+        await asyncio.to_thread(self.streams.ensure_groups)
+        try:
+            while not stop.is_set():
+                try:
+                    await self.poll()
+                except Exception as exc:
+                    if isinstance(exc, RedisError):
+                        logger.warning(f"Stream read failed, retrying: {exc}")
+                    else:
+                        logger.exception("Stream poll failed, retrying")
+                    try:
+                        await asyncio.wait_for(stop.wait(), REDIS_RETRY_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+            try:
+                await self.drain()
+            except RedisError as exc:
+                logger.warning(f"Final acknowledgements failed: {exc}")
+        finally:
+            self.runner.close()
@@ -0,0 +1,214 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from celery.worker.autoscale import Autoscaler
+from redis.exceptions import RedisError
+from sqlalchemy import func, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.admission import sample_broker
+from app.core.config import settings
+from app.core.enums import WebhookStatus
+from app.core.metrics import WORKER_AUTOSCALE_BACKOFFS, WORKER_TARGET_CONCURRENCY
+from app.core.redis import get_broker_redis
+from app.db.session import SessionLocal
+from app.models.webhooks import WebhookLog
+from app.utils.logger import get_logger
+from app.utils.timeline import STAGES
+
+logger = get_logger("autoscaling")
+
+SAMPLE_RETRY_AFTER_SECONDS = 30
+# Assumed per-event time until webhook_logs has samples in the window.
+DEFAULT_TASK_MS = 1000.0
+
+
+@dataclass(frozen=True)
+class ScalingSignals:
+    depth: int
+    lag_seconds: float
+    # Recent webhook_logs, over AUTOSCALE_WINDOW_SECONDS
+    events: int
+    failure_ratio: float
+    task_p50_ms: Optional[float]
+    external_p95_ms: Optional[float]
+    persist_p95_ms: Optional[float]
+    # Round trip of a trivial query, i.e. how long Postgres makes us wait
+    db_probe_ms: float
+
+
+def probe_database(db: Session) -> float:
+    start = time.perf_counter()
+    db.execute(text("SELECT 1"))
+    return (time.perf_counter() - start) * 1000
+
+
+def recent_latency(db: Session) -> tuple:
+    """
+    Event count, failures and stage percentiles over the autoscaling window.
+
+    Task time is the worker's share of an event (external call plus local
+    sync); ingest and queue time are not spent in the pool.
+    """
+    external = WebhookLog.stage_ms[STAGES.index("external") + 1]
+    persist = WebhookLog.stage_ms[STAGES.index("persist") + 1]
+    since = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.AUTOSCALE_WINDOW_SECONDS
+    )
+    return (
+        db.query(
+            func.count(),
+            func.count().filter(WebhookLog.status == WebhookStatus.failed),
+            func.percentile_cont(0.5).within_group(
+                func.coalesce(external, 0) + persist
+            ),
+            func.percentile_cont(0.95).within_group(external),
+            func.percentile_cont(0.95).within_group(persist),
+        )
+        .filter(WebhookLog.created_at >= since)
+        .one()
+    )
+
+
+def sample_signals(db: Session, broker) -> ScalingSignals:
+    snapshot = sample_broker(broker)
+    db_probe_ms = probe_database(db)
+    events, failures, task_p50, external_p95, persist_p95 = recent_latency(db)
+    return ScalingSignals(
+        depth=snapshot.depth,
+        lag_seconds=snapshot.lag_seconds,
+        events=events,
+        failure_ratio=failures / events if events else 0.0,
+        task_p50_ms=task_p50,
+        external_p95_ms=external_p95,
+        persist_p95_ms=persist_p95,
+        db_probe_ms=db_probe_ms,
+    )
+
+
+def bottleneck(signals: ScalingSignals) -> Optional[str]:
+    """
+    Name the downstream dependency that more processes would only load further.
+    """
+    if signals.db_probe_ms >= settings.AUTOSCALE_MAX_DB_PROBE_MS or (
+        signals.persist_p95_ms is not None
+        and signals.persist_p95_ms >= settings.AUTOSCALE_MAX_PERSIST_P95_MS
+    ):
+        return "postgres"
+    if signals.failure_ratio >= settings.AUTOSCALE_MAX_FAILURE_RATIO or (
+        signals.external_p95_ms is not None
+        and signals.external_p95_ms >= settings.AUTOSCALE_MAX_EXTERNAL_P95_MS
+    ):
+        return "external"
+    return None
+
+
+def desired_concurrency(
+    current: int, signals: ScalingSignals, minimum: int, maximum: int
+) -> Tuple[int, str]:
+    """
+    Pick a pool size within [minimum, maximum] and say why.
+
+    Normally the pool is sized to drain the queue within
+    AUTOSCALE_TARGET_DRAIN_SECONDS at the recent median task time, growing by
+    at most AUTOSCALE_MAX_STEP per decision and by at least one while the
+    oldest message is older than the drain target. When Postgres or the
+    external services are the bottleneck the pool shrinks by one per decision
+    instead, whatever the backlog.
+    """
+    reason = bottleneck(signals)
+    if reason:
+        target = current - 1
+    else:
+        reason = "queue"
+        task_seconds = (signals.task_p50_ms or DEFAULT_TASK_MS) / 1000
+        target = math.ceil(
+            signals.depth * task_seconds / settings.AUTOSCALE_TARGET_DRAIN_SECONDS
+        )
+        if signals.lag_seconds >= settings.AUTOSCALE_TARGET_DRAIN_SECONDS:
+            target = max(target, current + 1)
+        target = min(target, current + settings.AUTOSCALE_MAX_STEP)
+    return max(minimum, min(maximum, target)), reason
+
+
+class EventAutoscaler(Autoscaler):
+    """
+    Celery autoscaler driven by broker and webhook_logs signals.
+
+    Celery's own autoscaler grows the pool whenever the worker has reserved
+    more tasks than processes, which with a prefetch multiplier of 1 never
+    reflects the backlog, and keeps growing while a slow dependency is what
+    holds tasks up. This one samples at most every AUTOSCALE_INTERVAL_SECONDS
+    and resizes to `desired_concurrency`. Shrinking still waits for Celery's
+    keepalive (AUTOSCALE_KEEPALIVE, 30s) after the last grow.
+
+    Enabled by `--autoscale=max,min`. When Redis or Postgres cannot be sampled
+    the pool keeps its size and sampling is retried later.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._signals: Optional[ScalingSignals] = None
+        self._next_sample_at = 0.0
+        self._sampling = threading.Lock()
+
+    def sample(self) -> ScalingSignals:
+        db = SessionLocal()
+        try:
+            return sample_signals(db, get_broker_redis())
+        finally:
+            db.close()
+
+    def refresh(self):
+        try:
+            self._signals = self.sample()
+            self._next_sample_at = (
+                time.monotonic() + settings.AUTOSCALE_INTERVAL_SECONDS
+            )
+        except (RedisError, SQLAlchemyError) as exc:
+            logger.warning(f"Autoscaling signals unavailable, keeping pool size: {exc}")
+            self._signals = None
+            self._next_sample_at = time.monotonic() + SAMPLE_RETRY_AFTER_SECONDS
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            self._sampling.release()
+
+    def _maybe_refresh(self):
+        if time.monotonic() < self._next_sample_at:
+            return
+        if not self._sampling.acquire(blocking=False):
+            return
+        threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def _maybe_scale(self, req=None):
+        # Runs on the worker's event loop (per task message and on a timer), so
+        # sampling happens on a thread and each sample drives one decision.
+        self._maybe_refresh()
+        signals, self._signals = self._signals, None
+        if signals is None:
+            return None
+
+        current = self.processes
+        target, reason = desired_concurrency(
+            current, signals, self.min_concurrency, self.max_concurrency
+        )
+        WORKER_TARGET_CONCURRENCY.set(target)
+        if reason != "queue":
+            WORKER_AUTOSCALE_BACKOFFS.labels(reason).inc()
+        if target > current:
+            logger.info(f"Growing pool {current} -> {target} ({reason})")
+            self.scale_up(target - current)
+            return True
+        if target < current:
+            logger.info(f"Shrinking pool {current} -> {target} ({reason})")
+            self.scale_down(current - target)
+            return True
+        return None
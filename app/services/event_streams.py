@@ -0,0 +1,288 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kombu.utils.json import dumps, loads
+from pydantic import ValidationError
+from redis.exceptions import RedisError, ResponseError
+
+from app.core.config import settings
+from app.core.enums import ServiceType
+from app.core.metrics import EVENT_RETRIES
+from app.core.profiling import profile_task
+from app.core.tracing import TRACEPARENT_HEADER, correlation_context, tracer
+from app.services import tasks
+from app.services.payloads import PayloadExpired, resolve_event
+from app.utils.logger import get_logger, log_context
+from app.utils.timeline import ENQUEUED_AT_HEADER, RECEIVED_AT_HEADER, EventTimeline
+
+logger = get_logger("event_streams")
+
+CONSUMER_GROUP = "event_processors"
+EVENT_FIELD = "event"
+REDIS_RETRY_SECONDS = 1
+
+Message = Tuple[bytes, Dict[bytes, bytes]]
+
+
+def stream_key(service: ServiceType) -> str:
+    return f"events:{service.value}"
+
+
+def service_for(key) -> ServiceType:
+    if isinstance(key, bytes):
+        key = key.decode()
+    return ServiceType(key.partition(":")[2])
+
+
+def publish_event(client, event: dict, service: ServiceType, headers: dict):
+    """
+    XADD one event with its timing/trace headers as flat stream fields.
+
+    The entry is just the event JSON (kombu's encoding, as Celery uses) and a
+    few numbers, instead of a kombu envelope around a Celery message. Streams are capped at roughly
+    STREAM_MAX_LENGTH entries; acknowledged entries are trimmed first.
+    """
+    fields = {EVENT_FIELD: dumps(event)}
+    fields.update((name, str(value)) for name, value in headers.items())
+    return client.xadd(
+        stream_key(service),
+        fields,
+        maxlen=settings.STREAM_MAX_LENGTH,
+        approximate=True,
+    )
+
+
+def _field(fields: Dict[bytes, bytes], name: str) -> Optional[str]:
+    value = fields.get(name.encode())
+    return value.decode() if value is not None else None
+
+
+def decode_entry(
+    service: ServiceType, fields: Dict[bytes, bytes]
+) -> Tuple[Optional[dict], bool]:
+    """
+    The entry's event, or None and whether to acknowledge the entry anyway.
+    """
+    try:
+        event = loads(fields[EVENT_FIELD.encode()])
+        return resolve_event(event), True
+    except (KeyError, ValueError):
+        logger.error("Dropping stream entry without a readable event")
+        return None, True
+    except PayloadExpired:
+        tasks.log_payload_expired(event, service)
+        return None, True
+    except RedisError:
+        return None, False
+
+
+def entry_timeline(fields: Dict[bytes, bytes]) -> EventTimeline:
+    received_at, enqueued_at = (
+        _field(fields, RECEIVED_AT_HEADER),
+        _field(fields, ENQUEUED_AT_HEADER),
+    )
+    return EventTimeline(
+        float(received_at) if received_at else None,
+        float(enqueued_at) if enqueued_at else None,
+    )
+
+
+@contextmanager
+def entry_context(
+    service: ServiceType, event: dict, fields: Dict[bytes, bytes], attempt: int
+):
+    """
+    Log, correlation and trace context for processing one entry.
+    """
+    metadata = event.get("metadata") or {}
+    with (
+        log_context(
+            event_id=event.get("event_id"),
+            org_id=event.get("organization_id"),
+            service=service.value,
+        ),
+        correlation_context(metadata.get("correlation_id")),
+        tracer.start_span(
+            "process_event",
+            {
+                "event_id": event.get("event_id"),
+                "service": service.value,
+                "retries": attempt - 1,
+            },
+            traceparent=_field(fields, TRACEPARENT_HEADER),
+        ),
+    ):
+        yield
+
+
+def entry_failed(
+    db, event: dict, service_enum: ServiceType, timeline: EventTimeline, attempt: int
+) -> bool:
+    """
+    Handle a failed attempt; True once retries are exhausted and the failure is logged.
+    """
+    db.rollback()
+    if attempt > settings.CELERY_MAX_RETRIES:
+        tasks.log_event_failure(db, event, service_enum, timeline)
+        return True
+    EVENT_RETRIES.labels(service_enum.value).inc()
+    return False
+
+
+class StreamConsumer:
+    """
+    Consumer-group worker for the per-service event streams.
+
+    Reads up to STREAM_BATCH_SIZE new entries per XREADGROUP across all
+    streams, runs each through the same `handle_event` as the Celery task, and
+    acknowledges the successful ones with one XACK per stream. A failed entry
+    stays pending; every STREAM_CLAIM_INTERVAL_SECONDS the consumer XAUTOCLAIMs
+    entries idle for STREAM_CLAIM_IDLE_MS, which both retries failures (with
+    the idle time as backoff) and recovers entries held by a crashed consumer.
+    An entry that still fails after CELERY_MAX_RETRIES redeliveries is logged
+    as failed and acknowledged.
+    """
+
+    def __init__(
+        self,
+        client,
+        name: str,
+        services: Iterable[ServiceType] = tuple(ServiceType),
+    ):
+        self.client = client
+        self.name = name
+        self.keys = [stream_key(service) for service in services]
+        self._next_claim_at = 0.0
+
+    def ensure_groups(self):
+        for key in self.keys:
+            try:
+                self.client.xgroup_create(key, CONSUMER_GROUP, id="0", mkstream=True)
+            except ResponseError as exc:
+                if "BUSYGROUP" not in str(exc):
+                    raise
+
+    def read(self) -> List[Tuple[bytes, List[Message]]]:
+        return (
+            self.client.xreadgroup(
+                CONSUMER_GROUP,
+                self.name,
+                {key: ">" for key in self.keys},
+                count=settings.STREAM_BATCH_SIZE,
+                block=settings.STREAM_BLOCK_MS,
+            )
+            or []
+        )
+
+    def claim(self) -> List[Tuple[str, List[Message], Dict[bytes, int]]]:
+        """
+        Take over entries left pending too long, with their delivery counts.
+        """
+        claimed = []
+        for key in self.keys:
+            _, messages, _ = self.client.xautoclaim(
+                key,
+                CONSUMER_GROUP,
+                self.name,
+                min_idle_time=settings.STREAM_CLAIM_IDLE_MS,
+                count=settings.STREAM_BATCH_SIZE,
+            )
+            messages = [message for message in messages if message[1]]
+            if messages:
+                claimed.append((key, messages, self._delivery_counts(key, messages)))
+        return claimed
+
+    def reclaim(self):
+        for key, messages, deliveries in self.claim():
+            self.process(key, messages, deliveries)
+
+    def _delivery_counts(self, key, messages: List[Message]) -> Dict[bytes, int]:
+        pending = self.client.xpending_range(
+            key,
+            CONSUMER_GROUP,
+            min=messages[0][0],
+            max=messages[-1][0],
+            count=len(messages),
+        )
+        return {entry["message_id"]: entry["times_delivered"] for entry in pending}
+
+    def process(
+        self,
+        key,
+        messages: List[Message],
+        deliveries: Optional[Dict[bytes, int]] = None,
+    ) -> List[bytes]:
+        """
+        Handle a batch from one stream; returns the acknowledged entry ids.
+        """
+        service = service_for(key)
+        key = stream_key(service)
+        done = []
+        db = tasks.SessionLocal()
+        try:
+            for message_id, fields in messages:
+                attempt = (deliveries or {}).get(message_id, 1)
+                if self.handle(db, service, fields, attempt):
+                    done.append(message_id)
+        finally:
+            db.close()
+        if done:
+            self.client.xack(key, CONSUMER_GROUP, *done)
+        return done
+
+    def handle(
+        self, db, service: ServiceType, fields: Dict[bytes, bytes], attempt: int
+    ) -> bool:
+        """
+        Process one entry; True when it should be acknowledged.
+        """
+        event, ack = decode_entry(service, fields)
+        if event is None:
+            return ack
+        timeline = entry_timeline(fields)
+        if attempt == 1:
+            tasks.observe_queue_lag(service.value, timeline)
+
+        with (
+            entry_context(service, event, fields, attempt),
+            profile_task(service.value),
+        ):
+            try:
+                parsed_event, service_enum = tasks.parse_event(event, service.value)
+            except ValidationError:
+                logger.exception("Dropping malformed stream event")
+                return True
+
+            try:
+                tasks.handle_event(db, event, parsed_event, service_enum, timeline)
+                return True
+            except Exception:
+                logger.exception("Error in process_event")
+                return entry_failed(db, event, service_enum, timeline, attempt)
+
+    def poll(self):
+        if time.monotonic() >= self._next_claim_at:
+            self._next_claim_at = (
+                time.monotonic() + settings.STREAM_CLAIM_INTERVAL_SECONDS
+            )
+            self.reclaim()
+        for key, messages in self.read():
+            self.process(key, messages)
+
+    def run(self, stop: threading.Event):
+        """
+        Poll until `stop` is set. Redis and database errors back off and
+        retry rather than ending the consumer.
+        """
+        self.ensure_groups()
+        while not stop.is_set():
+            try:
+                self.poll()
+            except RedisError as exc:
+                logger.warning(f"Stream read failed, retrying: {exc}")
+                stop.wait(REDIS_RETRY_SECONDS)
+            except Exception:
+                logger.exception("Stream poll failed, retrying")
+                stop.wait(REDIS_RETRY_SECONDS)
@@ -4,10 +4,14 @@ from app.core.enums import ServiceType
 from app.schemas.external_api_responses import ExternalSubscriptionSuccessResponse
 from app.schemas.webhooks import PaymentFailedData, SubscriptionCreatedData
 from app.services.external_mocks import mock_responses
-from app.services.external_mocks.shared import simulate_failure
+from app.services.external_mocks.shared import (
+    simulate_failure,
+    simulate_latency,
+    simulate_latency_async,
+)
 from app.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger("external_payment_service")
 
 
 def process_subscription(
@@ -26,7 +30,28 @@ def process_subscription(
     Returns a Pydantic success response or error response depending on the conditions, supporting robust
     retry logic and error handling workflows.
     """
-    logger.info(f"Calling Payment Service with data: {data}")
+    simulate_latency()
+    return _subscription_response(data)
+
+
+async def process_subscription_async(
+    data: SubscriptionCreatedData | PaymentFailedData,
+) -> ExternalSubscriptionSuccessResponse:
+    """
+    Async variant of `process_subscription`, used by the asyncio worker.
+    """
+    await simulate_latency_async()
+    return _subscription_response(data)
+
+
+def _subscription_response(
+    data: SubscriptionCreatedData | PaymentFailedData,
+) -> ExternalSubscriptionSuccessResponse:
+    logger.info(
+        "Calling Payment Service",
+        extra={"subscription_id": getattr(data, "subscription_id", None)},
+    )
+    logger.debug("Payment Service request: %r", data)
 
     simulate_failure(ServiceType.PAYMENT)
 
@@ -1,4 +1,6 @@
+import asyncio
 import random
+import time
 
 from app.core.config import settings
 from app.core.enums import ServiceType
@@ -25,3 +27,16 @@ def simulate_failure(service_enum: ServiceType):
             raise Exception(
                 f"Random simulated transient failure for {service_enum.value}"
             )
+
+
+def simulate_latency():
+    """
+    Block for EXTERNAL_MOCK_LATENCY_MS, standing in for the network round trip.
+    """
+    if settings.EXTERNAL_MOCK_LATENCY_MS:
+        time.sleep(settings.EXTERNAL_MOCK_LATENCY_MS / 1000)
+
+
+async def simulate_latency_async():
+    if settings.EXTERNAL_MOCK_LATENCY_MS:
+        await asyncio.sleep(settings.EXTERNAL_MOCK_LATENCY_MS / 1000)
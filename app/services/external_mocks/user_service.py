@@ -1,17 +1,29 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
+from app.core.config import settings
 from app.core.enums import ServiceType
 from app.schemas.external_api_responses import (
     ExternalUserErrorResponse,
+    ExternalUserListData,
     ExternalUserListSuccessResponse,
     ExternalUserSuccessResponse,
+    ExternalUserSummary,
+    Pagination,
 )
 from app.schemas.webhooks import UserData
 from app.services.external_mocks import mock_responses
-from app.services.external_mocks.shared import simulate_failure
+from app.services.external_mocks.shared import (
+    simulate_failure,
+    simulate_latency,
+    simulate_latency_async,
+)
 from app.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger("external_user_service")
+
+# last_updated of the mocked directory's first user; each next one is a minute later
+MOCK_DIRECTORY_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
 
 
 def process_user(
@@ -30,7 +42,25 @@ def process_user(
     Returns a Pydantic success response or error response based on conditions, allowing us to test
     error handling and local sync logic.
     """
-    logger.info(f"Calling User Management Service with data: {data}")
+    simulate_latency()
+    return _user_response(data)
+
+
+async def process_user_async(
+    data: UserData,
+) -> ExternalUserSuccessResponse | ExternalUserErrorResponse:
+    """
+    Async variant of `process_user`, used by the asyncio worker.
+    """
+    await simulate_latency_async()
+    return _user_response(data)
+
+
+def _user_response(
+    data: UserData,
+) -> ExternalUserSuccessResponse | ExternalUserErrorResponse:
+    logger.info("Calling User Management Service", extra={"external_id": data.user_id})
+    logger.debug("User Management Service request: %r", data)
 
     simulate_failure(ServiceType.USER)
 
@@ -52,14 +82,71 @@ def process_user(
     return success_response
 
 
-def list_users() -> ExternalUserListSuccessResponse:
+def list_users(
+    organization_id: str = "org_001",
+    page: int = 1,
+    per_page: int = 50,
+    updated_after: Optional[datetime] = None,
+    after_id: Optional[str] = None,
+) -> ExternalUserListSuccessResponse:
     """
     Simulated external User Management Service list_users endpoint.
 
-    Returns a mocked paginated user list response.
+    Pages through a synthetic directory of EXTERNAL_MOCK_DIRECTORY_SIZE users
+    per organization. Ids and emails are derived from the position, so every
+    call returns the same directory.
+
+    With `updated_after`, `page` is ignored and the call returns the users
+    after the (`updated_after`, `after_id`) cursor, ordered by
+    (last_updated, user_id); `pagination.total` counts all of them.
     """
-    logger.info("Calling User Management Service list_users endpoint.")
+    logger.info(
+        "Calling User Management Service list_users endpoint.", extra={"page": page}
+    )
 
+    simulate_latency()
     simulate_failure(ServiceType.USER)
 
-    return mock_responses.user_list_success_response
+    total = settings.EXTERNAL_MOCK_DIRECTORY_SIZE
+    if updated_after is None:
+        start = (page - 1) * per_page
+        users = [
+            directory_user(organization_id, index)
+            for index in range(start, min(start + per_page, total))
+        ]
+        has_more = start + per_page < total
+    else:
+        cursor = (updated_after, after_id or "")
+        directory = sorted(
+            (directory_user(organization_id, index) for index in range(total)),
+            key=lambda user: (user.last_updated, user.user_id),
+        )
+        changed = [
+            user for user in directory if (user.last_updated, user.user_id) > cursor
+        ]
+        total, page = len(changed), 1
+        users, has_more = changed[:per_page], len(changed) > per_page
+
+    return ExternalUserListSuccessResponse(
+        status="success",
+        data=ExternalUserListData(
+            users=users,
+            pagination=Pagination(
+                total=total,
+                page=page,
+                per_page=per_page,
+                has_more=has_more,
+            ),
+        ),
+    )
+
+
+def directory_user(organization_id: str, index: int) -> ExternalUserSummary:
+    return ExternalUserSummary(
+        user_id=f"ext_{organization_id}_{index:07d}",
+        email=f"user{index:07d}@{organization_id}.example.com",
+        first_name="Directory",
+        last_name=f"User {index}",
+        status="active",
+        last_updated=MOCK_DIRECTORY_EPOCH + timedelta(minutes=index),
+    )
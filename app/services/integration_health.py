@@ -0,0 +1,114 @@
+from typing import Dict, Optional
+
+from sqlalchemy import BigInteger, case, cast, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg, insert
+from sqlalchemy.orm import Session
+
+from app.core.enums import IntegrationHealthStatus, ServiceType, WebhookStatus
+from app.models.integration_health import IntegrationHealth
+
+
+def record_webhook_outcome(
+    db: Session,
+    event_id: str,
+    service: ServiceType,
+    org_id: str,
+    status: WebhookStatus,
+):
+    """
+    Fold one webhook outcome into the organization's health row.
+
+    A single INSERT .. ON CONFLICT upserts the row, so it joins the caller's
+    transaction and concurrent workers never lose an increment. There is no
+    service-wide row for every worker to lock; `get_integration_health` sums
+    the organizations' rows instead. Timestamps are the
+    transaction time, matching `WebhookLog.created_at`, and only move forward, so a
+    slow transaction committing late cannot roll `last_event_id` back. Skipped
+    events say nothing about the integration and are ignored.
+    """
+    if status not in (WebhookStatus.processed, WebhookStatus.failed):
+        return
+
+    succeeded = status == WebhookStatus.processed
+    now = func.now()
+    stmt = insert(IntegrationHealth).values(
+        service=service,
+        org_id=org_id,
+        processed_count=1 if succeeded else 0,
+        failed_count=0 if succeeded else 1,
+        last_success_at=now if succeeded else None,
+        last_event_id=event_id if succeeded else None,
+        last_failure_at=None if succeeded else now,
+        last_failed_event_id=None if succeeded else event_id,
+    )
+    current = IntegrationHealth.__table__.c
+    new = stmt.excluded
+
+    def latest(at_column: str, id_column: str) -> dict:
+        newer = new[at_column] >= func.coalesce(current[at_column], new[at_column])
+        return {
+            at_column: func.greatest(current[at_column], new[at_column]),
+            id_column: case((newer, new[id_column]), else_=current[id_column]),
+        }
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[current.service, current.org_id],
+        set_={
+            "processed_count": current.processed_count + new.processed_count,
+            "failed_count": current.failed_count + new.failed_count,
+            **latest("last_success_at", "last_event_id"),
+            **latest("last_failure_at", "last_failed_event_id"),
+            "updated_at": now,
+        },
+    )
+    db.execute(stmt)
+
+
+def get_integration_health(
+    db: Session, org_id: Optional[str] = None
+) -> Dict[ServiceType, IntegrationHealth]:
+    """
+    Health rows for every service, for one organization or service-wide.
+
+    Service-wide health is aggregated by the database in one GROUP BY over
+    the organizations' rows, so only a row per service comes back however
+    many organizations have sent webhooks.
+    """
+    if org_id is not None:
+        rows = db.query(IntegrationHealth).filter_by(org_id=org_id)
+        return {row.service: row for row in rows}
+
+    def summed(column):
+        return cast(func.sum(column), BigInteger).label(column.key)
+
+    def newest(column):
+        return func.max(column).label(column.key)
+
+    def newest_id(id_column, at_column):
+        # The event id of the organization row with the newest timestamp
+        ordered = aggregate_order_by(id_column, at_column.desc().nulls_last())
+        return array_agg(ordered)[1].label(id_column.key)
+
+    health = IntegrationHealth
+    totals = db.query(
+        health.service,
+        summed(health.processed_count),
+        summed(health.failed_count),
+        newest(health.last_success_at),
+        newest_id(health.last_event_id, health.last_success_at),
+        newest(health.last_failure_at),
+        newest_id(health.last_failed_event_id, health.last_failure_at),
+    ).group_by(health.service)
+    return {row.service: IntegrationHealth(**row._asdict()) for row in totals}
+
+
+def health_status(health: IntegrationHealth | None) -> IntegrationHealthStatus:
+    """
+    'error' with no success yet, 'degraded' when a failure is newer than the last
+    success, otherwise 'healthy'.
+    """
+    if health is None or health.last_success_at is None:
+        return IntegrationHealthStatus.error
+    if health.last_failure_at and health.last_failure_at > health.last_success_at:
+        return IntegrationHealthStatus.degraded
+    return IntegrationHealthStatus.healthy
@@ -0,0 +1,231 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.enums import JobKind, JobStatus
+from app.core.metrics import JOB_CHUNK_SECONDS, JOB_CHUNKS, JOBS_FINISHED
+from app.db.locks import advisory_lock
+from app.db.session import SessionLocal
+from app.models.job import Job
+from app.services.offboarding import offboard_chunk
+from app.services.replay import replay_chunk
+from app.utils.logger import get_logger
+from app.worker import celery_app
+
+logger = get_logger("jobs")
+
+# One chunk of each kind of job: `chunk(db, job) -> done`. A chunk handles at
+# most JOB_CHUNK_SIZE rows, advances `job.checkpoint` and `job.processed_count`
+# and commits them together with its work, so it can be interrupted anywhere.
+HANDLERS = {
+    JobKind.webhook_replay: replay_chunk,
+    JobKind.org_offboarding: offboard_chunk,
+}
+
+# First key of the two-key advisory lock held while a job runs
+JOB_LOCK_SPACE = 0x4A4F42
+ACTIVE = (JobStatus.queued, JobStatus.running)
+
+
+def job_lock_key(job_id: uuid.UUID) -> int:
+    return job_id.int & 0x7FFFFFFF
+
+
+def job_lock(db: Session, job_id: uuid.UUID):
+    """
+    Hold a job's advisory lock, so a second delivery of the same job backs
+    off while its chunks commit as they go.
+    """
+    return advisory_lock(db, JOB_LOCK_SPACE, job_lock_key(job_id))
+
+
+def submit_job(
+    db: Session,
+    kind: JobKind,
+    org_id: uuid.UUID,
+    params: dict,
+    created_by: Optional[uuid.UUID] = None,
+) -> Job:
+    job = Job(kind=kind, org_id=org_id, params=params, created_by=created_by)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    logger.info(
+        "Job submitted",
+        extra={"job_id": str(job.id), "kind": kind.value, "org_id": str(org_id)},
+    )
+    enqueue_job(job.id)
+    return job
+
+
+def enqueue_job(job_id: uuid.UUID, countdown: Optional[int] = None):
+    """
+    Queue a job's next slice. If the broker is down the job is left as it is
+    and picked up by the stalled job sweep.
+    """
+    try:
+        process_job.apply_async((str(job_id),), countdown=countdown)
+    except Exception:
+        logger.exception("Queueing job failed", extra={"job_id": str(job_id)})
+
+
+def cancel_job(db: Session, job: Job) -> Job:
+    """
+    Cancel a queued job at once, or ask a running one to stop before its next
+    chunk. Work already committed stays done.
+    """
+    db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == JobStatus.queued)
+        .values(
+            status=JobStatus.cancelled,
+            cancel_requested=True,
+            finished_at=func.now(),
+        )
+    )
+    db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == JobStatus.running)
+        .values(cancel_requested=True)
+    )
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def finish(db: Session, job: Job, status: JobStatus) -> Job:
+    job.status = status
+    job.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    JOBS_FINISHED.labels(job.kind.value, status.value).inc()
+    logger.info(
+        "Job finished",
+        extra={
+            "job_id": str(job.id),
+            "kind": job.kind.value,
+            "status": status.value,
+            "processed_count": job.processed_count,
+        },
+    )
+    return job
+
+
+def chunk_failed(db: Session, job: Job, exc: Exception) -> Optional[int]:
+    """
+    Record a failed chunk; returns the delay before retrying it, or None when
+    the job has run out of attempts.
+    """
+    db.rollback()
+    JOB_CHUNKS.labels(job.kind.value, "failed").inc()
+    logger.exception(
+        "Job chunk failed",
+        extra={"job_id": str(job.id), "kind": job.kind.value, "attempt": job.attempts},
+    )
+    job.attempts += 1
+    job.error = f"{type(exc).__name__}: {exc}"[:500]
+    if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+        finish(db, job, JobStatus.failed)
+        return None
+    db.commit()
+    return min(
+        settings.CELERY_RETRY_BACKOFF_BASE**job.attempts,
+        settings.JOB_STALE_SECONDS // 2,
+    )
+
+
+def run_job(db: Session, job_id: uuid.UUID) -> Optional[Job]:
+    """
+    Run a job's chunks for up to JOB_SLICE_SECONDS, then queue it again.
+
+    Only one worker runs a job at a time. Each chunk starts from the job's
+    last checkpoint, so a job resumes where it stopped after a failed chunk,
+    a lost worker or a redelivered task. Cancellation is checked between
+    chunks. A failed chunk is retried with backoff, up to JOB_MAX_ATTEMPTS
+    failures in a row.
+    """
+    job = db.get(Job, job_id)
+    if job is None:
+        return None
+
+    with job_lock(db, job.id) as locked:
+        if not locked:
+            logger.info("Job already running", extra={"job_id": str(job.id)})
+            return job
+        db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.status == JobStatus.queued)
+            .values(status=JobStatus.running, started_at=func.now())
+        )
+        db.commit()
+
+        deadline = time.monotonic() + settings.JOB_SLICE_SECONDS
+        while True:
+            db.refresh(job)
+            if job.status != JobStatus.running:
+                return job
+            if job.cancel_requested:
+                return finish(db, job, JobStatus.cancelled)
+            try:
+                with JOB_CHUNK_SECONDS.labels(job.kind.value).time():
+                    done = HANDLERS[job.kind](db, job)
+            except Exception as exc:
+                retry_in = chunk_failed(db, job, exc)
+                if retry_in is None:
+                    return job
+                break
+            JOB_CHUNKS.labels(job.kind.value, "completed").inc()
+            if job.attempts:
+                # The limit is on consecutive failures, not over the job's life
+                job.attempts = 0
+                db.commit()
+            if done:
+                return finish(db, job, JobStatus.completed)
+            if time.monotonic() >= deadline:
+                retry_in = None
+                break
+
+    # Outside the lock, so the next slice can take it
+    enqueue_job(job.id, countdown=retry_in)
+    return job
+
+
+@celery_app.task
+def process_job(job_id: str):
+    db = SessionLocal()
+    try:
+        run_job(db, uuid.UUID(job_id))
+    finally:
+        db.close()
+
+
+@celery_app.task
+def resume_stalled_jobs():
+    """
+    Queue again jobs that have not moved for JOB_STALE_SECONDS, e.g. after a
+    worker was lost; scheduled by celery beat.
+    """
+    stale_before = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.JOB_STALE_SECONDS
+    )
+    db = SessionLocal()
+    try:
+        job_ids = list(
+            db.scalars(
+                update(Job)
+                .where(Job.status.in_(ACTIVE), Job.updated_at < stale_before)
+                .values(updated_at=func.now())
+                .returning(Job.id)
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+    for job_id in job_ids:
+        logger.warning("Resuming stalled job", extra={"job_id": str(job_id)})
+        enqueue_job(job_id)
+    return len(job_ids)
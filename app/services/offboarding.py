@@ -0,0 +1,239 @@
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import delete, func, or_, select, text, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.enums import AuditAction, OrganizationStatus
+from app.core.metrics import OFFBOARDED_ROWS, OFFBOARDING_LAG_WAITS
+from app.core.principal import invalidate_principal
+from app.models.audit_log import AuditLog
+from app.models.communication_log import CommunicationLog
+from app.models.integration_health import IntegrationHealth
+from app.models.job import Job
+from app.models.organization import Organization
+from app.models.outbox import OutboxEvent
+from app.models.parked_event import ParkedEvent
+from app.models.reconciliation import UserReconciliation
+from app.models.subscription import Subscription
+from app.models.sync_watermark import SyncWatermark
+from app.models.user import User
+from app.models.webhooks import WebhookLog
+from app.schemas.job import OrgOffboardingParams
+from app.utils.audit import log_audit
+from app.utils.logger import get_logger
+
+logger = get_logger("offboarding")
+
+
+@dataclass(frozen=True)
+class OffboardingStep:
+    """
+    Rows of one table to remove; with `values`, to anonymize in place instead.
+    """
+
+    name: str
+    model: type
+    where: object
+    values: Optional[dict] = None
+
+
+def offboarding_steps(
+    org: Organization, params: OrgOffboardingParams
+) -> List[OffboardingStep]:
+    """
+    The organization's rows, children before the rows they reference.
+    """
+    user_ids = select(User.id).where(User.org_id == org.id)
+    if params.keep_audit_logs:
+        audit = [
+            OffboardingStep(
+                "audit_logs.org_id",
+                AuditLog,
+                AuditLog.org_id == org.id,
+                {"org_id": None},
+            ),
+            OffboardingStep(
+                "audit_logs.user_id",
+                AuditLog,
+                AuditLog.user_id.in_(user_ids),
+                {"user_id": None},
+            ),
+        ]
+    else:
+        audit = [
+            OffboardingStep(
+                "audit_logs",
+                AuditLog,
+                or_(AuditLog.org_id == org.id, AuditLog.user_id.in_(user_ids)),
+            )
+        ]
+    return [
+        OffboardingStep("outbox_events", OutboxEvent, OutboxEvent.org_id == org.id),
+        OffboardingStep("parked_events", ParkedEvent, ParkedEvent.org_id == org.slug),
+        OffboardingStep("webhook_logs", WebhookLog, WebhookLog.org_id == org.slug),
+        OffboardingStep(
+            "integration_health",
+            IntegrationHealth,
+            IntegrationHealth.org_id == org.slug,
+        ),
+        *audit,
+        OffboardingStep(
+            "subscriptions", Subscription, Subscription.user_id.in_(user_ids)
+        ),
+        OffboardingStep(
+            "communication_logs",
+            CommunicationLog,
+            CommunicationLog.user_id.in_(user_ids),
+        ),
+        OffboardingStep("users", User, User.org_id == org.id),
+        OffboardingStep(
+            "sync_watermarks", SyncWatermark, SyncWatermark.org_id == org.id
+        ),
+        OffboardingStep(
+            "user_reconciliations",
+            UserReconciliation,
+            UserReconciliation.org_id == org.id,
+        ),
+    ]
+
+
+REPLICATION_LAG = text(
+    "SELECT COALESCE(EXTRACT(EPOCH FROM MAX(replay_lag)), 0) FROM pg_stat_replication"
+)
+
+
+def replication_lag(db: Session) -> float:
+    """
+    Seconds the slowest streaming replica is behind in replaying.
+
+    Reads pg_stat_replication, whose lag columns need the pg_monitor role;
+    without it, or without replicas, this is 0.
+    """
+    return float(db.scalar(REPLICATION_LAG))
+
+
+def wait_for_replicas(db: Session) -> bool:
+    """
+    Wait, up to JOB_SLICE_SECONDS, until replica lag is within the limit.
+    """
+    limit = settings.OFFBOARDING_MAX_REPLICATION_LAG_SECONDS
+    if not limit:
+        return True
+    deadline = time.monotonic() + settings.JOB_SLICE_SECONDS
+    while True:
+        lag = replication_lag(db)
+        db.rollback()
+        if lag <= limit:
+            return True
+        OFFBOARDING_LAG_WAITS.inc()
+        if time.monotonic() >= deadline:
+            return False
+        logger.info("Waiting for replicas to catch up", extra={"lag_seconds": lag})
+        time.sleep(settings.OFFBOARDING_LAG_POLL_SECONDS)
+
+
+def run_step(db: Session, step: OffboardingStep) -> list:
+    """
+    Remove or anonymize up to JOB_CHUNK_SIZE rows of a step; returns their ids.
+    """
+    pk = step.model.__mapper__.primary_key
+    key = tuple_(*pk) if len(pk) > 1 else pk[0]
+    batch = select(*pk).where(step.where).limit(settings.JOB_CHUNK_SIZE)
+    if step.values is None:
+        stmt = delete(step.model).where(key.in_(batch))
+    else:
+        stmt = update(step.model).where(key.in_(batch)).values(step.values)
+    ids = db.scalars(
+        stmt.returning(pk[0]).execution_options(synchronize_session=False)
+    ).all()
+    action = "deleted" if step.values is None else "anonymized"
+    OFFBOARDED_ROWS.labels(step.model.__tablename__, action).inc(len(ids))
+    return ids
+
+
+def remove_org(db: Session, job: Job, org: Organization) -> bool:
+    """
+    Delete the organization row, with an audit entry, once nothing refers
+    to it. Returns False if rows were added since their step ran.
+    """
+    try:
+        with db.begin_nested():
+            db.execute(delete(Organization).where(Organization.id == org.id))
+    except IntegrityError:
+        return False
+    details = {"org_id": str(org.id), "slug": org.slug, **job.checkpoint["counts"]}
+    # Commits together with the delete
+    log_audit(db, AuditAction.DELETED_ORG, job.created_by, None, details=details)
+    return True
+
+
+def offboard_chunk(db: Session, job: Job) -> bool:
+    """
+    Offboard the next chunk of an organization's rows.
+
+    Tables are walked in foreign key order, JOB_CHUNK_SIZE rows per chunk,
+    each chunk in its own short transaction followed by a pause of
+    OFFBOARDING_PAUSE_SECONDS, so no table is locked for long. A chunk waits
+    while replicas lag by more than OFFBOARDING_MAX_REPLICATION_LAG_SECONDS.
+    The checkpoint records the current step and each table's count.
+
+    The first chunk marks the organization as offboarding and turns off its
+    change feed, committed before any step, so webhooks and directory syncs
+    stop writing to it. If rows still land, e.g. from a sync that was already
+    under way, deleting the organization fails and the walk starts over. The
+    mark stays if the job is cancelled or fails; offboarding again finishes.
+    """
+    org = db.get(Organization, job.org_id)
+    if org is None:
+        return True
+    if not wait_for_replicas(db):
+        return False
+
+    params = OrgOffboardingParams(**job.params)
+    steps = offboarding_steps(org, params)
+    checkpoint = job.checkpoint or {"step": 0, "counts": {}}
+    if job.total_count is None:
+        org.status = OrganizationStatus.offboarding
+        org.webhook_url = None
+        org.webhook_secret = None
+        db.commit()
+        job.total_count = sum(
+            db.scalar(select(func.count()).select_from(step.model).where(step.where))
+            for step in steps
+        )
+
+    index = checkpoint["step"]
+    if index < len(steps):
+        step = steps[index]
+        ids = run_step(db, step)
+        count = len(ids)
+        counts = dict(checkpoint["counts"])
+        counts[step.name] = counts.get(step.name, 0) + count
+        if count < settings.JOB_CHUNK_SIZE:
+            index += 1
+        job.checkpoint = {"step": index, "counts": counts}
+        job.processed_count += count
+        db.commit()
+        if step.model is User:
+            for user_id in ids:
+                invalidate_principal(user_id)
+        time.sleep(settings.OFFBOARDING_PAUSE_SECONDS)
+        return False
+
+    slug = org.slug
+    if remove_org(db, job, org):
+        logger.info(
+            "Organization offboarded",
+            extra={"org_id": slug, "processed_count": job.processed_count},
+        )
+        return True
+    logger.warning(
+        "Rows were added during offboarding; starting over", extra={"org_id": slug}
+    )
+    job.checkpoint = {"step": 0, "counts": checkpoint["counts"]}
+    db.commit()
+    return False
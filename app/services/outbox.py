@@ -0,0 +1,334 @@
+import hashlib
+import hmac
+import json
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import httpx
+from sqlalchemy import and_, exists, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.enums import OutboxStatus
+from app.core.metrics import (
+    OUTBOX_DELIVERY_BATCH_SIZE,
+    OUTBOX_DELIVERY_SECONDS,
+    OUTBOX_EVENTS,
+)
+from app.db.locks import advisory_lock
+from app.db.session import SessionLocal
+from app.models.communication_log import CommunicationLog
+from app.models.organization import Organization
+from app.models.outbox import OutboxEvent
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.utils.export import serialize_value
+from app.utils.logger import get_logger
+from app.utils.urls import check_public_url
+
+logger = get_logger("outbox")
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+
+# Entity type and the columns sent for it
+SNAPSHOTS = {
+    User: (
+        "user",
+        (
+            "external_id",
+            "email",
+            "first_name",
+            "last_name",
+            "status",
+            "role",
+            "department",
+            "title",
+        ),
+    ),
+    Subscription: (
+        "subscription",
+        (
+            "external_subscription_id",
+            "user_id",
+            "plan",
+            "status",
+            "billing_cycle",
+            "amount",
+            "currency",
+        ),
+    ),
+    CommunicationLog: (
+        "message",
+        ("message_id", "user_id", "status", "template", "delivery_time_ms"),
+    ),
+}
+
+
+def record_change(db: Session, org: Organization, event_type: str, entity):
+    """
+    Add a change feed event for `entity` to the caller's transaction.
+
+    Call it before the commit that makes the change, so the change and its
+    event are committed together. Nothing is recorded for organizations
+    without a webhook endpoint.
+    """
+    if not org.webhook_url:
+        return
+    # Assigns the id of a new entity
+    db.flush()
+    entity_type, fields = SNAPSHOTS[type(entity)]
+    db.add(
+        OutboxEvent(
+            org_id=org.id,
+            event_type=event_type,
+            entity_type=entity_type,
+            entity_id=str(entity.id),
+            payload={
+                "id": str(entity.id),
+                **{field: serialize_value(getattr(entity, field)) for field in fields},
+            },
+        )
+    )
+
+
+def due_events(db: Session, org_id) -> List[OutboxEvent]:
+    """
+    The organization's next OUTBOX_BATCH_SIZE pending events that can be sent.
+
+    An event waits while an earlier event of the same entity is backing off,
+    so each entity's events are delivered in order.
+    """
+    earlier = aliased(OutboxEvent)
+    now = func.now()
+    blocked = exists().where(
+        and_(
+            earlier.org_id == OutboxEvent.org_id,
+            earlier.entity_type == OutboxEvent.entity_type,
+            earlier.entity_id == OutboxEvent.entity_id,
+            earlier.status == OutboxStatus.pending,
+            earlier.id < OutboxEvent.id,
+            earlier.next_attempt_at > now,
+        )
+    )
+    return (
+        db.query(OutboxEvent)
+        .filter(
+            OutboxEvent.org_id == org_id,
+            OutboxEvent.status == OutboxStatus.pending,
+            OutboxEvent.next_attempt_at <= now,
+            ~blocked,
+        )
+        .order_by(OutboxEvent.id)
+        .limit(settings.OUTBOX_BATCH_SIZE)
+        .all()
+    )
+
+
+def lanes(events: List[OutboxEvent], concurrency: int) -> List[List[OutboxEvent]]:
+    """
+    Split events into at most `concurrency` lanes by entity, keeping their
+    order, so one entity's events always travel in one request.
+    """
+    split: Dict[int, List[OutboxEvent]] = {}
+    for event in events:
+        lane = zlib.crc32(f"{event.entity_type}:{event.entity_id}".encode())
+        split.setdefault(lane % concurrency, []).append(event)
+    return list(split.values())
+
+
+def event_body(event: OutboxEvent) -> dict:
+    return {
+        "id": event.id,
+        "type": event.event_type,
+        "entity_type": event.entity_type,
+        "occurred_at": event.created_at.isoformat() if event.created_at else None,
+        "data": event.payload,
+    }
+
+
+def sign(secret: Optional[str], body: bytes) -> Dict[str, str]:
+    if not secret:
+        return {}
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return {SIGNATURE_HEADER: f"sha256={digest}"}
+
+
+def org_lock_key(org_id) -> int:
+    return org_id.int & 0x7FFFFFFFFFFFFFFF
+
+
+class OutboxRelay:
+    """
+    Delivers outbox events to organizations' webhook endpoints.
+
+    Each round, up to OUTBOX_RELAY_WORKERS organizations with due events are
+    relayed in parallel. An organization is held with a session-level
+    advisory lock on its own connection, so relays on several hosts never
+    send one tenant's events concurrently. Its due events are split by entity into at most
+    OUTBOX_ENDPOINT_CONCURRENCY lanes, each sent as one POST of
+    `{"events": [...]}` over a connection pool shared by all endpoints.
+    Delivered events are deleted. Failed lanes are retried with exponential
+    backoff and marked failed after OUTBOX_MAX_ATTEMPTS, which unblocks the
+    entity's later events.
+    """
+
+    def __init__(self, client: Optional[httpx.Client] = None):
+        self.client = client or httpx.Client(
+            timeout=settings.OUTBOX_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.OUTBOX_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OUTBOX_MAX_CONNECTIONS,
+            ),
+        )
+        self.tenants = ThreadPoolExecutor(
+            settings.OUTBOX_RELAY_WORKERS, thread_name_prefix="outbox-org"
+        )
+        self.deliveries = ThreadPoolExecutor(
+            settings.OUTBOX_RELAY_WORKERS * settings.OUTBOX_ENDPOINT_CONCURRENCY,
+            thread_name_prefix="outbox-post",
+        )
+
+    def due_orgs(self, db: Session) -> list:
+        return list(
+            db.scalars(
+                select(OutboxEvent.org_id)
+                .where(
+                    OutboxEvent.status == OutboxStatus.pending,
+                    OutboxEvent.next_attempt_at <= func.now(),
+                )
+                .distinct()
+            )
+        )
+
+    def post(self, url: str, secret: Optional[str], bodies: List[dict]):
+        """
+        POST one lane; None when delivered, else the error.
+        """
+        body = json.dumps({"events": bodies}, separators=(",", ":")).encode()
+        OUTBOX_DELIVERY_BATCH_SIZE.observe(len(bodies))
+        try:
+            # Checked again here, as the host may resolve elsewhere by now
+            check_public_url(url)
+        except ValueError as exc:
+            return f"Refused webhook URL: {exc}"
+        try:
+            with OUTBOX_DELIVERY_SECONDS.time():
+                response = self.client.post(
+                    url,
+                    content=body,
+                    headers={"Content-Type": "application/json", **sign(secret, body)},
+                )
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            return f"{type(exc).__name__}: {exc}"[:500]
+        return None
+
+    def relay_org(self, org_id) -> int:
+        """
+        Send one organization's due events; returns how many were delivered.
+        """
+        db = SessionLocal()
+        try:
+            with advisory_lock(db, org_lock_key(org_id)) as locked:
+                if not locked:
+                    return 0
+                return self.deliver(db, org_id)
+        except Exception:
+            logger.exception("Relaying outbox failed", extra={"org_id": str(org_id)})
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def deliver(self, db: Session, org_id) -> int:
+        """
+        Send an organization's due events, holding its lock. The transaction
+        that read them is committed first, so no connection is held idle in
+        a transaction while the POSTs run.
+        """
+        org = db.get(Organization, org_id)
+        events = due_events(db, org_id)
+        if not events:
+            db.rollback()
+            return 0
+        if not org.webhook_url:
+            self.failed(events, "Organization has no webhook endpoint")
+            db.commit()
+            return 0
+
+        url, secret = org.webhook_url, org.webhook_secret
+        split = lanes(events, settings.OUTBOX_ENDPOINT_CONCURRENCY)
+        bodies = [[event_body(event) for event in lane] for lane in split]
+        db.commit()
+        errors = list(
+            self.deliveries.map(lambda lane: self.post(url, secret, lane), bodies)
+        )
+        delivered = 0
+        for lane, error in zip(split, errors):
+            if error is None:
+                for event in lane:
+                    db.delete(event)
+                delivered += len(lane)
+            else:
+                logger.warning(
+                    "Change feed delivery failed",
+                    extra={"org_id": str(org_id), "error": error},
+                )
+                self.retry(lane, error)
+        db.commit()
+        OUTBOX_EVENTS.labels("delivered").inc(delivered)
+        return delivered
+
+    def retry(self, events: List[OutboxEvent], error: str):
+        now = datetime.now(timezone.utc)
+        for event in events:
+            event.attempts += 1
+            event.last_error = error
+            if event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                event.status = OutboxStatus.failed
+                OUTBOX_EVENTS.labels("failed").inc()
+            else:
+                backoff = min(
+                    settings.CELERY_RETRY_BACKOFF_BASE**event.attempts,
+                    settings.OUTBOX_MAX_BACKOFF_SECONDS,
+                )
+                event.next_attempt_at = now + timedelta(seconds=backoff)
+                OUTBOX_EVENTS.labels("retried").inc()
+
+    def failed(self, events: List[OutboxEvent], error: str):
+        for event in events:
+            event.status = OutboxStatus.failed
+            event.last_error = error
+        OUTBOX_EVENTS.labels("failed").inc(len(events))
+
+    def relay_once(self) -> int:
+        """
+        One round over the organizations with due events.
+        """
+        db = SessionLocal()
+        try:
+            org_ids = self.due_orgs(db)
+        finally:
+            db.close()
+        return sum(self.tenants.map(self.relay_org, org_ids))
+
+    def run(self, stop: threading.Event):
+        try:
+            while not stop.is_set():
+                try:
+                    delivered = self.relay_once()
+                except Exception:
+                    logger.exception("Outbox relay round failed")
+                    delivered = 0
+                if not delivered:
+                    stop.wait(settings.OUTBOX_POLL_SECONDS)
+        finally:
+            self.close()
+
+    def close(self):
+        self.tenants.shutdown(wait=True)
+        self.deliveries.shutdown(wait=True)
+        self.client.close()
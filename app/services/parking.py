@@ -0,0 +1,233 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List
+
+from sqlalchemy import and_, exists, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.enums import EventDependency, ServiceType, WebhookStatus
+from app.core.metrics import EVENTS_PARKED, EVENTS_UNPARKED, PARKED_EVENTS
+from app.core.redis import get_broker_redis
+from app.models.parked_event import ParkedEvent
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.payloads import offload_event
+from app.services.webhook_log_helpers import create_webhook_log
+from app.utils.logger import get_logger
+from app.utils.timeline import ENQUEUED_AT_HEADER, RECEIVED_AT_HEADER
+
+logger = get_logger("parking")
+
+
+class MissingDependency(LookupError):
+    """
+    An event refers to an entity that has not been synced yet.
+    """
+
+    def __init__(self, dependency: EventDependency, key: str):
+        super().__init__(f"{dependency.value} {key!r} has not been synced")
+        self.dependency = dependency
+        self.key = key
+
+
+def dependency_exists(db: Session, dependency: EventDependency, key: str) -> bool:
+    if dependency == EventDependency.customer:
+        query = db.query(User.id).filter(User.external_id == key)
+    else:
+        query = db.query(Subscription.id).filter(
+            Subscription.external_subscription_id == key
+        )
+    return db.query(query.exists()).scalar()
+
+
+def dependency_synced():
+    """
+    SQL condition on parked events: the entity the event waits on is synced.
+    """
+    return or_(
+        and_(
+            ParkedEvent.dependency == EventDependency.customer,
+            exists().where(User.external_id == ParkedEvent.dependency_key),
+        ),
+        and_(
+            ParkedEvent.dependency == EventDependency.subscription,
+            exists().where(
+                Subscription.external_subscription_id == ParkedEvent.dependency_key
+            ),
+        ),
+    )
+
+
+def park_event(
+    db: Session, event: dict, service: ServiceType, missing: MissingDependency
+):
+    """
+    Hold an event until `missing` is synced, for up to PARKING_TTL_SECONDS.
+
+    The dependency is checked again once the event is committed. A sync that
+    committed it in between may have looked for parked events too early, so
+    in that case the event is released here instead.
+    """
+    stmt = insert(ParkedEvent).values(
+        event_id=event["event_id"],
+        service=service,
+        org_id=event.get("organization_id", "unknown"),
+        dependency=missing.dependency,
+        dependency_key=missing.key,
+        payload=event,
+        expires_at=datetime.now(timezone.utc)
+        + timedelta(seconds=settings.PARKING_TTL_SECONDS),
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ParkedEvent.event_id],
+            set_={
+                "dependency": stmt.excluded.dependency,
+                "dependency_key": stmt.excluded.dependency_key,
+            },
+        )
+    )
+    db.commit()
+    EVENTS_PARKED.labels(service.value, missing.dependency.value).inc()
+    logger.info(
+        "Event parked until its dependency is synced",
+        extra={"dependency": missing.dependency.value, "dependency_key": missing.key},
+    )
+
+    if dependency_exists(db, missing.dependency, missing.key):
+        release_parked(db, missing.dependency, [missing.key])
+
+
+def release_parked(db: Session, dependency: EventDependency, keys: Iterable[str]):
+    """
+    Send the events parked on `keys` back for processing, now that those
+    entities are synced. Returns how many were released.
+
+    Rows stay locked (SKIP LOCKED for concurrent releases) until their events
+    are enqueued and are deleted in the same transaction, so each event is
+    released once. If the broker fails the events stay parked, and
+    `release_synced` retries them from the beat sweep.
+    """
+    keys = list(keys)
+    if not keys:
+        return 0
+    parked = (
+        db.query(ParkedEvent)
+        .filter(
+            ParkedEvent.dependency == dependency,
+            ParkedEvent.dependency_key.in_(keys),
+        )
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    try:
+        for row in parked:
+            requeue_event(row.payload, row.service)
+            db.delete(row)
+        db.commit()
+    except Exception:
+        logger.exception(
+            "Releasing parked events failed", extra={"dependency": dependency.value}
+        )
+        db.rollback()
+        return 0
+
+    if parked:
+        EVENTS_UNPARKED.labels(dependency.value, "released").inc(len(parked))
+        logger.info(
+            "Released parked events",
+            extra={"dependency": dependency.value, "released_count": len(parked)},
+        )
+    return len(parked)
+
+
+def requeue_event(event: dict, service: ServiceType):
+    """
+    Enqueue a released event on the configured transport, as a new delivery.
+    """
+    headers = {RECEIVED_AT_HEADER: time.time()}
+    message = offload_event(event)
+    headers[ENQUEUED_AT_HEADER] = time.time()
+    # Imported here: both import the sync services, which import this module
+    from app.services.event_streams import publish_event
+    from app.worker import celery_app
+
+    if settings.EVENT_TRANSPORT == "streams":
+        publish_event(get_broker_redis(), message, service, headers)
+    else:
+        celery_app.send_task(
+            "app.services.tasks.process_event",
+            (message, service.value),
+            queue="integration_queue",
+            headers=headers,
+        )
+
+
+def release_synced(db: Session) -> int:
+    """
+    Release parked events whose dependency is synced by now, e.g. after a
+    release failed on the broker; returns how many.
+    """
+    pending: Dict[EventDependency, List[str]] = {}
+    ready = (
+        db.query(ParkedEvent.dependency, ParkedEvent.dependency_key)
+        .filter(dependency_synced())
+        .distinct()
+    )
+    for dependency, key in ready:
+        pending.setdefault(dependency, []).append(key)
+    db.rollback()
+    return sum(
+        release_parked(db, dependency, keys) for dependency, keys in pending.items()
+    )
+
+
+def expire_parked(db: Session) -> int:
+    """
+    Log parked events past their TTL as failed and drop them; returns how many.
+
+    Each event is deleted in the transaction that writes its webhook log, so
+    it can still be found and replayed from there. Events whose dependency
+    is synced are not failed but left for `release_synced`.
+    """
+    expired = 0
+    while True:
+        row = (
+            db.query(ParkedEvent)
+            .filter(ParkedEvent.expires_at <= func.now(), ~dependency_synced())
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if row is None:
+            db.rollback()
+            return expired
+        logger.warning(
+            "Parked event expired before its dependency was synced",
+            extra={
+                "event_id": row.event_id,
+                "dependency": row.dependency.value,
+                "dependency_key": row.dependency_key,
+            },
+        )
+        db.delete(row)
+        # Commits the delete with the log
+        create_webhook_log(
+            db=db,
+            event_id=row.event_id,
+            service=row.service,
+            org_id=row.org_id,
+            status=WebhookStatus.failed,
+            payload=row.payload,
+        )
+        EVENTS_UNPARKED.labels(row.dependency.value, "expired").inc()
+        expired += 1
+
+
+def observe_parked(db: Session):
+    counts = dict(
+        db.query(ParkedEvent.dependency, func.count()).group_by(ParkedEvent.dependency)
+    )
+    for dependency in EventDependency:
+        PARKED_EVENTS.labels(dependency.value).set(counts.get(dependency, 0))
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import zlib
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_broker_redis
+from app.utils.logger import get_logger
+
+logger = get_logger("payloads")
+
+PAYLOAD_REF = "payload_ref"
+
+
+class PayloadExpired(LookupError):
+    """
+    An offloaded event is gone from Redis (its TTL ran out before processing).
+
+    The event is logged as failed from the reference's event id and org.
+    """
+
+
+def offload_event(event: dict) -> dict:
+    """
+    Replace an event of PAYLOAD_OFFLOAD_THRESHOLD_BYTES or more with a
+    reference to a copy stored in Redis.
+
+    Copies live in the broker Redis next to the messages that refer to them,
+    which must not evict keys; the cache Redis may drop them under pressure.
+
+    The copy is zlib-compressed and keyed by content hash, so a replayed event
+    is stored once; the message (and every retry of it) carries only the key,
+    the event id and the organization. If Redis is unavailable the event is
+    sent inline as before.
+    """
+    threshold = settings.PAYLOAD_OFFLOAD_THRESHOLD_BYTES
+    if not threshold:
+        return event
+    body = json.dumps(event, separators=(",", ":"), default=str).encode()
+    if len(body) < threshold:
+        return event
+
+    key = f"payload:{hashlib.sha256(body).hexdigest()}"
+    try:
+        get_broker_redis().set(
+            key,
+            zlib.compress(body),
+            ex=settings.PAYLOAD_OFFLOAD_TTL_SECONDS,
+            nx=True,
+        )
+    except RedisError as exc:
+        logger.warning(f"Payload offload failed, sending event inline: {exc}")
+        return event
+    return {
+        PAYLOAD_REF: key,
+        "event_id": event.get("event_id"),
+        "organization_id": event.get("organization_id"),
+    }
+
+
+def resolve_event(event: dict) -> dict:
+    """
+    Return the full event for a message produced by `offload_event`.
+
+    Raises:
+        PayloadExpired: If the stored copy no longer exists.
+        RedisError: If Redis is unavailable; callers retry.
+    """
+    key = event.get(PAYLOAD_REF)
+    if key is None:
+        return event
+    body = get_broker_redis().get(key)
+    if body is None:
+        raise PayloadExpired(key)
+    return json.loads(zlib.decompress(body))
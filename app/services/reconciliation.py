@@ -0,0 +1,487 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.enums import (
+    EventDependency,
+    OrganizationStatus,
+    ReconciliationStatus,
+    ServiceType,
+    UserRole,
+    UserStatus,
+)
+from app.core.principal import invalidate_principal
+from app.db.session import SessionLocal
+from app.models.organization import Organization
+from app.models.reconciliation import UserReconciliation
+from app.models.sync_watermark import SyncWatermark
+from app.models.user import User
+from app.schemas.external_api_responses import (
+    ExternalUserListSuccessResponse,
+    ExternalUserSummary,
+)
+from app.services.external_mocks.user_service import list_users
+from app.services.parking import release_parked
+from app.utils.logger import get_logger
+from app.worker import celery_app
+
+logger = get_logger("reconciliation")
+
+# Columns the directory is authoritative for; None in the directory keeps ours.
+DIRECTORY_FIELDS = ("email", "first_name", "last_name", "status")
+
+# Cursor of a watermark that has not read anything yet
+BEGINNING = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def fetch_page(
+    organization_id: str, page: int, per_page: int, **cursor
+) -> ExternalUserListSuccessResponse:
+    """
+    `list_users` with RECONCILE_FETCH_RETRIES retries and exponential backoff.
+    """
+    for attempt in range(settings.RECONCILE_FETCH_RETRIES + 1):
+        try:
+            return list_users(organization_id, page=page, per_page=per_page, **cursor)
+        except Exception:
+            if attempt == settings.RECONCILE_FETCH_RETRIES:
+                raise
+            logger.warning(
+                "list_users failed, retrying",
+                extra={"page": page, "retry": attempt + 1},
+            )
+            time.sleep(settings.CELERY_RETRY_BACKOFF_BASE**attempt)
+
+
+def directory_row(user: ExternalUserSummary, org_id: uuid.UUID) -> dict:
+    status = user.status if user.status in UserStatus._value2member_map_ else None
+    return {
+        "external_id": user.user_id,
+        "org_id": org_id,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "status": UserStatus(status) if status else None,
+    }
+
+
+def active_org(db: Session, org_id) -> Optional[Organization]:
+    """
+    The organization, or None when it does not exist or is being offboarded:
+    syncing into it would only give its offboarding job more rows to remove.
+    """
+    org = db.get(Organization, org_id)
+    if org is None or org.status != OrganizationStatus.active:
+        return None
+    return org
+
+
+def active_org_ids(db: Session) -> List[uuid.UUID]:
+    query = db.query(Organization.id).filter(
+        Organization.status == OrganizationStatus.active
+    )
+    return [org_id for (org_id,) in query]
+
+
+def diff_page(db: Session, org: Organization, users: List[ExternalUserSummary]):
+    """
+    Directory rows that differ from local users, with the ids of the local
+    users they update and a count of rows that cannot be applied.
+
+    A row conflicts when its external id belongs to another organization, when
+    it is new but has no email, or when its email belongs to another user,
+    locally or earlier on the page.
+    """
+    incoming = {user.user_id: directory_row(user, org.id) for user in users}
+    local = {
+        row.external_id: row
+        for row in db.query(
+            User.id,
+            User.external_id,
+            User.org_id,
+            User.email,
+            User.first_name,
+            User.last_name,
+            User.status,
+        ).filter(User.external_id.in_(incoming))
+    }
+
+    changed, updated_ids, conflicts = {}, {}, 0
+    for external_id, row in incoming.items():
+        current = local.get(external_id)
+        if current is None:
+            if row["email"] is None:
+                conflicts += 1
+                continue
+            changed[external_id] = {
+                **row,
+                "id": uuid.uuid4(),
+                "status": row["status"] or UserStatus.pending,
+            }
+        elif current.org_id != org.id:
+            conflicts += 1
+        elif any(
+            row[field] is not None and row[field] != getattr(current, field)
+            for field in DIRECTORY_FIELDS
+        ):
+            changed[external_id] = {**row, "id": current.id}
+            updated_ids[external_id] = current.id
+
+    claims = {}
+    for key, row in changed.items():
+        if row["email"]:
+            claims.setdefault(row["email"], []).append(key)
+    owners = (
+        dict(db.query(User.email, User.external_id).filter(User.email.in_(claims)))
+        if claims
+        else {}
+    )
+    for email, keys in claims.items():
+        # The email's local owner keeps it, or else the first row on the page
+        keep = owners.get(email, keys[0])
+        for key in keys:
+            if key != keep:
+                changed.pop(key)
+                updated_ids.pop(key, None)
+                conflicts += 1
+    return list(changed.values()), list(updated_ids.values()), conflicts
+
+
+def upsert_users(db: Session, rows: List[dict]):
+    """
+    Insert new directory users and update changed ones in one statement.
+    """
+    users = User.__table__.c
+    stmt = insert(User)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[users.external_id],
+        set_={
+            field: func.coalesce(stmt.excluded[field], users[field])
+            for field in DIRECTORY_FIELDS
+        },
+        where=users.org_id == stmt.excluded.org_id,
+    )
+    # A parameter list runs as batched multi-row VALUES from one cached statement.
+    db.execute(
+        stmt, [{**row, "role": UserRole.user, "hashed_password": None} for row in rows]
+    )
+
+
+def release_created(db: Session, rows: List[dict], updated_ids: List[uuid.UUID]):
+    """
+    Release events parked on the customers a page created.
+    """
+    updated = set(updated_ids)
+    release_parked(
+        db,
+        EventDependency.customer,
+        [row["external_id"] for row in rows if row["id"] not in updated],
+    )
+
+
+def apply_page(
+    db: Session,
+    org: Organization,
+    run: UserReconciliation,
+    users: List[ExternalUserSummary],
+):
+    """
+    Upsert one page's changes and advance the checkpoint in one transaction.
+    """
+    rows, updated_ids, conflicts = diff_page(db, org, users) if users else ([], [], 0)
+    if rows:
+        upsert_users(db, rows)
+    run.next_page += 1
+    run.fetched_count += len(users)
+    run.created_count += len(rows) - len(updated_ids)
+    run.updated_count += len(updated_ids)
+    run.conflict_count += conflicts
+    run.updated_at = datetime.now(timezone.utc)
+    db.commit()
+    for user_id in updated_ids:
+        invalidate_principal(user_id)
+    release_created(db, rows, updated_ids)
+
+
+def sync_pages(db: Session, org: Organization, run: UserReconciliation):
+    """
+    Apply the directory from the run's checkpoint to the last page.
+
+    Up to RECONCILE_PAGE_CONCURRENCY pages ahead of the checkpoint are fetched
+    in parallel while the current one is applied. Pages are applied in order,
+    so the checkpoint only moves past applied pages and at most that many
+    pages are held in memory.
+    """
+    per_page = settings.RECONCILE_PAGE_SIZE
+    page = fetch_page(org.slug, run.next_page, per_page)
+    pagination = page.data.pagination
+    run.total_pages = -(-pagination.total // per_page)
+
+    with ThreadPoolExecutor(settings.RECONCILE_PAGE_CONCURRENCY) as pool:
+        ahead = {}
+        next_fetch = run.next_page + 1
+        while True:
+            while (
+                next_fetch <= run.total_pages
+                and len(ahead) < settings.RECONCILE_PAGE_CONCURRENCY
+            ):
+                ahead[next_fetch] = pool.submit(
+                    fetch_page, org.slug, next_fetch, per_page
+                )
+                next_fetch += 1
+
+            apply_page(db, org, run, page.data.users)
+            if not page.data.pagination.has_more or run.next_page not in ahead:
+                break
+            page = ahead.pop(run.next_page).result()
+
+
+def claim_run(db: Session, org: Organization) -> Optional[UserReconciliation]:
+    """
+    The organization's unfinished run to resume, or a new run.
+
+    None when another worker is on the run, i.e. it is running and was
+    checkpointed within RECONCILE_STALE_SECONDS.
+    """
+    run = (
+        db.query(UserReconciliation)
+        .filter(
+            UserReconciliation.org_id == org.id,
+            UserReconciliation.status != ReconciliationStatus.completed,
+        )
+        .order_by(UserReconciliation.started_at.desc())
+        .with_for_update()
+        .first()
+    )
+    now = datetime.now(timezone.utc)
+    if run is None:
+        run = UserReconciliation(org_id=org.id, next_page=1)
+        db.add(run)
+    elif (
+        run.status == ReconciliationStatus.running
+        and run.updated_at > now - timedelta(seconds=settings.RECONCILE_STALE_SECONDS)
+    ):
+        db.rollback()
+        return None
+    run.status = ReconciliationStatus.running
+    run.updated_at = now
+    db.commit()
+    return run
+
+
+def reconcile_org(db: Session, org_id) -> Optional[UserReconciliation]:
+    """
+    Bring an organization's users in line with the external user directory.
+
+    Only changed rows are written. Users missing from the directory are left
+    alone; deletions still arrive as `user.deleted` webhooks. A failed run
+    keeps its checkpoint and the next call resumes it.
+    """
+    org = active_org(db, org_id)
+    if org is None:
+        return None
+    run = claim_run(db, org)
+    if run is None:
+        logger.info("Reconciliation already running", extra={"org_id": org.slug})
+        return None
+
+    try:
+        sync_pages(db, org, run)
+    except Exception:
+        logger.exception(
+            "Reconciliation failed",
+            extra={"org_id": org.slug, "next_page": run.next_page},
+        )
+        db.rollback()
+        run.status = ReconciliationStatus.failed
+        db.commit()
+        return run
+
+    run.status = ReconciliationStatus.completed
+    run.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    logger.info(
+        "Reconciliation completed",
+        extra={
+            "org_id": org.slug,
+            "fetched_count": run.fetched_count,
+            "created_count": run.created_count,
+            "updated_count": run.updated_count,
+            "conflict_count": run.conflict_count,
+        },
+    )
+    return run
+
+
+@celery_app.task
+def reconcile_users():
+    """
+    Queue a reconciliation for every organization; scheduled by celery beat.
+    """
+    db = SessionLocal()
+    try:
+        org_ids = active_org_ids(db)
+    finally:
+        db.close()
+    for org_id in org_ids:
+        reconcile_org_users.delay(str(org_id))
+
+
+@celery_app.task
+def reconcile_org_users(org_id: str):
+    db = SessionLocal()
+    try:
+        reconcile_org(db, uuid.UUID(org_id))
+    finally:
+        db.close()
+
+
+def claim_watermark(db: Session, org: Organization, service: ServiceType):
+    """
+    The organization's watermark for a service, created at the beginning.
+    """
+    db.execute(
+        insert(SyncWatermark)
+        .values(org_id=org.id, service=service)
+        .on_conflict_do_nothing()
+    )
+    db.commit()
+    return db.get(SyncWatermark, (org.id, service))
+
+
+def watermark_position(watermark: SyncWatermark):
+    return (watermark.watermark_at or BEGINNING, watermark.watermark_id or "")
+
+
+def apply_changes(
+    db: Session,
+    org: Organization,
+    watermark: SyncWatermark,
+    users: List[ExternalUserSummary],
+) -> tuple:
+    """
+    Upsert a page of changed users and advance the watermark past it, in one
+    transaction. Returns the page's (created, updated, conflict) counts.
+
+    The watermark row is locked before it is moved and only ever moves
+    forward, so an overlapping run for the same organization cannot move it
+    back; reapplying a page it already covers writes nothing. Users without
+    `last_updated` have no place in the cursor order and count as conflicts.
+    """
+    dated = [user for user in users if user.last_updated is not None]
+    undated = len(users) - len(dated)
+    if undated:
+        logger.warning(
+            "Skipping directory users without last_updated",
+            extra={"org_id": org.slug, "skipped_count": undated},
+        )
+    rows, updated_ids, conflicts = diff_page(db, org, dated) if dated else ([], [], 0)
+    if rows:
+        upsert_users(db, rows)
+    db.refresh(watermark, with_for_update=True)
+    if dated:
+        last = max(dated, key=lambda user: (user.last_updated, user.user_id))
+        if (last.last_updated, last.user_id) > watermark_position(watermark):
+            watermark.watermark_at = last.last_updated
+            watermark.watermark_id = last.user_id
+    db.commit()
+    for user_id in updated_ids:
+        invalidate_principal(user_id)
+    release_created(db, rows, updated_ids)
+    return len(rows) - len(updated_ids), len(updated_ids), conflicts + undated
+
+
+def sync_changed_users(db: Session, org_id) -> Optional[dict]:
+    """
+    Apply the users changed in the external directory since the organization's
+    watermark.
+
+    Changes are read with a (last_updated, user_id) keyset cursor in pages of
+    RECONCILE_PAGE_SIZE, so the work scales with the number of changes, not
+    the size of the directory. Users updated mid-run only move later in that
+    order, so none is skipped. Each page commits with the watermark, so a
+    failed run is resumed by the next one from its last applied page.
+
+    Returns the run's counts, or None when the organization does not exist,
+    is being offboarded or the run failed.
+    """
+    org = active_org(db, org_id)
+    if org is None:
+        return None
+    watermark = claim_watermark(db, org, ServiceType.USER)
+
+    counts = {"fetched": 0, "created": 0, "updated": 0, "conflict": 0}
+    try:
+        while True:
+            updated_after, after_id = watermark_position(watermark)
+            page = fetch_page(
+                org.slug,
+                1,
+                settings.RECONCILE_PAGE_SIZE,
+                updated_after=updated_after,
+                after_id=after_id,
+            )
+            users = page.data.users
+            if not users:
+                break
+            created, updated, conflicts = apply_changes(db, org, watermark, users)
+            counts["fetched"] += len(users)
+            counts["created"] += created
+            counts["updated"] += updated
+            counts["conflict"] += conflicts
+            if not page.data.pagination.has_more:
+                break
+            if watermark_position(watermark) == (updated_after, after_id):
+                # Reading on would return the same page
+                logger.warning(
+                    "Watermark did not advance; stopping", extra={"org_id": org.slug}
+                )
+                break
+    except Exception:
+        logger.exception(
+            "Incremental user sync failed",
+            extra={"org_id": org.slug, "watermark_id": watermark.watermark_id},
+        )
+        db.rollback()
+        return None
+
+    logger.info(
+        "Incremental user sync completed",
+        extra={
+            "org_id": org.slug,
+            "watermark_id": watermark.watermark_id,
+            **{f"{key}_count": value for key, value in counts.items()},
+        },
+    )
+    return counts
+
+
+@celery_app.task
+def sync_user_changes():
+    """
+    Queue an incremental user sync for every organization; scheduled by
+    celery beat.
+    """
+    db = SessionLocal()
+    try:
+        org_ids = active_org_ids(db)
+    finally:
+        db.close()
+    for org_id in org_ids:
+        sync_org_user_changes.delay(str(org_id))
+
+
+@celery_app.task
+def sync_org_user_changes(org_id: str):
+    db = SessionLocal()
+    try:
+        sync_changed_users(db, uuid.UUID(org_id))
+    finally:
+        db.close()
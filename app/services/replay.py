@@ -0,0 +1,100 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.enums import WebhookStatus
+from app.models.job import Job
+from app.models.organization import Organization
+from app.models.webhooks import WebhookLog
+from app.schemas.job import WebhookReplayParams
+from app.services.parking import requeue_event
+from app.utils.logger import get_logger
+
+logger = get_logger("replay")
+
+
+def finish_chunk(db: Session, job: Job, replayed: list, logs: list):
+    """
+    Drop the failed logs of queued events and move the checkpoint past `logs`.
+    """
+    for log in replayed:
+        db.delete(log)
+    job.checkpoint = {
+        "after_at": logs[-1].created_at.isoformat(),
+        "after_id": str(logs[-1].id),
+    }
+    job.processed_count += len(logs)
+    db.commit()
+
+
+def replay_chunk(db: Session, job: Job) -> bool:
+    """
+    Replay the next JOB_CHUNK_SIZE failed webhook events of the organization.
+
+    Only events logged before the job was submitted are replayed, so events
+    that fail again are not picked up by the same job. An event's failed log
+    is deleted, together with the checkpoint, only after the event has been
+    queued again, so a lost worker cannot lose it: the resumed job queues it
+    once more, and processing skips only events logged as processed. If
+    queueing fails part way, the checkpoint is moved past the events that
+    were queued and a retry of the chunk picks up the rest.
+    """
+    org = db.get(Organization, job.org_id)
+    if org is None:
+        return True
+    params = WebhookReplayParams(**job.params)
+
+    query = db.query(WebhookLog).filter(
+        WebhookLog.org_id == org.slug,
+        WebhookLog.status == WebhookStatus.failed,
+        WebhookLog.created_at <= job.created_at,
+    )
+    if params.service:
+        query = query.filter(WebhookLog.service == params.service)
+    if params.since:
+        query = query.filter(WebhookLog.created_at >= params.since)
+    if job.total_count is None:
+        job.total_count = query.count()
+
+    previous = job.checkpoint
+    if previous:
+        after_at = datetime.fromisoformat(previous["after_at"])
+        after_id = UUID(previous["after_id"])
+        query = query.filter(
+            or_(
+                WebhookLog.created_at > after_at,
+                and_(WebhookLog.created_at == after_at, WebhookLog.id > after_id),
+            )
+        )
+    logs = (
+        query.order_by(WebhookLog.created_at, WebhookLog.id)
+        .limit(settings.JOB_CHUNK_SIZE)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not logs:
+        db.commit()
+        return True
+
+    # Events without a stored payload cannot be replayed and keep their log
+    replayable = [log for log in logs if log.payload is not None]
+    sent = 0
+    try:
+        for log in replayable:
+            requeue_event(log.payload, log.service)
+            sent += 1
+    except Exception:
+        # The retried chunk starts after the events that were queued
+        done = logs[: logs.index(replayable[sent])]
+        if done:
+            finish_chunk(db, job, replayable[:sent], done)
+        raise
+    finish_chunk(db, job, replayable, logs)
+    logger.info(
+        "Replayed failed webhook events",
+        extra={"org_id": org.slug, "replayed_count": sent},
+    )
+    return len(logs) < settings.JOB_CHUNK_SIZE
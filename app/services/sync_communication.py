@@ -1,15 +1,16 @@
 from sqlalchemy.orm import Session
 
-from app.core.enums import AuditAction
+from app.core.enums import AuditAction, OrganizationStatus
 from app.db.session import SessionLocal
 from app.models.communication_log import CommunicationLog
 from app.models.organization import Organization
 from app.models.user import User
 from app.schemas.webhooks import CommunicationServiceEvent
+from app.services.outbox import record_change
 from app.utils.audit import log_audit
 from app.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger("sync_communication")
 
 
 def sync_communication(event: CommunicationServiceEvent):
@@ -21,10 +22,18 @@ def sync_communication(event: CommunicationServiceEvent):
         org_id_str = event.organization_id
 
         # Validate organization
-        org = db.query(Organization).filter(Organization.slug == org_id_str).first()
+        org = (
+            db.query(Organization)
+            .filter(
+                Organization.slug == org_id_str,
+                Organization.status == OrganizationStatus.active,
+            )
+            .first()
+        )
         if not org:
             logger.warning(
-                f"Organization {org_id_str} not found. Skipping communication sync."
+                "Organization not found or offboarding, skipping communication sync",
+                extra={"message_id": data.message_id},
             )
             return
 
@@ -32,7 +41,8 @@ def sync_communication(event: CommunicationServiceEvent):
         user = db.query(User).filter(User.email == data.recipient).first()
         if not user:
             logger.warning(
-                f"User with email {data.recipient} not found. Logging without user link."
+                "Recipient not found, logging without user link",
+                extra={"message_id": data.message_id},
             )
             user_id = None
         else:
@@ -45,7 +55,9 @@ def sync_communication(event: CommunicationServiceEvent):
         )
 
         if comm_log:
-            logger.info(f"Updating communication log for message {data.message_id}.")
+            logger.info(
+                "Updating communication log", extra={"message_id": data.message_id}
+            )
             comm_log.status = data.status
             comm_log.delivery_time_ms = (
                 str(data.delivery_time_ms)
@@ -54,12 +66,13 @@ def sync_communication(event: CommunicationServiceEvent):
             )
             comm_log.template = data.template or comm_log.template
 
+            record_change(db, org, event.event_type, comm_log)
             db.commit()
             db.refresh(comm_log)
             log_audit(db, AuditAction.UPDATED_COMM_LOG, user_id, org.id)
         else:
             logger.info(
-                f"Creating new communication log for message {data.message_id}."
+                "Creating new communication log", extra={"message_id": data.message_id}
             )
             comm_log = CommunicationLog(
                 message_id=data.message_id,
@@ -72,13 +85,15 @@ def sync_communication(event: CommunicationServiceEvent):
             )
             db.add(comm_log)
 
+            record_change(db, org, event.event_type, comm_log)
             db.commit()
             db.refresh(comm_log)
             log_audit(db, AuditAction.CREATED_COMM_LOG, user_id, org.id)
 
-    except Exception as e:
+    except Exception:
         logger.exception(
-            f"Error syncing communication log for message {getattr(data, 'message_id', 'unknown')}: {e}"
+            "Error syncing communication log",
+            extra={"message_id": getattr(data, "message_id", "unknown")},
         )
         db.rollback()
     finally:
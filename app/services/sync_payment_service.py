@@ -1,6 +1,12 @@
 from sqlalchemy.orm import Session
 
-from app.core.enums import AuditAction, SubscriptionEventType, SubscriptionStatus
+from app.core.enums import (
+    AuditAction,
+    EventDependency,
+    OrganizationStatus,
+    SubscriptionEventType,
+    SubscriptionStatus,
+)
 from app.db.session import SessionLocal
 from app.models.organization import Organization
 from app.models.subscription import Subscription
@@ -10,10 +16,12 @@ from app.schemas.external_api_responses import (
     ExternalSubscriptionSuccessResponse,
 )
 from app.schemas.webhooks import PaymentServiceEvent
+from app.services.outbox import record_change
+from app.services.parking import MissingDependency, release_parked
 from app.utils.audit import log_audit
 from app.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger("sync_payment")
 
 
 def sync_subscription(
@@ -31,17 +39,27 @@ def sync_subscription(
         # Validate event type
         if event_type_str not in SubscriptionEventType._value2member_map_:
             logger.warning(
-                f"Invalid event type '{event_type_str}' for subscription {sub_id}. Skipping."
+                "Invalid payment event type %r, skipping",
+                event_type_str,
+                extra={"subscription_id": sub_id},
             )
             return
 
         event_type = SubscriptionEventType(event_type_str)
 
         # Validate organization
-        org = db.query(Organization).filter(Organization.slug == org_id_str).first()
+        org = (
+            db.query(Organization)
+            .filter(
+                Organization.slug == org_id_str,
+                Organization.status == OrganizationStatus.active,
+            )
+            .first()
+        )
         if not org:
             logger.warning(
-                f"Organization {org_id_str} not found. Skipping subscription sync."
+                "Organization not found or offboarding, skipping subscription sync",
+                extra={"subscription_id": sub_id},
             )
             return
 
@@ -50,10 +68,14 @@ def sync_subscription(
             db.query(User).filter(User.external_id == external_data.customer_id).first()
         )
         if not user:
-            logger.warning(
-                f"User with external_id (customer_id) {external_data.customer_id} not found. Skipping subscription sync."
+            logger.info(
+                "Customer not synced yet, parking subscription event",
+                extra={
+                    "subscription_id": sub_id,
+                    "customer_id": external_data.customer_id,
+                },
             )
-            return
+            raise MissingDependency(EventDependency.customer, external_data.customer_id)
 
         subscription = (
             db.query(Subscription)
@@ -63,13 +85,19 @@ def sync_subscription(
 
         if event_type == SubscriptionEventType.created:
             if subscription:
-                logger.info(f"Subscription {sub_id} already exists. Updating.")
+                logger.info(
+                    "Subscription already exists, updating",
+                    extra={"subscription_id": sub_id},
+                )
                 update_subscription_fields(subscription, external_data)
+                record_change(db, org, event_type_str, subscription)
                 db.commit()
                 db.refresh(subscription)
                 log_audit(db, AuditAction.UPDATED_SUBSCRIPTION, user.id, org.id)
             else:
-                logger.info(f"Creating new subscription {sub_id}.")
+                logger.info(
+                    "Creating new subscription", extra={"subscription_id": sub_id}
+                )
                 subscription = Subscription(
                     external_subscription_id=sub_id,
                     user_id=user.id,
@@ -81,30 +109,40 @@ def sync_subscription(
                     trial_end=event.data.trial_end,
                 )
                 db.add(subscription)
+                record_change(db, org, event_type_str, subscription)
                 db.commit()
                 db.refresh(subscription)
                 log_audit(db, AuditAction.CREATED_SUBSCRIPTION, user.id, org.id)
+                release_parked(db, EventDependency.subscription, [sub_id])
 
         elif event_type == SubscriptionEventType.failed:
             if not subscription:
-                logger.warning(
-                    f"Subscription {sub_id} not found on payment failure event. Skipping."
+                logger.info(
+                    "Subscription not synced yet, parking payment failure event",
+                    extra={"subscription_id": sub_id},
                 )
-                return
+                raise MissingDependency(EventDependency.subscription, sub_id)
 
-            logger.info(f"Processing payment failure for subscription {sub_id}.")
+            logger.info("Processing payment failure", extra={"subscription_id": sub_id})
             subscription.status = SubscriptionStatus.failed
+            record_change(db, org, event_type_str, subscription)
             db.commit()
             db.refresh(subscription)
             log_audit(db, AuditAction.PAYMENT_FAILED_SUBSCRIPTION, user.id, org.id)
 
         else:
             logger.warning(
-                f"Unhandled event type '{event_type}' in payment event. Skipping."
+                "Unhandled payment event type %r, skipping",
+                event_type,
+                extra={"subscription_id": sub_id},
             )
 
-    except Exception as e:
-        logger.exception(f"Error syncing subscription {sub_id}: {e}")
+    except MissingDependency:
+        raise
+    except Exception:
+        logger.exception(
+            "Error syncing subscription", extra={"subscription_id": sub_id}
+        )
         db.rollback()
     finally:
         db.close()
@@ -1,6 +1,13 @@
 from sqlalchemy.orm import Session
 
-from app.core.enums import AuditAction, UserEventType, UserStatus
+from app.core.enums import (
+    AuditAction,
+    EventDependency,
+    OrganizationStatus,
+    UserEventType,
+    UserStatus,
+)
+from app.core.principal import invalidate_principal
 from app.db.session import SessionLocal
 from app.models.organization import Organization
 from app.models.user import User
@@ -9,10 +16,12 @@ from app.schemas.external_api_responses import (
     ExternalUserSuccessResponse,
 )
 from app.schemas.webhooks import UserData, UserServiceEvent
+from app.services.outbox import record_change
+from app.services.parking import release_parked
 from app.utils.audit import log_audit
 from app.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger("sync_user")
 
 
 def sync_user(event: UserServiceEvent, external_response: ExternalUserSuccessResponse):
@@ -26,16 +35,26 @@ def sync_user(event: UserServiceEvent, external_response: ExternalUserSuccessRes
         # Validate event type
         if event_type_str not in UserEventType._value2member_map_:
             logger.warning(
-                f"Invalid event type '{event_type_str}' for user {external_id}. Skipping."
+                "Invalid user event type %r, skipping",
+                event_type_str,
+                extra={"external_id": external_id},
             )
             return
 
         event_type = UserEventType(event_type_str)
 
-        org = db.query(Organization).filter(Organization.slug == org_id).first()
+        org = (
+            db.query(Organization)
+            .filter(
+                Organization.slug == org_id,
+                Organization.status == OrganizationStatus.active,
+            )
+            .first()
+        )
         if not org:
             logger.warning(
-                f"Organization {org_id} not found for user {external_id}. Skipping sync."
+                "Organization not found or offboarding, skipping user sync",
+                extra={"external_id": external_id},
             )
             return
 
@@ -44,13 +63,17 @@ def sync_user(event: UserServiceEvent, external_response: ExternalUserSuccessRes
 
         if event_type == UserEventType.created:
             if user:
-                logger.info(f"User {external_id} already exists. Updating.")
+                logger.info(
+                    "User already exists, updating", extra={"external_id": external_id}
+                )
                 update_user_fields(user, external_data)
+                record_change(db, org, event_type_str, user)
                 db.commit()
                 db.refresh(user)
+                invalidate_principal(user.id)
                 log_audit(db, AuditAction.UPDATED_USER, user.id, org.id)
             else:
-                logger.info(f"Creating new user {external_id}.")
+                logger.info("Creating new user", extra={"external_id": external_id})
                 user = User(
                     external_id=external_id,
                     email=external_data.email,
@@ -63,41 +86,51 @@ def sync_user(event: UserServiceEvent, external_response: ExternalUserSuccessRes
                     title=external_data.title,
                 )
                 db.add(user)
+                record_change(db, org, event_type_str, user)
                 db.commit()
                 db.refresh(user)
                 log_audit(db, AuditAction.CREATED_USER, user.id, org.id)
+                release_parked(db, EventDependency.customer, [external_id])
 
         elif event_type == UserEventType.updated:
             if not user:
                 logger.warning(
-                    f"User {external_id} not found on update event. Skipping."
+                    "User not found on update event, skipping",
+                    extra={"external_id": external_id},
                 )
                 return
-            logger.info(f"Updating existing user {external_id}.")
+            logger.info("Updating existing user", extra={"external_id": external_id})
             update_user_fields(user, external_data)
+            record_change(db, org, event_type_str, user)
             db.commit()
             db.refresh(user)
+            invalidate_principal(user.id)
             log_audit(db, AuditAction.UPDATED_USER, user.id, org.id)
 
         elif event_type == UserEventType.deleted:
             if not user:
                 logger.warning(
-                    f"User {external_id} not found on delete event. Skipping."
+                    "User not found on delete event, skipping",
+                    extra={"external_id": external_id},
                 )
                 return
-            logger.info(f"Deactivating user {external_id}.")
+            logger.info("Deactivating user", extra={"external_id": external_id})
             user.status = UserStatus.inactive
+            record_change(db, org, event_type_str, user)
             db.commit()
             db.refresh(user)
+            invalidate_principal(user.id)
             log_audit(db, AuditAction.DELETED_USER, user.id, org.id)
 
         else:
             logger.warning(
-                f"Unhandled event type '{event_type}' for user {external_id}. Skipping."
+                "Unhandled user event type %r, skipping",
+                event_type,
+                extra={"external_id": external_id},
             )
 
-    except Exception as e:
-        logger.exception(f"Error syncing user {external_id}: {e}")
+    except Exception:
+        logger.exception("Error syncing user", extra={"external_id": external_id})
         db.rollback()
     finally:
         db.close()
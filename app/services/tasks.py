@@ -1,5 +1,18 @@
+from contextlib import contextmanager
+
+from redis.exceptions import RedisError
+
 from app.core.config import settings
 from app.core.enums import ServiceType, WebhookStatus
+from app.core.metrics import (
+    EVENT_DUPLICATES,
+    EVENT_FAILURES,
+    EVENT_QUEUE_LAG_SECONDS,
+    EVENT_RETRIES,
+    EVENT_STAGE_SECONDS,
+)
+from app.core.profiling import profile_task
+from app.core.tracing import TRACEPARENT_HEADER, correlation_context, tracer
 from app.db.session import SessionLocal
 from app.schemas.external_api_responses import (
     ExternalSubscriptionSuccessResponse,
@@ -13,6 +26,14 @@ from app.schemas.webhooks import (
 )
 from app.services.external_mocks.payment_service import process_subscription
 from app.services.external_mocks.user_service import process_user
+from app.services.parking import (
+    MissingDependency,
+    expire_parked,
+    observe_parked,
+    park_event,
+    release_synced,
+)
+from app.services.payloads import PayloadExpired, resolve_event
 from app.services.sync_communication import sync_communication
 from app.services.sync_payment_service import sync_subscription
 from app.services.sync_user_service import sync_user
@@ -20,51 +41,221 @@ from app.services.webhook_log_helpers import (
     check_if_event_processed,
     create_webhook_log,
 )
-from app.utils.logger import get_logger
+from app.utils.logger import get_logger, log_context
+from app.utils.timeline import EventTimeline, task_header
 from app.worker import celery_app
 
-logger = get_logger()
+logger = get_logger("tasks")
+
+
+@contextmanager
+def stage(service_name: str, name: str):
+    """
+    Time one process_event stage as a Prometheus histogram and a trace span.
+    """
+    with EVENT_STAGE_SECONDS.labels(service_name, name).time(), tracer.start_span(
+        f"process_event.{name}", {"service": service_name}
+    ):
+        yield
 
 
 @celery_app.task(bind=True, max_retries=settings.CELERY_MAX_RETRIES)
 def process_event(self, event: dict, service_name: str):
+    try:
+        event = resolve_event(event)
+    except PayloadExpired:
+        log_payload_expired(event, ServiceType(service_name))
+        return
+    except RedisError as exc:
+        countdown = settings.CELERY_RETRY_BACKOFF_BASE**self.request.retries
+        raise self.retry(exc=exc, countdown=countdown)
+
+    metadata = event.get("metadata") or {}
+    with (
+        log_context(
+            event_id=event.get("event_id"),
+            org_id=event.get("organization_id"),
+            service=service_name,
+        ),
+        correlation_context(metadata.get("correlation_id")),
+        tracer.start_span(
+            "process_event",
+            {
+                "event_id": event.get("event_id"),
+                "service": service_name,
+                "retries": self.request.retries or 0,
+            },
+            traceparent=task_header(self.request, TRACEPARENT_HEADER),
+        ),
+        profile_task(service_name),
+    ):
+        run_event(self, event, service_name)
+
+
+def run_event(task, event: dict, service_name: str):
+    """
+    Body of `process_event`, run inside its trace span and correlation context.
+    """
+    timeline = EventTimeline.from_request(task.request)
+    if not task.request.retries:
+        observe_queue_lag(service_name, timeline)
+
     db = SessionLocal()
-    parsed_event = BaseWebhookEvent(**event)
-    service_enum = ServiceType(service_name)
+    parsed_event, service_enum = parse_event(event, service_name)
 
-    logger.info(f"Processing event: {parsed_event.event_id} for {service_name}")
+    logger.info("Processing event")
 
     try:
-        if check_if_event_processed(db, parsed_event.event_id):
-            logger.info(
-                f"Duplicate event detected: {parsed_event.event_id}. Skipping processing."
+        handle_event(db, event, parsed_event, service_enum, timeline)
+    except Exception as exc:
+        logger.exception("Error in process_event")
+        try:
+            countdown = settings.CELERY_RETRY_BACKOFF_BASE**task.request.retries
+            logger.warning(
+                "Scheduling retry",
+                extra={"retry": task.request.retries + 1, "countdown": countdown},
+            )
+            if task.request.retries < task.max_retries:
+                EVENT_RETRIES.labels(service_name).inc()
+            raise task.retry(exc=exc, countdown=countdown)
+        except task.MaxRetriesExceededError:
+            log_event_failure(db, event, service_enum, timeline)
+    finally:
+        db.close()
+
+
+def observe_queue_lag(service_name: str, timeline: EventTimeline):
+    enqueued_at = timeline.marks["enqueued"]
+    if enqueued_at is not None:
+        EVENT_QUEUE_LAG_SECONDS.labels(service_name).observe(
+            max(0.0, timeline.marks["started"] - enqueued_at)
+        )
+
+
+def parse_event(event: dict, service_name: str):
+    with stage(service_name, "parse"):
+        return BaseWebhookEvent(**event), ServiceType(service_name)
+
+
+def handle_event(
+    db,
+    event: dict,
+    parsed_event: BaseWebhookEvent,
+    service_enum: ServiceType,
+    timeline: EventTimeline,
+):
+    """
+    Sync one event through its service and log it as processed.
+
+    Shared by the Celery task and the Redis Streams consumer; exceptions are
+    left to the caller's retry policy. The asyncio worker runs the same steps
+    in `AsyncEventRunner.handle_event` (app.services.async_events).
+    """
+    service_name = service_enum.value
+    if is_duplicate(db, parsed_event, service_enum):
+        return
+
+    service_event = parse_service_event(event, service_enum)
+    response = None
+    call = external_call(service_enum)
+    if call is not None:
+        with stage(service_name, "external"):
+            response = call(service_event.data)
+        timeline.mark("external_done")
+
+    if not sync_or_park(db, event, service_enum, service_event, response):
+        return
+    timeline.mark("committed")
+    log_event_processed(db, event, parsed_event, service_enum, timeline)
+
+
+def is_duplicate(db, parsed_event: BaseWebhookEvent, service_enum: ServiceType) -> bool:
+    if check_if_event_processed(db, parsed_event.event_id):
+        logger.info("Duplicate event detected, skipping")
+        EVENT_DUPLICATES.labels(service_enum.value).inc()
+        return True
+    return False
+
+
+def parse_service_event(event: dict, service_enum: ServiceType):
+    if service_enum == ServiceType.USER:
+        return UserServiceEvent(**event)
+    if service_enum == ServiceType.PAYMENT:
+        return PaymentServiceEvent(**event)
+    if service_enum == ServiceType.COMMUNICATION:
+        return CommunicationServiceEvent(**event)
+    return None
+
+
+def external_call(service_enum: ServiceType):
+    """
+    The external client call for a service, or None when it has none.
+    """
+    if service_enum == ServiceType.USER:
+        return process_user
+    if service_enum == ServiceType.PAYMENT:
+        return process_subscription
+    return None
+
+
+def sync_service_event(service_enum: ServiceType, service_event, response):
+    """
+    Apply an event to local data, given the external service's response.
+    """
+    service_name = service_enum.value
+    if service_enum == ServiceType.USER:
+        if isinstance(response, ExternalUserSuccessResponse):
+            with stage(service_name, "sync"):
+                sync_user(service_event, response)
+        else:
+            logger.warning(
+                "External user service returned an error, skipping local sync",
+                extra={"external_id": service_event.data.user_id},
             )
-            return
-
-        if service_enum == ServiceType.USER:
-            parsed_user_event = UserServiceEvent(**event)
-            response = process_user(parsed_user_event.data)
-            if isinstance(response, ExternalUserSuccessResponse):
-                sync_user(parsed_user_event, response)
-            else:
-                logger.warning(
-                    f"External user service returned error for user {parsed_user_event.data.user_id}. Skipping local sync."
-                )
-        elif service_enum == ServiceType.PAYMENT:
-            parsed_payment_event = PaymentServiceEvent(**event)
-            response = process_subscription(parsed_payment_event.data)
-            if isinstance(response, ExternalSubscriptionSuccessResponse):
-                sync_subscription(parsed_payment_event, response)
-            else:
-                logger.warning(
-                    f"External payment service returned error for subscription {getattr(parsed_payment_event.data, 'subscription_id', 'unknown')}. Skipping local sync."
-                )
-        elif service_enum == ServiceType.COMMUNICATION:
-            parsed_comm_event = CommunicationServiceEvent(**event)
-            sync_communication(parsed_comm_event)
+    elif service_enum == ServiceType.PAYMENT:
+        if isinstance(response, ExternalSubscriptionSuccessResponse):
+            with stage(service_name, "sync"):
+                sync_subscription(service_event, response)
         else:
-            logger.warning(f"Unknown service: {service_name}")
+            logger.warning(
+                "External payment service returned an error, skipping local sync",
+                extra={
+                    "subscription_id": getattr(
+                        service_event.data, "subscription_id", "unknown"
+                    )
+                },
+            )
+    elif service_enum == ServiceType.COMMUNICATION:
+        with stage(service_name, "sync"):
+            sync_communication(service_event)
+    else:
+        logger.warning("Unknown service")
+
 
+def sync_or_park(
+    db, event: dict, service_enum: ServiceType, service_event, response
+) -> bool:
+    """
+    `sync_service_event`, or park the event when an entity it refers to has
+    not been synced yet. False when parked: the event is processed again once
+    the entity is synced, so it is not logged now.
+    """
+    try:
+        sync_service_event(service_enum, service_event, response)
+    except MissingDependency as missing:
+        park_event(db, event, service_enum, missing)
+        return False
+    return True
+
+
+def log_event_processed(
+    db,
+    event: dict,
+    parsed_event: BaseWebhookEvent,
+    service_enum: ServiceType,
+    timeline: EventTimeline,
+):
+    with stage(service_enum.value, "log"):
         create_webhook_log(
             db=db,
             event_id=parsed_event.event_id,
@@ -72,31 +263,70 @@ def process_event(self, event: dict, service_name: str):
             org_id=parsed_event.organization_id,
             status=WebhookStatus.processed,
             payload=event,
+            received_at=timeline.received_at,
+            stage_ms=timeline.stage_ms(),
         )
 
-        logger.info(
-            f"Event processed and logged successfully: {parsed_event.event_id} for {service_name}"
+    logger.info("Event processed and logged")
+
+
+def log_event_failure(
+    db, event: dict, service_enum: ServiceType, timeline: EventTimeline
+):
+    """
+    Record an event that has exhausted its retries.
+    """
+    EVENT_FAILURES.labels(service_enum.value).inc()
+    timeline.mark("committed")
+    create_webhook_log(
+        db=db,
+        event_id=event.get("event_id", "unknown"),
+        service=service_enum,
+        org_id=event.get("organization_id", "unknown"),
+        status=WebhookStatus.failed,
+        payload=event,
+        received_at=timeline.received_at,
+        stage_ms=timeline.stage_ms(),
+    )
+    logger.error("Permanent failure logged")
+
+
+def log_payload_expired(reference: dict, service_enum: ServiceType):
+    """
+    Record an event whose offloaded payload expired before it was processed.
+
+    Only the reference is left, so the failed log carries its event id and
+    organization; the event still shows in its status and integration health.
+    """
+    EVENT_FAILURES.labels(service_enum.value).inc()
+    db = SessionLocal()
+    try:
+        create_webhook_log(
+            db=db,
+            event_id=reference.get("event_id", "unknown"),
+            service=service_enum,
+            org_id=reference.get("organization_id", "unknown"),
+            status=WebhookStatus.failed,
+            payload=reference,
         )
+    finally:
+        db.close()
+    logger.error(
+        "Offloaded event payload expired, logged as failed",
+        extra={"event_id": reference.get("event_id"), "service": service_enum.value},
+    )
 
-    except Exception as exc:
-        logger.exception(f"Error in process_event: {exc}")
-        try:
-            countdown = settings.CELERY_RETRY_BACKOFF_BASE**self.request.retries
-            logger.warning(
-                f"Retry #{self.request.retries + 1} for event {event.get('event_id', 'unknown')} in {countdown} seconds"
-            )
-            raise self.retry(exc=exc, countdown=countdown)
-        except self.MaxRetriesExceededError:
-            create_webhook_log(
-                db=db,
-                event_id=event.get("event_id", "unknown"),
-                service=service_enum,
-                org_id=event.get("organization_id", "unknown"),
-                status=WebhookStatus.failed,
-                payload=event,
-            )
-            logger.error(
-                f"Permanent failure logged: {event.get('event_id', 'unknown')}"
-            )
+
+@celery_app.task
+def expire_parked_events():
+    """
+    Release parked events whose dependency is synced, expire the rest past
+    their TTL and refresh the parked gauge; scheduled by celery beat.
+    """
+    db = SessionLocal()
+    try:
+        release_synced(db)
+        expire_parked(db)
+        observe_parked(db)
     finally:
         db.close()
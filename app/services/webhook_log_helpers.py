@@ -1,9 +1,12 @@
 from datetime import datetime
+from typing import List, Optional
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.core.enums import ServiceType, WebhookStatus
 from app.models.webhooks import WebhookLog
+from app.services.integration_health import record_webhook_outcome
 
 
 def serialize_for_json(obj):
@@ -23,8 +26,14 @@ def serialize_for_json(obj):
 def check_if_event_processed(db: Session, event_id: str) -> bool:
     """
     Check if an event with the given event_id has already been processed.
+
+    Only a processed log counts: a failed event may be replayed.
     """
-    existing_log = db.query(WebhookLog).filter_by(event_id=event_id).first()
+    existing_log = (
+        db.query(WebhookLog.id)
+        .filter_by(event_id=event_id, status=WebhookStatus.processed)
+        .first()
+    )
     return existing_log is not None
 
 
@@ -35,18 +44,34 @@ def create_webhook_log(
     org_id: str,
     status: WebhookStatus,
     payload: dict,
+    received_at: Optional[datetime] = None,
+    stage_ms: Optional[List[Optional[int]]] = None,
 ):
     """
-    Create a log entry for a webhook event.
+    Create a log entry for a webhook event and update integration health with it.
+
+    `received_at` and `stage_ms` come from the event's EventTimeline; without
+    them the row falls back to the database's current time. A replayed
+    event's earlier log is overwritten, unless it was already processed.
     """
     serialized_payload = serialize_for_json(payload)
 
-    log_entry = WebhookLog(
-        event_id=event_id,
-        service=service,
-        org_id=org_id,
-        status=status,
-        payload=serialized_payload,
+    values = {
+        "service": service,
+        "org_id": org_id,
+        "status": status,
+        "payload": serialized_payload,
+        "stage_ms": stage_ms,
+    }
+    if received_at is not None:
+        values["received_at"] = received_at
+    stmt = insert(WebhookLog).values(event_id=event_id, **values)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[WebhookLog.event_id],
+            set_=values,
+            where=WebhookLog.status != WebhookStatus.processed,
+        )
     )
-    db.add(log_entry)
+    record_webhook_outcome(db, event_id, service, org_id, status)
     db.commit()
@@ -0,0 +1,40 @@
+"""
+Redis Streams event worker, used when EVENT_TRANSPORT=streams.
+
+Usage:
+    python -m app.stream_worker
+"""
+
+import os
+import signal
+import socket
+import threading
+
+from app.core.config import settings
+from app.core.redis import get_stream_redis
+from app.services.event_streams import StreamConsumer
+from app.utils.logger import configure_logging, get_logger, stop_logging
+
+logger = get_logger("stream_worker")
+
+
+def main():
+    configure_logging()
+    if settings.WORKER_METRICS_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(settings.WORKER_METRICS_PORT)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    name = f"{socket.gethostname()}-{os.getpid()}"
+    logger.info("Stream worker started", extra={"consumer": name})
+    StreamConsumer(get_stream_redis(), name).run(stop)
+    logger.info("Stream worker stopped", extra={"consumer": name})
+    stop_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
+from typing import Optional
+
 from app.core.enums import AuditAction
 from app.models.audit_log import AuditLog
 
 
-def log_audit(db, action: AuditAction, user_id: str, org_id: str):
+def log_audit(
+    db, action: AuditAction, user_id: str, org_id: str, details: Optional[dict] = None
+):
     audit_log = AuditLog(
         action=action,
         user_id=user_id,
         org_id=org_id,
+        details=details,
     )
     db.add(audit_log)
     db.commit()
@@ -0,0 +1,69 @@
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Iterable, Iterator, Sequence
+from uuid import UUID
+
+from app.core.config import settings
+
+
+def serialize_value(value):
+    """
+    Convert a column value into something JSON/CSV friendly.
+    """
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def iter_ndjson(rows: Iterable[Sequence], columns: Sequence[str]) -> Iterator[bytes]:
+    """
+    Encode rows as newline-delimited JSON, yielding buffered byte chunks.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        record = {col: serialize_value(val) for col, val in zip(columns, row)}
+        buffer.write(json.dumps(record, separators=(",", ":")))
+        buffer.write("\n")
+        if buffer.tell() >= settings.EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def iter_csv(rows: Iterable[Sequence], columns: Sequence[str]) -> Iterator[bytes]:
+    """
+    Encode rows as CSV with a header line, yielding buffered byte chunks.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([serialize_value(val) for val in row])
+        if buffer.tell() >= settings.EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Gzip a stream of byte chunks incrementally, without buffering the whole body.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
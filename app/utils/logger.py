@@ -1,9 +1,216 @@
+import atexit
+import contextvars
+import json
 import logging
+import queue
+import random
+import sys
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
 
 from app.core.config import settings
 
+_log_context: contextvars.ContextVar[Dict[str, object]] = contextvars.ContextVar(
+    "log_context", default={}
+)
+_listener: Optional[QueueListener] = None
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`.
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "context",
+    "trace_id",
+    "span_id",
+    "correlation_id",
+}
+
 
 def get_logger(name: str = "rayda-app") -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(settings.LOG_LEVEL)
     return logger
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Attach structured fields (event_id, org_id, service, ...) to every record
+    logged in this context, including from the functions it calls.
+    """
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record: timestamp, level, logger, message, trace and
+    correlation ids, the active log_context and any `extra=` fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("trace_id", "correlation_id"):
+            value = getattr(record, key, "-")
+            if value != "-":
+                entry[key] = value
+        entry.update(getattr(record, "context", {}))
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    LOG_FORMAT, followed by the structured fields as key=value pairs.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = dict(getattr(record, "context", {}))
+        fields.update(
+            (key, value)
+            for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRS
+        )
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of INFO-and-below records from chatty loggers.
+
+    LOG_SAMPLE_RATES maps a logger name (children included) to the fraction
+    kept, e.g. {"tasks": 0.1}. Warnings and errors are never sampled out.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, Optional[float]] = {}
+
+    def rate_for(self, name: str) -> Optional[float]:
+        if name not in self._resolved:
+            rate, candidate = None, name
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = rate
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self.rate_for(record.name)
+        return rate is None or random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without formatting them.
+
+    The stock `prepare()` formats the message on the calling thread, which is
+    exactly the cost this handler exists to move off hot paths; the queue is
+    in-process, so records can travel as-is. When the queue is full, records
+    are dropped rather than blocking the caller.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class StdoutHandler(logging.StreamHandler):
+    # Resolve sys.stdout on every write so redirected/captured stdout is honoured.
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def configure_logging():
+    """
+    Route all logging through a queue to a single stdout writer thread.
+
+    Safe to call again, e.g. in a forked worker child, where the parent's
+    listener thread no longer exists.
+    """
+    global _listener
+    if _listener is not None and _listener._thread is not None:
+        if _listener._thread.is_alive():
+            _listener.stop()
+    _listener = None
+
+    output = StdoutHandler()
+    if settings.LOG_JSON:
+        output.setFormatter(JsonFormatter(datefmt=settings.LOG_DATE_FORMAT))
+    else:
+        output.setFormatter(
+            TextFormatter(
+                settings.LOG_FORMAT,
+                datefmt=settings.LOG_DATE_FORMAT,
+                defaults={"trace_id": "-", "span_id": "-", "correlation_id": "-"},
+            )
+        )
+
+    records: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    handler = NonBlockingQueueHandler(records)
+    handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    _listener = QueueListener(records, output)
+    _listener.start()
+
+
+def stop_logging():
+    """
+    Flush queued records and stop the writer thread.
+    """
+    global _listener
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+    _listener = None
+
+
+def _install_log_record_factory():
+    base_factory = logging.getLogRecordFactory()
+
+    def factory(*args, **kwargs):
+        record = base_factory(*args, **kwargs)
+        record.context = _log_context.get()
+        return record
+
+    logging.setLogRecordFactory(factory)
+
+
+_install_log_record_factory()
+atexit.register(stop_logging)
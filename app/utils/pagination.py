@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import literal, tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque cursor string.
+    """
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(row_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(raw["t"]), UUID(raw["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+
+
+def paginate_keyset(
+    query: Query, created_col, id_col, cursor: Optional[str], limit: int
+):
+    """
+    Apply keyset (seek) pagination to a query, newest rows first.
+
+    Instead of OFFSET, the page starts strictly after the `(created_at, id)` pair
+    encoded in the cursor, so every page is a bounded index range scan no matter
+    how deep the client has paged. `id` breaks ties between rows created in the
+    same transaction.
+
+    Returns:
+        A tuple of (rows, next_cursor). `next_cursor` is None on the last page.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(created_col, id_col) < tuple_(literal(created_at), literal(row_id))
+        )
+
+    rows = query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, created_col.key), getattr(last, id_col.key)
+        )
+
+    return rows, next_cursor
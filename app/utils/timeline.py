@@ -0,0 +1,86 @@
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Task headers stamped by the webhook routes (epoch seconds).
+RECEIVED_AT_HEADER = "received_at"
+ENQUEUED_AT_HEADER = "enqueued_at"
+
+# Stage durations stored positionally in WebhookLog.stage_ms (1-based in SQL).
+STAGES = ("ingest", "queue", "external", "persist")
+
+_STAGE_BOUNDS = (
+    ("received", "enqueued"),
+    ("enqueued", "started"),
+    ("started", "external_done"),
+    ("external_done", "committed"),
+)
+
+
+def task_header(request, name: str):
+    """
+    Read a custom header from a Celery task request.
+
+    Workers expose custom headers as request attributes; eager `apply()` keeps
+    them under `request.headers`.
+    """
+    value = getattr(request, name, None)
+    if value is None:
+        value = (getattr(request, "headers", None) or {}).get(name)
+    return value
+
+
+class EventTimeline:
+    """
+    Wall-clock marks for one event as it moves from the API through the worker.
+
+    The API's `received` and `enqueued` marks arrive as task headers; the worker
+    adds `started`, `external_done` and `committed`. Nothing is queried: the
+    durations are computed in memory and written with the event's log row.
+    """
+
+    def __init__(
+        self, received_at: Optional[float] = None, enqueued_at: Optional[float] = None
+    ):
+        self.marks: Dict[str, Optional[float]] = {
+            "received": received_at,
+            "enqueued": enqueued_at,
+            "started": time.time(),
+        }
+
+    @classmethod
+    def from_request(cls, request) -> "EventTimeline":
+        def header(name: str) -> Optional[float]:
+            value = task_header(request, name)
+            return float(value) if value is not None else None
+
+        return cls(header(RECEIVED_AT_HEADER), header(ENQUEUED_AT_HEADER))
+
+    def mark(self, name: str):
+        self.marks[name] = time.time()
+
+    @property
+    def received_at(self) -> Optional[datetime]:
+        received = self.marks["received"]
+        if received is None:
+            return None
+        return datetime.fromtimestamp(received, tz=timezone.utc)
+
+    def stage_ms(self) -> List[Optional[int]]:
+        """
+        Milliseconds spent in each of STAGES; None where a mark is missing.
+
+        Events without an external call (communication) have no `external`
+        duration, and `persist` is then measured from `started`.
+        """
+        marks = self.marks
+        durations = []
+        for start, end in _STAGE_BOUNDS:
+            if start == "external_done" and marks.get(start) is None:
+                start = "started"
+            begin, finish = marks.get(start), marks.get(end)
+            if begin is None or finish is None:
+                durations.append(None)
+            else:
+                durations.append(max(0, round((finish - begin) * 1000)))
+        return durations
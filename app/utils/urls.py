@@ -0,0 +1,48 @@
+import ipaddress
+import socket
+from typing import List
+from urllib.parse import urlsplit
+
+
+def resolve(host: str, port: int) -> List[str]:
+    """
+    Every address a host name resolves to.
+    """
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [sockaddr[0] for *_, sockaddr in infos]
+
+
+def is_public_address(address: str) -> bool:
+    """
+    False for private, loopback, link-local (cloud metadata), reserved and
+    other addresses that are not globally routable.
+    """
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def check_public_url(url: str):
+    """
+    Check that a tenant-supplied URL is https and points only at public
+    addresses, so deliveries cannot reach internal services.
+
+    Resolves the host, so call it off the event loop.
+
+    Raises:
+        ValueError: Naming what is wrong with the URL.
+    """
+    parts = urlsplit(url)
+    if parts.scheme != "https":
+        raise ValueError("URL must use https")
+    if not parts.hostname:
+        raise ValueError("URL has no host")
+    try:
+        addresses = resolve(parts.hostname, parts.port or 443)
+    except (socket.gaierror, UnicodeError):
+        raise ValueError(f"Host {parts.hostname} cannot be resolved")
+    if not all(is_public_address(address) for address in addresses):
+        raise ValueError(
+            "URL must not point at a private, loopback or link-local address"
+        )
@@ -1,6 +1,15 @@
+import os
+
 from celery import Celery
+from celery.signals import (
+    setup_logging,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
 
 from app.core.config import settings
+from app.core.serialization import ACCEPTED_SERIALIZERS, task_serializer
 
 celery_app = Celery(
     "integration_worker",
@@ -9,13 +18,98 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    task_routes={"app.services.tasks.*": {"queue": "integration_queue"}},
-    task_serializer="json",
+    task_routes={
+        "app.services.tasks.*": {"queue": "integration_queue"},
+        # Long-running admin work, on its own workers
+        "app.services.jobs.*": {"queue": "admin_queue"},
+        "app.services.reconciliation.*": {"queue": "admin_queue"},
+    },
+    task_serializer=task_serializer(),
     result_serializer="json",
-    accept_content=["json"],
-    task_track_started=True,
+    accept_content=ACCEPTED_SERIALIZERS,
+    # Outcomes live in webhook_logs and metrics; nothing reads task results.
+    task_ignore_result=settings.CELERY_IGNORE_RESULTS,
+    task_track_started=settings.CELERY_TRACK_STARTED,
     task_acks_late=True,
     worker_prefetch_multiplier=1,
+    # Active only with --autoscale=max,min
+    worker_autoscaler="app.services.autoscaling:EventAutoscaler",
+    # Run with `celery -A app.worker.celery_app beat`
+    beat_schedule={
+        name: {"task": task, "schedule": interval}
+        for name, task, interval in (
+            (
+                "reconcile-users",
+                "app.services.reconciliation.reconcile_users",
+                settings.RECONCILE_INTERVAL_SECONDS,
+            ),
+            (
+                "sync-user-changes",
+                "app.services.reconciliation.sync_user_changes",
+                settings.INCREMENTAL_SYNC_INTERVAL_SECONDS,
+            ),
+            (
+                "expire-parked-events",
+                "app.services.tasks.expire_parked_events",
+                settings.PARKING_SWEEP_INTERVAL_SECONDS,
+            ),
+            (
+                "resume-stalled-jobs",
+                "app.services.jobs.resume_stalled_jobs",
+                settings.JOB_SWEEP_INTERVAL_SECONDS,
+            ),
+        )
+        if interval
+    },
 )
 
-from app.services import tasks
+
+@setup_logging.connect
+@worker_process_init.connect
+def configure_worker_logging(**kwargs):
+    """
+    Use the app's queued JSON logging instead of Celery's handlers.
+
+    Connecting `setup_logging` stops Celery from configuring the root logger.
+    Prefork children re-run it because the parent's writer thread does not
+    survive the fork.
+    """
+    from app.utils.logger import configure_logging
+
+    configure_logging()
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    """
+    Serve the worker's Prometheus metrics from the parent process.
+
+    Prefork children each write samples under PROMETHEUS_MULTIPROC_DIR; the
+    parent's exporter aggregates them at scrape time. The directory must be
+    emptied before the worker starts.
+    """
+    if not settings.WORKER_METRICS_PORT:
+        return
+    from prometheus_client import start_http_server
+
+    from app.core.metrics import metrics_registry
+
+    start_http_server(settings.WORKER_METRICS_PORT, registry=metrics_registry())
+
+
+@worker_init.connect
+def configure_tracing(**kwargs):
+    from app.core.tracing import tracer
+
+    tracer.exporter.service_name = f"{settings.TRACE_SERVICE_NAME}-worker"
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+from app.services import jobs, reconciliation, tasks
@@ -0,0 +1,96 @@
+"""
+Benchmark: Redis commands per event, with and without Celery task results.
+
+Starts an in-process worker (solo pool) on `integration_queue`, publishes
+`--events` events and waits until all of them ran, once with the old settings
+(results stored, STARTED tracked) and once with the defaults (results ignored).
+The event body is a no-op, so the counts are Celery's own traffic: publishes,
+fetches, acks and result-backend writes.
+
+Reports Redis commands per event (from INFO commandstats, reset before each
+run) and result keys left behind in the backend database.
+
+Needs a Redis server. The broker and backend use databases 15 and 14 of
+`--redis-url`, which are FLUSHED before and after each run.
+
+Usage:
+    python -m benchmarks.bench_celery_redis_ops [--events 2000]
+        [--redis-url redis://localhost:6379]
+"""
+
+import argparse
+import os
+import threading
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")
+
+import redis
+from celery.contrib.testing.worker import start_worker
+
+from app.core.enums import ServiceType
+from app.services.tasks import process_event
+from app.worker import celery_app
+from tests.data.sample_webhook_events import user_event
+
+
+def command_calls(client: redis.Redis) -> int:
+    return sum(stat["calls"] for stat in client.info("commandstats").values())
+
+
+def run(broker: redis.Redis, backend: redis.Redis, events: int, ignore: bool):
+    process_event.ignore_result = ignore
+    process_event.track_started = not ignore
+    broker.flushdb()
+    backend.flushdb()
+
+    done = threading.Semaphore(0)
+    with (
+        patch("app.services.tasks.run_event", side_effect=lambda *_: done.release()),
+        start_worker(
+            celery_app,
+            pool="solo",
+            perform_ping_check=False,
+            queues=["integration_queue"],
+        ),
+    ):
+        broker.config_resetstat()
+        start = time.perf_counter()
+        for _ in range(events):
+            process_event.apply_async(
+                (user_event, ServiceType.USER.value), queue="integration_queue"
+            )
+        for _ in range(events):
+            done.acquire()
+        elapsed = time.perf_counter() - start
+        # Let the last SUCCESS write land before counting.
+        time.sleep(0.5)
+        calls = command_calls(broker)
+    return calls / events, backend.dbsize(), events / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    args = parser.parse_args()
+
+    broker_url, backend_url = f"{args.redis_url}/15", f"{args.redis_url}/14"
+    celery_app.conf.broker_url = broker_url
+    celery_app.conf.result_backend = backend_url
+    broker = redis.Redis.from_url(broker_url)
+    backend = redis.Redis.from_url(backend_url)
+
+    print(f"{'results':<10}{'cmds/event':>12}{'result keys':>13}{'events/s':>10}")
+    try:
+        for label, ignore in (("stored", False), ("ignored", True)):
+            per_event, keys, rate = run(broker, backend, args.events, ignore)
+            print(f"{label:<10}{per_event:>12.1f}{keys:>13}{rate:>10.0f}")
+    finally:
+        broker.flushdb()
+        backend.flushdb()
+
+
+if __name__ == "__main__":
+    main()
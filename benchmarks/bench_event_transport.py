@@ -0,0 +1,119 @@
+"""
+Benchmark: event transport throughput, Celery messages vs Redis Streams.
+
+Publishes `--events` user events the way the webhook routes do, then drains
+them the way each worker does:
+
+- celery: `process_event.apply_async` per event; a kombu consumer with
+  prefetch 1 and one ack per message (the worker's acks_late settings).
+- streams: one XADD per event; XREADGROUP batches of STREAM_BATCH_SIZE with
+  one XACK per batch, through `StreamConsumer.process`.
+
+Event handling is a no-op, so the numbers are transport overhead only. Reports
+publish and consume events/second and bytes stored per event.
+
+Needs a Redis server. Everything runs in `--redis-url`, which is FLUSHED before
+and after the run; the default is database 15.
+
+Usage:
+    python -m benchmarks.bench_event_transport [--events 5000]
+        [--redis-url redis://localhost:6379/15]
+"""
+
+import argparse
+import os
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")
+
+import redis
+from kombu import Exchange, Queue
+
+from app.core.config import settings
+from app.core.enums import ServiceType
+from app.services.event_streams import StreamConsumer, publish_event, stream_key
+from app.services.tasks import process_event
+from app.utils.timeline import ENQUEUED_AT_HEADER, RECEIVED_AT_HEADER
+from app.worker import celery_app
+from tests.data.sample_webhook_events import user_event
+
+BENCH_QUEUE = "bench_integration_queue"
+
+
+def headers() -> dict:
+    now = time.time()
+    return {RECEIVED_AT_HEADER: now, ENQUEUED_AT_HEADER: now}
+
+
+def run_celery(client: redis.Redis, events: int):
+    start = time.perf_counter()
+    for _ in range(events):
+        process_event.apply_async(
+            (user_event, ServiceType.USER.value), queue=BENCH_QUEUE, headers=headers()
+        )
+    published = time.perf_counter() - start
+    size = len(client.lindex(BENCH_QUEUE, 0))
+
+    received = 0
+
+    def on_message(body, message):
+        nonlocal received
+        message.ack()
+        received += 1
+
+    queue = Queue(BENCH_QUEUE, Exchange(BENCH_QUEUE), routing_key=BENCH_QUEUE)
+    start = time.perf_counter()
+    with celery_app.connection_for_read() as conn:
+        with conn.Consumer(
+            queue, callbacks=[on_message], prefetch_count=1, accept=["json"]
+        ):
+            while received < events:
+                conn.drain_events(timeout=10)
+    consumed = time.perf_counter() - start
+    return events / published, events / consumed, size
+
+
+def run_streams(client: redis.Redis, events: int):
+    start = time.perf_counter()
+    for _ in range(events):
+        publish_event(client, user_event, ServiceType.USER, headers())
+    published = time.perf_counter() - start
+    key = stream_key(ServiceType.USER)
+    size = client.memory_usage(key) // events
+
+    consumer = StreamConsumer(client, "bench", [ServiceType.USER])
+    consumer.ensure_groups()
+    received = 0
+    start = time.perf_counter()
+    with patch.object(consumer, "handle", return_value=True):
+        while received < events:
+            for batch_key, messages in consumer.read():
+                received += len(consumer.process(batch_key, messages))
+    consumed = time.perf_counter() - start
+    return events / published, events / consumed, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    args = parser.parse_args()
+
+    celery_app.conf.broker_url = args.redis_url
+    client = redis.Redis.from_url(args.redis_url)
+    client.flushdb()
+
+    print(f"{'transport':<10}{'publish/s':>12}{'consume/s':>12}{'bytes/event':>14}")
+    try:
+        for name, run in (("celery", run_celery), ("streams", run_streams)):
+            publish_rate, consume_rate, size = run(client, args.events)
+            print(f"{name:<10}{publish_rate:>12.0f}{consume_rate:>12.0f}{size:>14}")
+            client.flushdb()
+    finally:
+        client.flushdb()
+    print(f"(streams consume batch size: {settings.STREAM_BATCH_SIZE})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: prefork vs threads vs asyncio on the same I/O-bound event workload.
+
+Every event runs the real `handle_event` steps for a user event. The external
+call is the mock with EXTERNAL_MOCK_LATENCY_MS of simulated round trip
+(`--external-ms`). The three Postgres steps (duplicate check, local sync, log
+write) are replaced by `--db-ms` sleeps each, standing in for a blocking
+driver. Then:
+
+- prefork: a pool of `--processes` forked processes, one event per process
+  at a time (Celery's default pool).
+- threads: `--threads` threads, one event per thread (`celery -P threads`).
+- asyncio: one process and `AsyncEventRunner` with up to `--tasks` events in
+  flight; external calls are awaited and the Postgres steps share
+  `--db-threads` threads (`python -m app.async_worker`).
+
+Reports events/second for each. No Redis or Postgres is needed.
+
+Usage:
+    python -m benchmarks.bench_execution_modes [--events 2000]
+        [--external-ms 50] [--db-ms 2] [--processes 8] [--threads 64]
+        [--tasks 200] [--db-threads 10]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.core.config import settings
+from app.core.enums import ServiceType
+from app.services import tasks
+from app.services.async_events import AsyncEventRunner
+from app.utils.timeline import EventTimeline
+from tests.data.sample_webhook_events import user_event
+
+DB_MS = 0.0
+
+
+def db_step(result=None):
+    def step(*args, **kwargs):
+        time.sleep(DB_MS / 1000)
+        return result
+
+    return step
+
+
+def simulated_database() -> ExitStack:
+    stack = ExitStack()
+    stack.enter_context(patch.object(tasks, "SessionLocal", return_value=MagicMock()))
+    stack.enter_context(patch.object(tasks, "check_if_event_processed", db_step(False)))
+    stack.enter_context(patch.object(tasks, "sync_user", db_step()))
+    stack.enter_context(patch.object(tasks, "create_webhook_log", db_step()))
+    return stack
+
+
+def events(count: int):
+    return [{**user_event, "event_id": f"evt_bench_{i}"} for i in range(count)]
+
+
+def run_one(event: dict):
+    parsed_event, service_enum = tasks.parse_event(event, ServiceType.USER.value)
+    tasks.handle_event(
+        MagicMock(), event, parsed_event, service_enum, EventTimeline(None, None)
+    )
+
+
+def run_prefork(batch, processes: int) -> float:
+    context = multiprocessing.get_context("fork")
+    with context.Pool(processes) as pool:
+        start = time.perf_counter()
+        pool.map(run_one, batch, chunksize=1)
+        return time.perf_counter() - start
+
+
+def run_threads(batch, threads: int) -> float:
+    with ThreadPoolExecutor(threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(run_one, batch))
+        return time.perf_counter() - start
+
+
+async def run_asyncio(batch, in_flight: int, db_threads: int) -> float:
+    runner = AsyncEventRunner(max_concurrency=in_flight, db_threads=db_threads)
+
+    async def run(event):
+        async with runner.slots:
+            parsed_event, service_enum = tasks.parse_event(
+                event, ServiceType.USER.value
+            )
+            await runner.handle_event(
+                event, parsed_event, service_enum, EventTimeline(None, None)
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(event) for event in batch))
+    elapsed = time.perf_counter() - start
+    runner.close()
+    return elapsed
+
+
+def main():
+    global DB_MS
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--external-ms", type=int, default=50)
+    parser.add_argument("--db-ms", type=float, default=2)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--db-threads", type=int, default=10)
+    args = parser.parse_args()
+
+    DB_MS = args.db_ms
+    settings.EXTERNAL_MOCK_LATENCY_MS = args.external_ms
+    batch = events(args.events)
+
+    print(f"{'mode':<10}{'workers':>16}{'events/s':>12}")
+    with simulated_database():
+        for name, workers, run in (
+            (
+                "prefork",
+                f"{args.processes} procs",
+                lambda: run_prefork(batch, args.processes),
+            ),
+            (
+                "threads",
+                f"{args.threads} threads",
+                lambda: run_threads(batch, args.threads),
+            ),
+            (
+                "asyncio",
+                f"{args.tasks} tasks",
+                lambda: asyncio.run(run_asyncio(batch, args.tasks, args.db_threads)),
+            ),
+        ):
+            elapsed = run()
+            print(f"{name:<10}{workers:>16}{args.events / elapsed:>12.0f}")
+    print(
+        f"(external call {args.external_ms}ms, 3 Postgres steps of {args.db_ms}ms, "
+        f"asyncio on {args.db_threads} DB threads)"
+    )
+
+
+if __name__ == "__main__":
+    main()
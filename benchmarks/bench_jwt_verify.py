@@ -0,0 +1,77 @@
+"""
+Microbenchmark: access-token verification cost per request.
+
+Compares HS256 and RS256 verification with and without the verification cache,
+using the same code path as `get_current_user` (`app.core.tokens.decode_token`).
+
+Usage:
+    python -m benchmarks.bench_jwt_verify [--iterations 5000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.core.config import settings
+from app.core.tokens import (
+    decode_token,
+    encode_token,
+    get_key_ring,
+    verification_cache,
+)
+
+
+def configure(algorithm: str, key_dir: Path, cached: bool):
+    settings.JWT_ALGORITHM = algorithm
+    settings.JWT_PRIVATE_KEYS_DIR = str(key_dir)
+    settings.JWT_ACTIVE_KID = "bench"
+    settings.JWT_VERIFY_CACHE_ENABLED = cached
+    get_key_ring.cache_clear()
+    verification_cache.clear()
+
+
+def run(iterations: int) -> float:
+    token = encode_token(
+        {"sub": "bench", "exp": datetime.now(timezone.utc) + timedelta(hours=1)}
+    )
+    decode_token(token)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode_token(token)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        key_dir = Path(tmp)
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        (key_dir / "bench.pem").write_bytes(
+            private_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+
+        print(f"{'algorithm':<10}{'cache':<8}{'us/verify':>12}")
+        for algorithm in ("HS256", "RS256"):
+            for cached in (False, True):
+                configure(algorithm, key_dir, cached)
+                per_op = run(args.iterations)
+                print(f"{algorithm:<10}{str(cached):<8}{per_op:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
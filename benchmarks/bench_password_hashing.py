@@ -0,0 +1,79 @@
+"""
+Benchmark: login throughput with inline vs process-pool password hashing.
+
+Simulates a login burst on the API threadpool (`--threads` concurrent logins)
+while a probe thread runs a small pure-Python "other route" workload. Reports
+logins/second and the probe's p95 latency, i.e. how much the burst slows down
+unrelated requests.
+
+Usage:
+    python -m benchmarks.bench_password_hashing [--logins 64] [--threads 40]
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")
+
+from app.core.config import settings
+from app.core.hashing import PasswordHasher, hash_password
+
+
+def probe(stop: threading.Event, samples: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        sum(i * i for i in range(20_000))
+        samples.append(time.perf_counter() - start)
+        time.sleep(0.005)
+
+
+def run(workers: int, logins: int, threads: int, hashed: str):
+    settings.PASSWORD_HASH_WORKERS = workers
+    settings.PASSWORD_HASH_MAX_PENDING = logins
+    hasher = PasswordHasher()
+    hasher.verify_and_update("warmup", hashed)
+
+    stop = threading.Event()
+    samples: list = []
+    probe_thread = threading.Thread(target=probe, args=(stop, samples))
+    probe_thread.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(
+            pool.map(
+                lambda _: hasher.verify_and_update("Secret123!", hashed),
+                range(logins),
+            )
+        )
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    probe_thread.join()
+    hasher.shutdown()
+
+    p95 = statistics.quantiles(samples, n=20)[-1] * 1000 if len(samples) > 1 else 0
+    return logins / elapsed, p95
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    hashed = hash_password("Secret123!")
+    print(f"bcrypt rounds={settings.BCRYPT_ROUNDS}, logins={args.logins}")
+    print(f"{'mode':<16}{'logins/s':>10}{'probe p95 ms':>14}")
+    for label, workers in (("inline", 0), (f"pool({args.workers})", args.workers)):
+        rate, p95 = run(workers, args.logins, args.threads, hashed)
+        print(f"{label:<16}{rate:>10.1f}{p95:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,8 @@
+import os
+
+# Rate limit budgets in process memory, reset before each test
+os.environ["RATE_LIMIT_STORAGE_URI"] = "memory://"
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
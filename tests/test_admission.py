@@ -0,0 +1,159 @@
+"""
+Admission Control Tests
+
+This suite focuses on queue-depth-aware load shedding on the webhook endpoints.
+
+Coverage Summary:
+- Requests are admitted while the broker is below its watermarks.
+- Soft watermarks (queue depth, oldest-message lag) return 429 with Retry-After.
+- Hard watermarks (queue depth, broker memory) return 503 with Retry-After.
+- Per-service overrides let one service keep flowing while others are shed; unknown services or watermarks are rejected when settings load.
+- The controller fails open when the broker cannot be sampled, and waits before sampling again.
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import status
+from pydantic import ValidationError
+from redis.exceptions import ConnectionError
+
+from app.core.admission import BrokerSnapshot, admission_controller, sample_broker
+from app.core.config import Settings, settings
+from app.core.enums import ServiceType
+from tests.data.sample_webhook_events import payment_event, user_event
+
+
+def broker_state(depth=0, lag_seconds=0.0, memory_ratio=None):
+    snapshot = BrokerSnapshot(
+        depth=depth,
+        lag_seconds=lag_seconds,
+        memory_ratio=memory_ratio,
+        sampled_at=time.time(),
+    )
+    with patch.object(admission_controller, "_sampler", return_value=snapshot):
+        admission_controller.refresh()
+
+
+@pytest.fixture(autouse=True)
+def reset_admission():
+    yield
+    admission_controller.reset()
+
+
+@pytest.mark.asyncio
+async def test_admits_below_watermarks(client):
+    broker_state(depth=settings.ADMISSION_QUEUE_SOFT_LIMIT - 1, memory_ratio=0.5)
+
+    with patch("app.services.tasks.process_event.apply_async") as mocked_apply:
+        resp = await client.post("/webhooks/user-service", json=user_event)
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        assert "enqueued_at" in mocked_apply.call_args.kwargs["headers"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "state, expected",
+    [
+        (
+            {"depth": settings.ADMISSION_QUEUE_SOFT_LIMIT},
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        ),
+        (
+            {"lag_seconds": settings.ADMISSION_MAX_LAG_SECONDS + 1},
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        ),
+        (
+            {"depth": settings.ADMISSION_QUEUE_HARD_LIMIT},
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+        ),
+        ({"memory_ratio": 0.95}, status.HTTP_503_SERVICE_UNAVAILABLE),
+    ],
+)
+async def test_sheds_above_watermarks(client, state, expected):
+    broker_state(**state)
+
+    with patch("app.services.tasks.process_event.apply_async") as mocked_apply:
+        resp = await client.post("/webhooks/user-service", json=user_event)
+        assert resp.status_code == expected
+        assert resp.headers["retry-after"] == str(
+            settings.ADMISSION_RETRY_AFTER_SECONDS
+        )
+        mocked_apply.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_per_service_watermarks(client):
+    overrides = {"payment_service": {"queue_soft": 1_000_000, "queue_hard": 2_000_000}}
+    broker_state(depth=settings.ADMISSION_QUEUE_SOFT_LIMIT)
+
+    with patch.object(settings, "ADMISSION_WATERMARK_OVERRIDES", overrides), patch(
+        "app.services.tasks.process_event.apply_async"
+    ):
+        resp = await client.post("/webhooks/user-service", json=user_event)
+        assert resp.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        resp = await client.post("/webhooks/payment-service", json=payment_event)
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"payment_service": {"queue_sfot": 1_000_000}},
+        {"payments": {"queue_soft": 1_000_000}},
+        {"payment_service": {"queue_soft": "lots"}},
+    ],
+)
+def test_invalid_watermark_overrides_are_rejected(overrides):
+    with pytest.raises(ValidationError):
+        Settings(ADMISSION_WATERMARK_OVERRIDES=overrides)
+    Settings(ADMISSION_WATERMARK_OVERRIDES={"payment_service": {"queue_soft": 1}})
+
+
+@pytest.mark.asyncio
+async def test_fails_open_when_broker_unavailable(client):
+    broker_state(depth=settings.ADMISSION_QUEUE_HARD_LIMIT)
+    with patch.object(
+        admission_controller, "_sampler", side_effect=ConnectionError("down")
+    ):
+        admission_controller.refresh()
+
+    with patch("app.services.tasks.process_event.apply_async"):
+        resp = await client.post("/webhooks/user-service", json=user_event)
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+
+
+def test_unexpected_sampling_error_waits_before_retrying():
+    with patch.object(
+        admission_controller, "_sampler", side_effect=KeyError("used_memory")
+    ) as sampler:
+        admission_controller.refresh()
+        admission_controller.check(ServiceType.USER)
+
+    assert admission_controller.snapshot is None
+    assert sampler.call_count == 1
+
+
+def test_sample_broker_reads_oldest_message_age():
+    class FakePipeline:
+        def __init__(self):
+            self.calls = []
+
+        def __getattr__(self, name):
+            return lambda *args: self.calls.append(name)
+
+        def execute(self):
+            oldest = json.dumps({"headers": {"enqueued_at": time.time() - 42}})
+            return [7, oldest, {"used_memory": 50, "maxmemory": 100}]
+
+    class FakeRedis:
+        def pipeline(self, transaction=True):
+            return FakePipeline()
+
+    snapshot = sample_broker(FakeRedis())
+    assert snapshot.depth == 7
+    assert 41 <= snapshot.lag_seconds < 44
+    assert snapshot.memory_ratio == 0.5
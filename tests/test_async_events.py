@@ -0,0 +1,99 @@
+"""
+Asyncio Execution Mode Tests
+
+This suite focuses on the asyncio worker for the Redis Streams transport.
+
+Coverage Summary:
+- Entries run through the async external client and the sync local services, and are acknowledged in one XACK.
+- Per-service semaphores cap concurrent external calls while other entries keep flowing.
+- Failed entries stay pending for XAUTOCLAIM, as with the sync consumer.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.enums import ServiceType, WebhookStatus
+from app.services.async_events import AsyncEventRunner, AsyncStreamConsumer
+from app.services.event_streams import publish_event, stream_key
+from tests.data.sample_webhook_events import user_event
+from tests.test_event_streams import FakeStreams, user_success
+
+
+@pytest.fixture
+def streams():
+    return FakeStreams()
+
+
+@pytest.fixture
+def patched_services():
+    with (
+        patch("app.services.tasks.SessionLocal", return_value=MagicMock()),
+        patch("app.services.tasks.check_if_event_processed", return_value=False),
+        patch("app.services.tasks.sync_user") as mocked_sync_user,
+        patch("app.services.tasks.create_webhook_log") as mocked_log,
+    ):
+        yield mocked_sync_user, mocked_log
+
+
+async def consume(consumer: AsyncStreamConsumer):
+    await asyncio.to_thread(consumer.streams.ensure_groups)
+    await consumer.poll()
+    await consumer.drain()
+    consumer.runner.close()
+
+
+@pytest.mark.asyncio
+async def test_async_consumer_syncs_and_acks(streams, patched_services):
+    mocked_sync_user, mocked_log = patched_services
+    publish_event(streams, user_event, ServiceType.USER, {"enqueued_at": 1.0})
+
+    with patch(
+        "app.services.async_events.process_user_async",
+        AsyncMock(return_value=user_success()),
+    ):
+        await consume(AsyncStreamConsumer(streams, "test-async"))
+
+    mocked_sync_user.assert_called_once()
+    assert mocked_log.call_args.kwargs["status"] == WebhookStatus.processed
+    assert mocked_log.call_args.kwargs["stage_ms"][2] is not None
+    assert streams.pending[stream_key(ServiceType.USER)] == {}
+
+
+@pytest.mark.asyncio
+async def test_service_semaphore_caps_external_calls(streams, patched_services):
+    for i in range(10):
+        publish_event(
+            streams, {**user_event, "event_id": f"evt_async_{i}"}, ServiceType.USER, {}
+        )
+    calls = {"current": 0, "peak": 0}
+
+    async def slow_external_call(data):
+        calls["current"] += 1
+        calls["peak"] = max(calls["peak"], calls["current"])
+        await asyncio.sleep(0.01)
+        calls["current"] -= 1
+        return user_success()
+
+    runner = AsyncEventRunner(max_concurrency=50, service_limits={"user_service": 2})
+    with patch("app.services.async_events.process_user_async", slow_external_call):
+        await consume(AsyncStreamConsumer(streams, "test-async", runner=runner))
+
+    assert calls["peak"] == 2
+    assert patched_services[0].call_count == 10
+    assert streams.pending[stream_key(ServiceType.USER)] == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_entry_stays_pending(streams, patched_services):
+    publish_event(streams, user_event, ServiceType.USER, {})
+
+    with patch(
+        "app.services.async_events.process_user_async",
+        AsyncMock(side_effect=Exception("down")),
+    ):
+        await consume(AsyncStreamConsumer(streams, "test-async"))
+
+    patched_services[1].assert_not_called()
+    assert list(streams.pending[stream_key(ServiceType.USER)].values()) == [1]
@@ -1,4 +1,17 @@
+from unittest.mock import patch
+
 import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.enums import UserRole
+from app.core.hashing import HashingBusyError
+from app.core.principal import invalidate_principal
+from app.core.tokens import KeyRing, get_key_ring, verification_cache
+from app.models.user import User
 
 
 @pytest.mark.asyncio
@@ -13,3 +26,175 @@ async def test_superadmin_login(client, superadmin_user):
     assert resp.status_code == 200
     data = resp.json()
     assert "access_token" in data
+
+
+@pytest.mark.asyncio
+async def test_principal_cache_skips_user_lookup(client, initial_admin_user):
+    login_resp = await client.post(
+        "/users/login",
+        data={
+            "username": settings.INITIAL_ADMIN_EMAIL,
+            "password": settings.INITIAL_ADMIN_PASSWORD,
+        },
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+    resp = await client.get("/users/me", headers=headers)
+    assert resp.status_code == 200
+
+    with patch("app.core.auth.load_principal") as mocked_load:
+        resp = await client.get("/users/me", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["email"] == settings.INITIAL_ADMIN_EMAIL
+        mocked_load.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_invalidated_principal_reflects_role_change(
+    client, db_session, initial_admin_user
+):
+    login_resp = await client.post(
+        "/users/login",
+        data={
+            "username": settings.INITIAL_ADMIN_EMAIL,
+            "password": settings.INITIAL_ADMIN_PASSWORD,
+        },
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+    assert (await client.get("/users/me", headers=headers)).json()["role"] == "admin"
+
+    initial_admin_user.role = UserRole.user
+    db_session.commit()
+    invalidate_principal(initial_admin_user.id)
+
+    assert (await client.get("/users/me", headers=headers)).json()["role"] == "user"
+
+
+@pytest.mark.asyncio
+async def test_claims_in_token_need_no_lookup(client, monkeypatch, initial_admin_user):
+    monkeypatch.setattr(settings, "PRINCIPAL_CLAIMS_IN_TOKEN", True)
+    login_resp = await client.post(
+        "/users/login",
+        data={
+            "username": settings.INITIAL_ADMIN_EMAIL,
+            "password": settings.INITIAL_ADMIN_PASSWORD,
+        },
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+    with patch("app.core.auth.load_principal") as mocked_load:
+        resp = await client.get("/users/me", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["id"] == str(initial_admin_user.id)
+        mocked_load.assert_not_called()
+
+
+@pytest.fixture()
+def rsa_key_dir(tmp_path, monkeypatch):
+    for kid in ("key-2025", "key-2026"):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        (tmp_path / f"{kid}.pem").write_bytes(
+            private_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+    monkeypatch.setattr(settings, "JWT_ALGORITHM", "RS256")
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEYS_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "JWT_ACTIVE_KID", "key-2025")
+    get_key_ring.cache_clear()
+    verification_cache.clear()
+    yield tmp_path
+    get_key_ring.cache_clear()
+    verification_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_rs256_key_rotation_and_jwks(
+    client, monkeypatch, rsa_key_dir, initial_admin_user
+):
+    credentials = {
+        "username": settings.INITIAL_ADMIN_EMAIL,
+        "password": settings.INITIAL_ADMIN_PASSWORD,
+    }
+    old_token = (await client.post("/users/login", data=credentials)).json()[
+        "access_token"
+    ]
+    assert jwt.get_unverified_header(old_token)["kid"] == "key-2025"
+
+    monkeypatch.setattr(settings, "JWT_ACTIVE_KID", "key-2026")
+    get_key_ring.cache_clear()
+    verification_cache.clear()
+
+    new_token = (await client.post("/users/login", data=credentials)).json()[
+        "access_token"
+    ]
+    assert jwt.get_unverified_header(new_token)["kid"] == "key-2026"
+
+    for token in (old_token, new_token):
+        resp = await client.get(
+            "/users/me", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert resp.status_code == 200
+
+    jwks = (await client.get("/.well-known/jwks.json")).json()
+    assert {key["kid"] for key in jwks["keys"]} == {"key-2025", "key-2026"}
+    assert all("d" not in key for key in jwks["keys"])
+
+
+@pytest.mark.asyncio
+async def test_verified_tokens_are_cached(client, initial_admin_user):
+    login_resp = await client.post(
+        "/users/login",
+        data={
+            "username": settings.INITIAL_ADMIN_EMAIL,
+            "password": settings.INITIAL_ADMIN_PASSWORD,
+        },
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+    assert (await client.get("/users/me", headers=headers)).status_code == 200
+
+    with patch.object(KeyRing, "verify") as mocked_verify:
+        assert (await client.get("/users/me", headers=headers)).status_code == 200
+        mocked_verify.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_weak_password_hash(client, db_session, test_org):
+    weak_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("Weak123!")
+    user = User(
+        email="weakhash@testorg.com",
+        hashed_password=weak_hash,
+        role=UserRole.user,
+        org_id=test_org.id,
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    resp = await client.post(
+        "/users/login",
+        data={"username": "weakhash@testorg.com", "password": "Weak123!"},
+    )
+    assert resp.status_code == 200
+
+    db_session.refresh(user)
+    assert user.hashed_password != weak_hash
+    assert f"${settings.BCRYPT_ROUNDS:02d}$" in user.hashed_password
+
+
+@pytest.mark.asyncio
+async def test_login_sheds_load_when_hash_pool_is_full(client, initial_admin_user):
+    with patch(
+        "app.core.auth.password_hasher.verify_and_update",
+        side_effect=HashingBusyError(),
+    ):
+        resp = await client.post(
+            "/users/login",
+            data={
+                "username": settings.INITIAL_ADMIN_EMAIL,
+                "password": settings.INITIAL_ADMIN_PASSWORD,
+            },
+        )
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
@@ -0,0 +1,141 @@
+"""
+Worker Autoscaling Tests
+
+This suite focuses on sizing the worker pool from backlog and dependency latency.
+
+Coverage Summary:
+- The pool grows to drain the backlog in the target time, in bounded steps, and shrinks when idle.
+- Slow Postgres or slow/failing external services make it shrink instead of grow.
+- Signals combine the broker snapshot with recent webhook_logs stage timings.
+- The Celery autoscaler applies one decision per sample and keeps its size when sampling fails.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.core.admission import BrokerSnapshot
+from app.core.config import settings
+from app.core.enums import ServiceType, WebhookStatus
+from app.models.webhooks import WebhookLog
+from app.services.autoscaling import (
+    EventAutoscaler,
+    ScalingSignals,
+    desired_concurrency,
+    sample_signals,
+)
+from app.services.webhook_log_helpers import create_webhook_log
+
+
+def signals(**overrides):
+    values = dict(
+        depth=0,
+        lag_seconds=0.0,
+        events=100,
+        failure_ratio=0.0,
+        task_p50_ms=200.0,
+        external_p95_ms=300.0,
+        persist_p95_ms=50.0,
+        db_probe_ms=1.0,
+    )
+    values.update(overrides)
+    return ScalingSignals(**values)
+
+
+class FakePool:
+    def __init__(self, processes):
+        self.num_processes = processes
+
+    def grow(self, n):
+        self.num_processes += n
+
+    def shrink(self, n):
+        self.num_processes -= n
+
+    def maintain_pool(self):
+        pass
+
+
+@pytest.mark.parametrize(
+    "current, state, expected",
+    [
+        # 1200 events * 0.2s / 60s = 4 processes
+        (2, {"depth": 1200}, (4, "queue")),
+        # Capped by AUTOSCALE_MAX_STEP, then by the maximum
+        (2, {"depth": 100_000}, (6, "queue")),
+        (14, {"depth": 100_000}, (16, "queue")),
+        # Old messages add a process even when the depth looks drainable
+        (4, {"depth": 10, "lag_seconds": 120}, (5, "queue")),
+        (8, {}, (2, "queue")),
+        (8, {"depth": 100_000, "db_probe_ms": 250}, (7, "postgres")),
+        (8, {"depth": 100_000, "persist_p95_ms": 2000}, (7, "postgres")),
+        (8, {"depth": 100_000, "external_p95_ms": 8000}, (7, "external")),
+        (8, {"depth": 100_000, "failure_ratio": 0.5}, (7, "external")),
+        (2, {"depth": 100_000, "db_probe_ms": 250}, (2, "postgres")),
+    ],
+)
+def test_desired_concurrency(current, state, expected):
+    assert desired_concurrency(current, signals(**state), 2, 16) == expected
+
+
+def test_sample_signals_reads_recent_stage_timings(db_session):
+    db_session.query(WebhookLog).delete()
+    db_session.commit()
+    for i in range(1, 11):
+        create_webhook_log(
+            db=db_session,
+            event_id=f"evt_autoscale_{i}",
+            service=ServiceType.USER,
+            org_id="org",
+            status=WebhookStatus.failed if i <= 2 else WebhookStatus.processed,
+            payload={},
+            stage_ms=[1, 5, i * 100, 10],
+        )
+    snapshot = BrokerSnapshot(
+        depth=42, lag_seconds=3.0, memory_ratio=None, sampled_at=time.time()
+    )
+
+    with patch("app.services.autoscaling.sample_broker", return_value=snapshot):
+        sampled = sample_signals(db_session, broker=None)
+
+    assert (sampled.depth, sampled.lag_seconds) == (42, 3.0)
+    assert sampled.events == 10
+    assert sampled.failure_ratio == pytest.approx(0.2)
+    assert sampled.task_p50_ms == pytest.approx(560)
+    assert sampled.external_p95_ms == pytest.approx(955)
+    assert sampled.persist_p95_ms == pytest.approx(10)
+    assert sampled.db_probe_ms >= 0
+
+
+def test_autoscaler_applies_one_decision_per_sample():
+    pool = FakePool(2)
+    scaler = EventAutoscaler(pool, 16, 2, keepalive=0.001)
+
+    with patch.object(scaler, "sample", return_value=signals(depth=1200)):
+        scaler.refresh()
+    scaler.maybe_scale()
+    assert pool.num_processes == 4
+    scaler.maybe_scale()
+    assert pool.num_processes == 4
+
+    time.sleep(0.01)
+    with patch.object(scaler, "sample", return_value=signals(db_probe_ms=500)):
+        scaler.refresh()
+    scaler.maybe_scale()
+    assert pool.num_processes == 3
+
+
+def test_autoscaler_keeps_pool_size_when_sampling_fails():
+    pool = FakePool(4)
+    scaler = EventAutoscaler(pool, 16, 2, keepalive=0.001)
+
+    with patch.object(scaler, "sample", side_effect=ConnectionError("Redis is down")):
+        scaler.refresh()
+    scaler.maybe_scale()
+
+    assert pool.num_processes == 4
+    assert (
+        scaler._next_sample_at > time.monotonic() + settings.AUTOSCALE_INTERVAL_SECONDS
+    )
@@ -0,0 +1,238 @@
+"""
+Redis Streams Transport Tests
+
+This suite focuses on the optional Redis Streams path for webhook events.
+
+Coverage Summary:
+- With EVENT_TRANSPORT=streams the webhook routes XADD compact entries per service instead of publishing Celery tasks.
+- The consumer group worker runs entries through the same sync services and acknowledges them in one XACK.
+- Failed entries stay pending, are retried through XAUTOCLAIM and are logged as failed after the retry budget.
+- Malformed entries are acknowledged rather than redelivered forever.
+- Entries whose offloaded payload expired are acknowledged and logged as failed.
+- Errors while polling back off instead of ending the consumer loop.
+"""
+
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from kombu.utils.json import loads
+from redis.exceptions import ResponseError
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.enums import ServiceType, WebhookStatus
+from app.schemas.external_api_responses import ExternalUserSuccessResponse
+from app.services.event_streams import StreamConsumer, publish_event, stream_key
+from tests.data.sample_webhook_events import batch_user_events, user_event
+
+
+class FakeStreams:
+    """
+    Single-group stream semantics for the commands the transport uses.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.delivered = {}
+        self.pending = {}
+        self.groups = set()
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        entries = self.entries.setdefault(key, [])
+        message_id = f"{len(entries) + 1}-0".encode()
+        entries.append(
+            (message_id, {k.encode(): str(v).encode() for k, v in fields.items()})
+        )
+        return message_id
+
+    def xgroup_create(self, key, group, id="0", mkstream=False):
+        if key in self.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        self.groups.add(key)
+
+    def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        result = []
+        for key in streams:
+            start = self.delivered.get(key, 0)
+            batch = self.entries.get(key, [])[start : start + count]
+            if batch:
+                self.delivered[key] = start + len(batch)
+                pending = self.pending.setdefault(key, {})
+                for message_id, _ in batch:
+                    pending[message_id] = 1
+                result.append([key.encode(), batch])
+        return result
+
+    def xack(self, key, group, *ids):
+        for message_id in ids:
+            self.pending.get(key, {}).pop(message_id, None)
+        return len(ids)
+
+    def xautoclaim(self, key, group, consumer, min_idle_time, count=None):
+        pending = self.pending.get(key, {})
+        claimed = []
+        for message_id, fields in self.entries.get(key, []):
+            if message_id in pending:
+                pending[message_id] += 1
+                claimed.append((message_id, fields))
+        return [b"0-0", claimed[:count], []]
+
+    def xpending_range(self, key, group, min, max, count):
+        return [
+            {"message_id": message_id, "times_delivered": delivered}
+            for message_id, delivered in self.pending.get(key, {}).items()
+        ]
+
+
+@pytest.fixture
+def streams():
+    return FakeStreams()
+
+
+@pytest.fixture
+def consumer(streams):
+    consumer = StreamConsumer(streams, "test-consumer")
+    consumer.ensure_groups()
+    consumer.ensure_groups()
+    return consumer
+
+
+def user_success():
+    return ExternalUserSuccessResponse(
+        status="success",
+        data={
+            "user_id": "ext_user_12345",
+            "email": "sarah.johnson@techcorp.com",
+            "first_name": "Sarah",
+            "last_name": "Johnson",
+            "department": "Engineering",
+            "title": "VP Engineering",
+            "status": "active",
+            "manager_id": "ext_user_00001",
+            "hire_date": "2022-01-15",
+            "last_updated": "2024-02-15T09:00:00Z",
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_webhook_publishes_to_service_stream(client, streams):
+    with (
+        patch.object(settings, "EVENT_TRANSPORT", "streams"),
+        patch("app.api.webhooks.get_broker_redis", return_value=streams),
+        patch("app.services.tasks.process_event.apply_async") as mocked_apply,
+    ):
+        resp = await client.post("/webhooks/user-service", json=batch_user_events)
+        assert resp.status_code == 202
+        mocked_apply.assert_not_called()
+
+    entries = streams.entries[stream_key(ServiceType.USER)]
+    assert len(entries) == len(batch_user_events["events"])
+    _, fields = entries[0]
+    event = loads(fields[b"event"])
+    assert event["event_id"] == batch_user_events["events"][0]["event_id"]
+    assert float(fields[b"enqueued_at"]) >= float(fields[b"received_at"])
+
+
+def test_consumer_syncs_and_acks_batch(streams, consumer):
+    publish_event(streams, user_event, ServiceType.USER, {"enqueued_at": 1.0})
+
+    with (
+        patch("app.services.tasks.SessionLocal", return_value=MagicMock()),
+        patch("app.services.tasks.check_if_event_processed", return_value=False),
+        patch("app.services.tasks.process_user", return_value=user_success()),
+        patch("app.services.tasks.sync_user") as mocked_sync_user,
+        patch("app.services.tasks.create_webhook_log") as mocked_log,
+    ):
+        consumer.poll()
+
+    mocked_sync_user.assert_called_once()
+    assert mocked_log.call_args.kwargs["status"] == WebhookStatus.processed
+    assert mocked_log.call_args.kwargs["stage_ms"][1] is not None
+    assert streams.pending[stream_key(ServiceType.USER)] == {}
+
+
+def test_failed_entry_is_reclaimed_then_logged_as_failed(streams, consumer):
+    publish_event(streams, user_event, ServiceType.USER, {})
+    key = stream_key(ServiceType.USER)
+
+    with (
+        patch("app.services.tasks.SessionLocal", return_value=MagicMock()),
+        patch("app.services.tasks.check_if_event_processed", return_value=False),
+        patch("app.services.tasks.process_user", side_effect=Exception("down")),
+        patch("app.services.tasks.create_webhook_log") as mocked_log,
+    ):
+        consumer.poll()
+        assert list(streams.pending[key].values()) == [1]
+        mocked_log.assert_not_called()
+
+        for _ in range(settings.CELERY_MAX_RETRIES - 1):
+            consumer.reclaim()
+        assert len(streams.pending[key]) == 1
+        mocked_log.assert_not_called()
+
+        consumer.reclaim()
+
+    assert mocked_log.call_args.kwargs["status"] == WebhookStatus.failed
+    assert streams.pending[key] == {}
+
+
+def test_malformed_entry_is_acknowledged(streams, consumer):
+    key = stream_key(ServiceType.USER)
+    streams.xadd(key, {"event": json.dumps({"event_id": "evt_bad"})})
+
+    with (
+        patch("app.services.tasks.SessionLocal", return_value=MagicMock()),
+        patch("app.services.tasks.create_webhook_log") as mocked_log,
+    ):
+        consumer.poll()
+
+    mocked_log.assert_not_called()
+    assert streams.pending[key] == {}
+
+
+def test_poll_errors_do_not_end_the_consumer(consumer):
+    stop = threading.Event()
+    failures = [OperationalError("SELECT 1", {}, Exception("db down"))]
+
+    def poll():
+        if failures:
+            raise failures.pop()
+        stop.set()
+
+    with (
+        patch.object(consumer, "poll", side_effect=poll),
+        patch("app.services.event_streams.REDIS_RETRY_SECONDS", 0),
+    ):
+        consumer.run(stop)
+    assert not failures
+
+
+def test_expired_payload_is_logged_as_failed(streams, consumer):
+    key = stream_key(ServiceType.USER)
+    reference = {
+        "payload_ref": "payload:gone",
+        "event_id": user_event["event_id"],
+        "organization_id": user_event["organization_id"],
+    }
+    publish_event(streams, reference, ServiceType.USER, {})
+
+    with (
+        patch(
+            "app.services.payloads.get_broker_redis",
+            return_value=MagicMock(**{"get.return_value": None}),
+        ),
+        patch("app.services.tasks.SessionLocal", return_value=MagicMock()),
+        patch("app.services.tasks.create_webhook_log") as mocked_log,
+    ):
+        consumer.poll()
+
+    failed = mocked_log.call_args.kwargs
+    assert failed["status"] == WebhookStatus.failed
+    assert (failed["event_id"], failed["org_id"]) == (
+        user_event["event_id"],
+        user_event["organization_id"],
+    )
+    assert streams.pending[key] == {}
@@ -9,9 +9,10 @@ Coverage Summary:
 - Health computation: validates "healthy" state when last success is most recent.
 - Health computation: validates "degraded" state when a newer failure exists after the last success.
 - Correct per-service breakdown: confirms that each service (user, payment, communication) is represented and handled individually.
+- Per-organization breakdown: health and counts for one organization via `org_id`.
 
 Highlights:
-- Uses DB setup and controlled log insertion to simulate real webhook processing scenarios.
+- Uses DB setup and controlled log insertion through `create_webhook_log` to simulate real webhook processing scenarios.
 - Confirms correct status logic in different sequences of success and failure events.
 - Ensures accurate and secure visibility of integration health to authorized users only.
 - Complements webhook and sync service tests by verifying observability and monitoring requirements.
@@ -23,7 +24,26 @@ import pytest
 
 from app.core.config import settings
 from app.core.enums import ServiceType, WebhookStatus
+from app.models.integration_health import IntegrationHealth
 from app.models.webhooks import WebhookLog
+from app.services.webhook_log_helpers import create_webhook_log
+
+
+def clear_webhook_history(db_session):
+    db_session.query(WebhookLog).delete()
+    db_session.query(IntegrationHealth).delete()
+    db_session.commit()
+
+
+def log_event(db_session, event_id, status, org_id="org_001"):
+    create_webhook_log(
+        db=db_session,
+        event_id=event_id,
+        service=ServiceType.USER,
+        org_id=org_id,
+        status=status,
+        payload={},
+    )
 
 
 @pytest.mark.asyncio
@@ -75,8 +95,7 @@ async def test_status_shows_error_when_no_success_logs(
     )
     token = login_resp.json()["access_token"]
 
-    db_session.query(WebhookLog).delete()
-    db_session.commit()
+    clear_webhook_history(db_session)
 
     resp = await client.get(
         "/integrations/status", headers={"Authorization": f"Bearer {token}"}
@@ -92,18 +111,9 @@ async def test_status_shows_error_when_no_success_logs(
 async def test_status_healthy_when_success_and_no_failures(
     client, db_session, superadmin_user, test_org
 ):
-    db_session.query(WebhookLog).delete()
-    db_session.commit()
+    clear_webhook_history(db_session)
 
-    success_log = WebhookLog(
-        event_id="evt_user_success",
-        service=ServiceType.USER,
-        org_id="org_001",
-        status=WebhookStatus.processed,
-        payload={},
-    )
-    db_session.add(success_log)
-    db_session.commit()
+    log_event(db_session, "evt_user_success", WebhookStatus.processed)
 
     login_resp = await client.post(
         "/users/login",
@@ -126,28 +136,11 @@ async def test_status_healthy_when_success_and_no_failures(
 async def test_status_degraded_when_failure_after_success(
     client, db_session, superadmin_user, test_org
 ):
-    db_session.query(WebhookLog).delete()
-    db_session.commit()
+    clear_webhook_history(db_session)
 
-    success_log = WebhookLog(
-        event_id="evt_user_success",
-        service=ServiceType.USER,
-        org_id="org_001",
-        status=WebhookStatus.processed,
-        payload={},
-    )
-    db_session.add(success_log)
-    db_session.commit()
+    log_event(db_session, "evt_user_success", WebhookStatus.processed)
 
-    failure_log = WebhookLog(
-        event_id="evt_user_fail",
-        service=ServiceType.USER,
-        org_id="org_001",
-        status=WebhookStatus.failed,
-        payload={},
-    )
-    db_session.add(failure_log)
-    db_session.commit()
+    log_event(db_session, "evt_user_fail", WebhookStatus.failed)
 
     login_resp = await client.post(
         "/users/login",
@@ -164,3 +157,38 @@ async def test_status_degraded_when_failure_after_success(
     data = resp.json()
 
     assert data["user_service"]["status"] == "degraded"
+
+
+@pytest.mark.asyncio
+async def test_status_broken_down_per_organization(
+    client, db_session, superadmin_user, test_org
+):
+    clear_webhook_history(db_session)
+    log_event(db_session, "evt_org_success", WebhookStatus.processed, test_org.slug)
+    log_event(db_session, "evt_other_success", WebhookStatus.processed, "org_other")
+    log_event(db_session, "evt_other_fail", WebhookStatus.failed, "org_other")
+
+    login_resp = await client.post(
+        "/users/login",
+        data={
+            "username": settings.INITIAL_SUPERADMIN_EMAIL,
+            "password": settings.INITIAL_SUPERADMIN_PASSWORD,
+        },
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+    resp = await client.get("/integrations/status", headers=headers)
+    overall = resp.json()["user_service"]
+    assert overall["status"] == "degraded"
+    assert overall["last_event_id"] == "evt_other_success"
+    assert overall["processed_count"] == 2
+    assert overall["failed_count"] == 1
+
+    resp = await client.get(
+        "/integrations/status", params={"org_id": str(test_org.id)}, headers=headers
+    )
+    scoped = resp.json()["user_service"]
+    assert scoped["status"] == "healthy"
+    assert scoped["last_event_id"] == "evt_org_success"
+    assert scoped["processed_count"] == 1
+    assert scoped["failed_count"] == 0
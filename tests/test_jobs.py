@@ -0,0 +1,266 @@
+"""
+Background Job Tests
+
+This suite focuses on the job subsystem and its webhook replay jobs.
+
+Coverage Summary:
+- Jobs are submitted, polled and cancelled through /jobs, scoped to the caller's organization.
+- A replay job requeues failed events logged before it, chunk by chunk, with progress counters.
+- A failed chunk is retried from the job's checkpoint without replaying any event twice.
+- Only failures in a row count towards JOB_MAX_ATTEMPTS.
+- A failed log is kept until its event is queued again, and is overwritten when the event is processed.
+- Cancelled, locked and stalled jobs are handled between chunks and by the sweep.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.enums import JobKind, JobStatus, ServiceType, WebhookStatus
+from app.models.job import Job
+from app.models.webhooks import WebhookLog
+from app.services import jobs
+from app.services.jobs import job_lock, resume_stalled_jobs, run_job
+from app.services.replay import replay_chunk
+from app.services.webhook_log_helpers import (
+    check_if_event_processed,
+    create_webhook_log,
+)
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def job_db(db_session):
+    yield db_session
+    db_session.rollback()
+    db_session.query(Job).delete()
+    db_session.query(WebhookLog).filter(WebhookLog.event_id.like("evt_job%")).delete(
+        synchronize_session=False
+    )
+    db_session.commit()
+
+
+@pytest.fixture
+def enqueued():
+    with patch.object(jobs.process_job, "apply_async") as apply_async:
+        yield apply_async
+
+
+async def admin_headers(client):
+    resp = await client.post(
+        "/users/login",
+        data={
+            "username": settings.INITIAL_ADMIN_EMAIL,
+            "password": settings.INITIAL_ADMIN_PASSWORD,
+        },
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def failed_logs(db, org, count, logged_at):
+    for i in range(count):
+        db.add(
+            WebhookLog(
+                event_id=f"evt_job_{i}",
+                service=ServiceType.USER,
+                org_id=org.slug,
+                status=WebhookStatus.failed,
+                payload={"event_id": f"evt_job_{i}"},
+                created_at=logged_at + timedelta(seconds=i),
+            )
+        )
+    db.commit()
+
+
+def replay_job(db, org) -> Job:
+    job = Job(kind=JobKind.webhook_replay, org_id=org.id, params={})
+    db.add(job)
+    db.commit()
+    return job
+
+
+@pytest.mark.asyncio
+async def test_submit_poll_and_cancel(
+    client, job_db, initial_admin_user, test_org, enqueued
+):
+    headers = await admin_headers(client)
+    resp = await client.post(
+        "/jobs/",
+        json={"kind": "webhook_replay", "params": {"service": "user_service"}},
+        headers=headers,
+    )
+    assert resp.status_code == 202
+    job = resp.json()
+    assert (job["status"], job["org_id"]) == ("queued", str(test_org.id))
+    assert job["params"] == {"service": "user_service"}
+    enqueued.assert_called_once_with((job["id"],), countdown=None)
+
+    resp = await client.post(
+        "/jobs/",
+        json={"kind": "webhook_replay", "params": {"service": "fax"}},
+        headers=headers,
+    )
+    assert resp.status_code == 422
+
+    resp = await client.get(f"/jobs/{job['id']}", headers=headers)
+    assert resp.json()["status"] == "queued"
+    resp = await client.post(f"/jobs/{job['id']}/cancel", headers=headers)
+    assert resp.json()["status"] == "cancelled"
+    resp = await client.post(f"/jobs/{job['id']}/cancel", headers=headers)
+    assert resp.status_code == 409
+
+    resp = await client.get("/jobs/?status=cancelled", headers=headers)
+    assert [item["id"] for item in resp.json()["items"]] == [job["id"]]
+
+
+def test_replay_job_runs_in_chunks(job_db, test_org, enqueued):
+    now = datetime.now(timezone.utc)
+    failed_logs(job_db, test_org, 5, now - timedelta(hours=1))
+    job = replay_job(job_db, test_org)
+    job_db.add(
+        WebhookLog(
+            event_id="evt_job_later",
+            service=ServiceType.USER,
+            org_id=test_org.slug,
+            status=WebhookStatus.failed,
+            payload={"event_id": "evt_job_later"},
+            created_at=now + timedelta(hours=1),
+        )
+    )
+    job_db.commit()
+
+    with patch.object(settings, "JOB_CHUNK_SIZE", 2), patch(
+        "app.services.replay.requeue_event"
+    ) as requeue:
+        run_job(job_db, job.id)
+
+    assert (job.status, job.processed_count, job.total_count) == (
+        JobStatus.completed,
+        5,
+        5,
+    )
+    assert [call.args[0]["event_id"] for call in requeue.call_args_list] == [
+        f"evt_job_{i}" for i in range(5)
+    ]
+    remaining = job_db.query(WebhookLog.event_id).filter(
+        WebhookLog.event_id.like("evt_job%")
+    )
+    assert [event_id for (event_id,) in remaining] == ["evt_job_later"]
+    enqueued.assert_not_called()
+
+
+def test_failed_chunk_resumes_from_checkpoint(job_db, test_org, enqueued):
+    failed_logs(job_db, test_org, 5, datetime.now(timezone.utc) - timedelta(hours=1))
+    job = replay_job(job_db, test_org)
+    sent = []
+
+    def broker_down_once(event, service):
+        if len(sent) == 3 and not broker_down_once.failed:
+            broker_down_once.failed = True
+            raise ConnectionError("broker unavailable")
+        sent.append(event["event_id"])
+
+    broker_down_once.failed = False
+    with patch.object(settings, "JOB_CHUNK_SIZE", 2), patch(
+        "app.services.replay.requeue_event", side_effect=broker_down_once
+    ):
+        run_job(job_db, job.id)
+        assert (job.status, job.attempts, job.processed_count) == (
+            JobStatus.running,
+            1,
+            3,
+        )
+        assert "broker unavailable" in job.error
+        assert enqueued.call_args.kwargs["countdown"] > 0
+
+        run_job(job_db, job.id)
+
+    assert (job.status, job.processed_count) == (JobStatus.completed, 5)
+    assert sent == [f"evt_job_{i}" for i in range(5)]
+
+
+def test_attempts_reset_after_a_successful_chunk(job_db, test_org, enqueued):
+    failed_logs(job_db, test_org, 4, datetime.now(timezone.utc) - timedelta(hours=1))
+    job = replay_job(job_db, test_org)
+    failed = set()
+
+    def broker_down_once_per_event(event, service):
+        if event["event_id"] not in failed:
+            failed.add(event["event_id"])
+            raise ConnectionError("broker unavailable")
+
+    with patch.object(settings, "JOB_CHUNK_SIZE", 1), patch.object(
+        settings, "JOB_MAX_ATTEMPTS", 2
+    ), patch(
+        "app.services.replay.requeue_event", side_effect=broker_down_once_per_event
+    ):
+        while run_job(job_db, job.id).status == JobStatus.running:
+            assert job.attempts < 2
+
+    assert (job.status, job.processed_count) == (JobStatus.completed, 4)
+    assert len(failed) == 4
+
+
+def test_failed_logs_outlive_a_lost_worker(job_db, test_org, enqueued):
+    failed_logs(job_db, test_org, 2, datetime.now(timezone.utc) - timedelta(hours=1))
+    job = replay_job(job_db, test_org)
+
+    # The worker is lost after queueing the events, before its commit
+    with patch("app.services.replay.requeue_event") as requeue, patch(
+        "app.services.replay.finish_chunk", side_effect=SystemExit
+    ), pytest.raises(SystemExit):
+        replay_chunk(job_db, job)
+    job_db.rollback()
+    assert requeue.call_count == 2
+    assert job.checkpoint is None
+    replayed = job_db.query(WebhookLog).filter(WebhookLog.event_id.like("evt_job%"))
+    assert replayed.count() == 2
+
+    # The queued event is not a duplicate, and its outcome replaces the failed log
+    assert not check_if_event_processed(job_db, "evt_job_0")
+    create_webhook_log(
+        job_db,
+        "evt_job_0",
+        ServiceType.USER,
+        test_org.slug,
+        WebhookStatus.processed,
+        {"event_id": "evt_job_0"},
+    )
+    assert check_if_event_processed(job_db, "evt_job_0")
+
+    with patch("app.services.replay.requeue_event") as requeue:
+        run_job(job_db, job.id)
+    assert [call.args[0]["event_id"] for call in requeue.call_args_list] == [
+        "evt_job_1"
+    ]
+    assert [log.status for log in replayed] == [WebhookStatus.processed]
+
+
+def test_cancelled_locked_and_stalled_jobs(job_db, test_org, enqueued, monkeypatch):
+    failed_logs(job_db, test_org, 1, datetime.now(timezone.utc) - timedelta(hours=1))
+    job = replay_job(job_db, test_org)
+
+    with patch("app.services.replay.requeue_event") as requeue:
+        with job_lock(TestingSessionLocal(), job.id):
+            run_job(job_db, job.id)
+        assert job.status == JobStatus.queued
+
+        job.status = JobStatus.running
+        job.cancel_requested = True
+        job_db.commit()
+        run_job(job_db, job.id)
+    assert job.status == JobStatus.cancelled
+    requeue.assert_not_called()
+
+    stalled = replay_job(job_db, test_org)
+    stalled.status = JobStatus.running
+    stalled.updated_at = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.JOB_STALE_SECONDS + 1
+    )
+    job_db.commit()
+    monkeypatch.setattr(jobs, "SessionLocal", TestingSessionLocal)
+    assert resume_stalled_jobs() == 1
+    enqueued.assert_called_once_with((str(stalled.id),), countdown=None)
+    assert resume_stalled_jobs() == 0
@@ -0,0 +1,151 @@
+"""
+Listing Endpoint Tests
+
+This suite focuses on the org-scoped, cursor-paginated listing endpoints.
+
+Coverage Summary:
+- Users: walks every page with `next_cursor` and checks ordering and completeness.
+- Scoping: superadmins must name an organization, plain users are rejected.
+- Audit logs: verifies filtering by audit action.
+- Webhook logs: verifies filtering by service and processing status.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.enums import AuditAction, ServiceType, UserRole, WebhookStatus
+from app.models.user import User
+from app.models.webhooks import WebhookLog
+from app.utils.audit import log_audit
+
+
+async def login(client, username, password):
+    resp = await client.post(
+        "/users/login", data={"username": username, "password": password}
+    )
+    assert resp.status_code == 200
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_admin_pages_through_users(
+    client, db_session, initial_admin_user, test_org
+):
+    for i in range(5):
+        db_session.add(
+            User(email=f"page{i}@testorg.com", role=UserRole.user, org_id=test_org.id)
+        )
+    db_session.commit()
+
+    headers = await login(
+        client, settings.INITIAL_ADMIN_EMAIL, settings.INITIAL_ADMIN_PASSWORD
+    )
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await client.get("/users/", params=params, headers=headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["items"]) <= 2
+        seen.extend(body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    emails = [item["email"] for item in seen]
+    assert len(emails) == len(set(emails)) == 6
+    created = [item["created_at"] for item in seen]
+    assert created == sorted(created, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_listing_scope_rules(client, superadmin_user, test_org, test_user):
+    headers = await login(
+        client,
+        settings.INITIAL_SUPERADMIN_EMAIL,
+        settings.INITIAL_SUPERADMIN_PASSWORD,
+    )
+    resp = await client.get("/users/", headers=headers)
+    assert resp.status_code == 400
+
+    resp = await client.get(
+        "/users/", params={"org_id": str(test_org.id)}, headers=headers
+    )
+    assert resp.status_code == 200
+    assert [u["email"] for u in resp.json()["items"]] == [test_user.email]
+
+    user_headers = await login(client, test_user.email, "test_user_password")
+    resp = await client.get("/audit-logs/", headers=user_headers)
+    assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_audit_logs_filter_by_action(
+    client, db_session, initial_admin_user, test_org
+):
+    log_audit(db_session, AuditAction.CREATED_USER, initial_admin_user.id, test_org.id)
+    log_audit(db_session, AuditAction.UPDATED_USER, initial_admin_user.id, test_org.id)
+
+    headers = await login(
+        client, settings.INITIAL_ADMIN_EMAIL, settings.INITIAL_ADMIN_PASSWORD
+    )
+    resp = await client.get(
+        "/audit-logs/",
+        params={"action": AuditAction.UPDATED_USER.value},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert len(items) == 1
+    assert items[0]["action"] == AuditAction.UPDATED_USER.value
+
+
+@pytest.mark.asyncio
+async def test_webhook_logs_filter_by_service_and_status(
+    client, db_session, initial_admin_user, test_org
+):
+    db_session.query(WebhookLog).delete()
+    db_session.add_all(
+        [
+            WebhookLog(
+                event_id="evt_list_1",
+                service=ServiceType.USER,
+                org_id=test_org.slug,
+                status=WebhookStatus.processed,
+            ),
+            WebhookLog(
+                event_id="evt_list_2",
+                service=ServiceType.USER,
+                org_id=test_org.slug,
+                status=WebhookStatus.failed,
+            ),
+            WebhookLog(
+                event_id="evt_list_3",
+                service=ServiceType.PAYMENT,
+                org_id=test_org.slug,
+                status=WebhookStatus.failed,
+            ),
+            WebhookLog(
+                event_id="evt_list_other_org",
+                service=ServiceType.USER,
+                org_id="someone_else",
+                status=WebhookStatus.failed,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    headers = await login(
+        client, settings.INITIAL_ADMIN_EMAIL, settings.INITIAL_ADMIN_PASSWORD
+    )
+    resp = await client.get(
+        "/webhook-logs/",
+        params={"service": ServiceType.USER.value, "status": "failed"},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert [log["event_id"] for log in resp.json()["items"]] == ["evt_list_2"]
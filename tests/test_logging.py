@@ -0,0 +1,71 @@
+"""
+Logging Tests
+
+This suite focuses on the structured, queued logging pipeline.
+
+Coverage Summary:
+- JSON records carry log_context fields and `extra=` fields as keys, not interpolated text.
+- Sampling keeps a fraction of INFO records per logger and never drops warnings.
+- The queue handler defers message formatting to the writer thread and drops when full.
+"""
+
+import json
+import logging
+import queue
+from unittest.mock import patch
+
+from app.utils.logger import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    log_context,
+)
+
+
+def make_record(name="tasks", level=logging.INFO, msg="hello %s", args=("world",)):
+    return logging.getLogger(name).makeRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_emits_structured_fields():
+    with log_context(event_id="evt_1", service="user_service"):
+        record = logging.getLogger("tasks").makeRecord(
+            "tasks",
+            logging.WARNING,
+            __file__,
+            1,
+            "Scheduling retry",
+            (),
+            None,
+            extra={"retry": 2},
+        )
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Scheduling retry"
+    assert entry["level"] == "WARNING"
+    assert entry["event_id"] == "evt_1"
+    assert entry["service"] == "user_service"
+    assert entry["retry"] == 2
+
+
+def test_sampling_filter_is_per_logger_and_keeps_warnings():
+    sampler = SamplingFilter({"sync_user": 0.0})
+
+    assert not sampler.filter(make_record("sync_user"))
+    assert not sampler.filter(make_record("sync_user.child"))
+    assert sampler.filter(make_record("sync_user", level=logging.WARNING))
+    assert sampler.filter(make_record("tasks"))
+
+    with patch("app.utils.logger.random.random", return_value=0.05):
+        assert SamplingFilter({"tasks": 0.1}).filter(make_record("tasks"))
+
+
+def test_queue_handler_defers_formatting_and_drops_when_full():
+    records = queue.Queue(maxsize=1)
+    handler = NonBlockingQueueHandler(records)
+
+    handler.handle(make_record())
+    handler.handle(make_record())
+
+    queued = records.get_nowait()
+    assert queued.msg == "hello %s" and queued.args == ("world",)
+    assert records.empty()
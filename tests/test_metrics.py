@@ -0,0 +1,79 @@
+"""
+Metrics Tests
+
+This suite focuses on the Prometheus instrumentation of the ingest and processing pipeline.
+
+Coverage Summary:
+- /metrics serves the Prometheus text format.
+- HTTP requests are counted by route template, method and status code.
+- Webhook batch sizes and accepted events are recorded per service.
+- process_event records per-stage durations and dedupe hits.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.enums import ServiceType
+from app.services.tasks import process_event
+from tests.data.sample_webhook_events import batch_user_events, communication_event
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_records_webhook_traffic(client):
+    service = ServiceType.USER.value
+    route = {"route": "/webhooks/user-service", "method": "POST"}
+    requests_before = sample("http_requests_total", status_code="202", **route)
+    events_before = sample("webhook_events_received_total", service=service)
+    batches_before = sample("webhook_batch_size_count", service=service)
+
+    with patch("app.services.tasks.process_event.apply_async"):
+        resp = await client.post("/webhooks/user-service", json=batch_user_events)
+        assert resp.status_code == 202
+
+    assert sample("http_requests_total", status_code="202", **route) == (
+        requests_before + 1
+    )
+    assert sample("webhook_events_received_total", service=service) == (
+        events_before + len(batch_user_events["events"])
+    )
+    assert sample("webhook_batch_size_count", service=service) == batches_before + 1
+
+    resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert "webhook_batch_size_bucket" in resp.text
+
+
+def test_process_event_records_stages_and_duplicates(db_session):
+    service = ServiceType.COMMUNICATION.value
+    sync_before = sample(
+        "event_stage_duration_seconds_count", service=service, stage="sync"
+    )
+    log_before = sample(
+        "event_stage_duration_seconds_count", service=service, stage="log"
+    )
+    dupes_before = sample("event_duplicates_total", service=service)
+
+    with (
+        patch("app.services.tasks.check_if_event_processed", return_value=False),
+        patch("app.services.tasks.sync_communication"),
+        patch("app.services.tasks.create_webhook_log"),
+    ):
+        process_event(communication_event, service)
+
+    with patch("app.services.tasks.check_if_event_processed", return_value=True):
+        process_event(communication_event, service)
+
+    assert sample(
+        "event_stage_duration_seconds_count", service=service, stage="sync"
+    ) == (sync_before + 1)
+    assert sample(
+        "event_stage_duration_seconds_count", service=service, stage="log"
+    ) == (log_before + 1)
+    assert sample("event_duplicates_total", service=service) == dupes_before + 1
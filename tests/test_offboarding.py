@@ -0,0 +1,283 @@
+"""
+Organization Offboarding Tests
+
+This suite focuses on removing an organization with an offboarding job.
+
+Coverage Summary:
+- DELETE /orgs/{org_id} queues one offboarding job per organization, for superadmins only.
+- The job removes the organization's rows table by table in small chunks, leaving other organizations alone.
+- The audit trail is kept with its references cleared, or deleted on request, and the removal itself is audited.
+- Rows added mid-way restart the walk, and chunks wait while replicas lag.
+- Webhooks and directory syncs skip an organization once its offboarding starts.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.enums import (
+    AuditAction,
+    JobKind,
+    JobStatus,
+    OrganizationStatus,
+    ServiceType,
+    SubscriptionPlan,
+    UserRole,
+    WebhookStatus,
+)
+from app.models.audit_log import AuditLog
+from app.models.communication_log import CommunicationLog
+from app.models.integration_health import IntegrationHealth
+from app.models.job import Job
+from app.models.organization import Organization
+from app.models.outbox import OutboxEvent
+from app.models.parked_event import ParkedEvent
+from app.models.subscription import Subscription
+from app.models.sync_watermark import SyncWatermark
+from app.models.user import User
+from app.models.webhooks import WebhookLog
+from app.schemas.external_api_responses import ExternalUserSuccessResponse
+from app.schemas.job import OrgOffboardingParams
+from app.schemas.webhooks import UserServiceEvent
+from app.services import jobs, offboarding, reconciliation, sync_user_service
+from app.services.jobs import run_job
+from app.services.offboarding import offboard_chunk, offboarding_steps
+from app.services.sync_user_service import sync_user
+from tests.conftest import TestingSessionLocal
+from tests.data.sample_webhook_events import user_event
+
+
+@pytest.fixture
+def offboarding_db(db_session):
+    with patch.object(jobs.process_job, "apply_async"), patch.object(
+        settings, "OFFBOARDING_PAUSE_SECONDS", 0
+    ), patch.object(settings, "JOB_CHUNK_SIZE", 2):
+        yield db_session
+    db_session.rollback()
+    for model in (Job, WebhookLog, ParkedEvent, IntegrationHealth):
+        db_session.query(model).delete()
+    db_session.commit()
+
+
+def populate(db, org, prefix, users=3):
+    """
+    Give an organization users with subscriptions, messages and audit logs,
+    plus webhook logs, a parked event, outbox events and sync state.
+    """
+    for i in range(users):
+        user = User(email=f"{prefix}{i}@example.com", role=UserRole.user, org_id=org.id)
+        db.add(user)
+        db.flush()
+        db.add_all(
+            [
+                Subscription(
+                    user_id=user.id,
+                    external_subscription_id=f"{prefix}_sub_{i}",
+                    plan=SubscriptionPlan.basic,
+                    status="active",
+                ),
+                CommunicationLog(
+                    user_id=user.id, message_id=f"{prefix}_msg_{i}", status="delivered"
+                ),
+                AuditLog(
+                    action=AuditAction.UPDATED_USER, user_id=user.id, org_id=org.id
+                ),
+                WebhookLog(
+                    event_id=f"{prefix}_evt_{i}",
+                    service=ServiceType.USER,
+                    org_id=org.slug,
+                    status=WebhookStatus.processed,
+                ),
+                OutboxEvent(
+                    org_id=org.id,
+                    event_type="user.created",
+                    entity_type="user",
+                    entity_id=str(user.id),
+                    payload={},
+                ),
+            ]
+        )
+    db.add_all(
+        [
+            ParkedEvent(
+                event_id=f"{prefix}_parked",
+                service=ServiceType.PAYMENT,
+                org_id=org.slug,
+                dependency="customer",
+                dependency_key="missing",
+                payload={},
+                expires_at=datetime.now(timezone.utc),
+            ),
+            IntegrationHealth(service=ServiceType.USER, org_id=org.slug),
+            SyncWatermark(org_id=org.id, service=ServiceType.USER),
+        ]
+    )
+    db.commit()
+
+
+def offboarding_job(db, org, actor, keep_audit_logs=True) -> Job:
+    job = Job(
+        kind=JobKind.org_offboarding,
+        org_id=org.id,
+        created_by=actor.id,
+        params={"keep_audit_logs": keep_audit_logs},
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def run_to_end(db, job):
+    while run_job(db, job.id).status == JobStatus.running:
+        pass
+
+
+async def login(client, email, password):
+    resp = await client.post(
+        "/users/login", data={"username": email, "password": password}
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_delete_org_queues_one_job(
+    client, offboarding_db, superadmin_user, initial_admin_user, test_org
+):
+    admin = await login(
+        client, settings.INITIAL_ADMIN_EMAIL, settings.INITIAL_ADMIN_PASSWORD
+    )
+    resp = await client.delete(f"/orgs/{test_org.id}", headers=admin)
+    assert resp.status_code == 403
+    resp = await client.post("/jobs/", json={"kind": "org_offboarding"}, headers=admin)
+    assert resp.status_code == 400
+
+    superadmin = await login(
+        client,
+        settings.INITIAL_SUPERADMIN_EMAIL,
+        settings.INITIAL_SUPERADMIN_PASSWORD,
+    )
+    resp = await client.delete(
+        f"/orgs/{test_org.id}?keep_audit_logs=false", headers=superadmin
+    )
+    assert resp.status_code == 202
+    job = resp.json()
+    assert (job["kind"], job["status"]) == ("org_offboarding", "queued")
+    assert job["params"] == {"keep_audit_logs": False}
+
+    resp = await client.delete(f"/orgs/{test_org.id}", headers=superadmin)
+    assert resp.status_code == 409
+
+
+def test_offboarding_removes_only_the_org(offboarding_db, superadmin_user, test_org):
+    db = offboarding_db
+    other = Organization(name="Other", slug="org_other")
+    db.add(other)
+    db.commit()
+    test_org.webhook_url = "https://tenant.example.com/hooks"
+    db.commit()
+    populate(db, test_org, "gone")
+    populate(db, other, "kept", users=1)
+    job = offboarding_job(db, test_org, superadmin_user)
+
+    run_to_end(db, job)
+
+    assert job.status == JobStatus.completed
+    assert job.processed_count == job.total_count
+    assert job.checkpoint["counts"]["users"] == 3
+    assert db.get(Organization, test_org.id) is None
+    assert db.query(User).filter(User.email.like("gone%")).count() == 0
+    for model in (Subscription, CommunicationLog, OutboxEvent, SyncWatermark):
+        assert db.query(model).count() == 1
+    assert db.query(WebhookLog.event_id).scalar() == "kept_evt_0"
+    assert db.query(ParkedEvent.event_id).scalar() == "kept_parked"
+    assert db.query(IntegrationHealth.org_id).scalar() == "org_other"
+
+    # The audit trail stays, detached from the removed users and organization
+    detached = db.query(AuditLog).filter(
+        AuditLog.action == AuditAction.UPDATED_USER, AuditLog.org_id.is_(None)
+    )
+    assert [log.user_id for log in detached] == [None] * 3
+    removed = db.query(AuditLog).filter_by(action=AuditAction.DELETED_ORG).one()
+    assert removed.user_id == superadmin_user.id
+    assert removed.details["slug"] == "org_001"
+    assert removed.details["users"] == 3
+
+
+def test_offboarding_can_delete_audit_trail(offboarding_db, superadmin_user, test_org):
+    populate(offboarding_db, test_org, "gone", users=1)
+    job = offboarding_job(offboarding_db, test_org, superadmin_user, False)
+
+    run_to_end(offboarding_db, job)
+
+    actions = [action for (action,) in offboarding_db.query(AuditLog.action)]
+    assert actions == [AuditAction.DELETED_ORG]
+
+
+def test_rows_added_during_offboarding_restart_the_walk(
+    offboarding_db, superadmin_user, test_org
+):
+    db = offboarding_db
+    populate(db, test_org, "gone", users=1)
+    job = offboarding_job(db, test_org, superadmin_user)
+    steps = offboarding_steps(test_org, OrgOffboardingParams())
+
+    while (job.checkpoint or {}).get("step", 0) < len(steps):
+        assert offboard_chunk(db, job) is False
+    db.add(User(email="late@example.com", role=UserRole.user, org_id=test_org.id))
+    db.commit()
+
+    assert offboard_chunk(db, job) is False
+    assert job.checkpoint["step"] == 0
+    while not offboard_chunk(db, job):
+        pass
+    assert db.get(Organization, test_org.id) is None
+    assert db.query(User).filter_by(external_id="ext_user_new_123").count() == 0
+
+
+def test_chunks_wait_for_lagging_replicas(offboarding_db, superadmin_user, test_org):
+    populate(offboarding_db, test_org, "gone", users=1)
+    job = offboarding_job(offboarding_db, test_org, superadmin_user)
+
+    with patch.object(settings, "OFFBOARDING_LAG_POLL_SECONDS", 0), patch.object(
+        offboarding, "replication_lag", side_effect=[30.0, 0.0]
+    ) as lag:
+        assert offboard_chunk(offboarding_db, job) is False
+    assert lag.call_count == 2
+    assert job.processed_count == 1
+
+    with patch.object(settings, "JOB_SLICE_SECONDS", 0), patch.object(
+        offboarding, "replication_lag", return_value=30.0
+    ):
+        assert offboard_chunk(offboarding_db, job) is False
+    assert job.processed_count == 1
+    assert offboarding.replication_lag(offboarding_db) == 0
+
+
+def test_syncs_skip_an_org_being_offboarded(
+    offboarding_db, superadmin_user, test_org, monkeypatch
+):
+    db = offboarding_db
+    populate(db, test_org, "gone", users=1)
+    job = offboarding_job(db, test_org, superadmin_user)
+    assert offboard_chunk(db, job) is False
+    assert test_org.status == OrganizationStatus.offboarding
+
+    event = UserServiceEvent(**{**user_event, "organization_id": test_org.slug})
+    response = ExternalUserSuccessResponse(
+        status="success",
+        data={**user_event["data"], "manager_id": None, "last_updated": None},
+    )
+    monkeypatch.setattr(sync_user_service, "SessionLocal", TestingSessionLocal)
+    sync_user(event, response)
+    with patch.object(reconciliation, "fetch_page") as fetch_page:
+        assert reconciliation.reconcile_org(db, test_org.id) is None
+        assert reconciliation.sync_changed_users(db, test_org.id) is None
+    fetch_page.assert_not_called()
+    assert reconciliation.active_org_ids(db) == []
+
+    run_to_end(db, job)
+    assert job.status == JobStatus.completed
+    assert db.get(Organization, test_org.id) is None
+    assert db.query(User).filter_by(external_id="ext_user_new_123").count() == 0
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 from app.core.config import settings
@@ -106,3 +108,66 @@ async def test_superadmin_create_org_creates_two_audit_logs(
     assert user_log is not None
     assert user_log.user_id == superadmin_user.id
     assert user_log.org_id == new_org.id
+
+
+@pytest.mark.asyncio
+async def test_admin_sets_org_webhook(client, db_session, initial_admin_user, test_org):
+    login_resp = await client.post(
+        "/users/login",
+        data={
+            "username": settings.INITIAL_ADMIN_EMAIL,
+            "password": settings.INITIAL_ADMIN_PASSWORD,
+        },
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+    with patch("app.utils.urls.resolve", return_value=["93.184.216.34"]):
+        resp = await client.put(
+            f"/orgs/{test_org.id}/webhook",
+            json={"url": "https://tenant.example.com/hooks", "secret": "s3cret"},
+            headers=headers,
+        )
+    assert resp.status_code == 200
+    assert resp.json() == {"url": "https://tenant.example.com/hooks", "signed": True}
+    db_session.refresh(test_org)
+    assert test_org.webhook_secret == "s3cret"
+
+    other = Organization(name="Other Org", slug="other_org")
+    db_session.add(other)
+    db_session.commit()
+    resp = await client.put(
+        f"/orgs/{other.id}/webhook",
+        json={"url": "https://other.example.com/hooks"},
+        headers=headers,
+    )
+    assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "url, addresses",
+    [
+        ("http://tenant.example.com/hooks", ["93.184.216.34"]),
+        ("https://redis:6379/", ["172.18.0.3"]),
+        ("https://localhost/hooks", ["::1", "127.0.0.1"]),
+        ("https://metadata.example.com/", ["169.254.169.254"]),
+        ("https://mapped.example.com/", ["::ffff:10.0.0.1"]),
+    ],
+)
+async def test_org_webhook_rejects_internal_targets(
+    client, initial_admin_user, test_org, url, addresses
+):
+    login_resp = await client.post(
+        "/users/login",
+        data={
+            "username": settings.INITIAL_ADMIN_EMAIL,
+            "password": settings.INITIAL_ADMIN_PASSWORD,
+        },
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+    with patch("app.utils.urls.resolve", return_value=addresses):
+        resp = await client.put(
+            f"/orgs/{test_org.id}/webhook", json={"url": url}, headers=headers
+        )
+    assert resp.status_code == 422
@@ -0,0 +1,150 @@
+"""
+Change Feed Outbox Tests
+
+This suite focuses on the transactional outbox and its relay to tenant webhook endpoints.
+
+Coverage Summary:
+- Syncs record an outbox event in the same transaction as the change, only for organizations with an endpoint.
+- The relay batches a tenant's events into signed POSTs by entity lane, in order, and deletes what was delivered.
+- Failed deliveries back off, hold back the entity's later events, and are marked failed after the last attempt.
+- Endpoints that resolve to internal addresses are never posted to.
+"""
+
+import hashlib
+import hmac
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.enums import OutboxStatus
+from app.models.outbox import OutboxEvent
+from app.schemas.external_api_responses import ExternalUserSuccessResponse
+from app.schemas.webhooks import UserServiceEvent
+from app.services import sync_user_service
+from app.services.outbox import SIGNATURE_HEADER, OutboxRelay, record_change
+from app.services.sync_user_service import sync_user
+from tests.conftest import TestingSessionLocal
+from tests.data.sample_webhook_events import user_event
+
+ENDPOINT = "https://tenant.example.com/hooks"
+
+
+@pytest.fixture
+def feed_org(db_session, test_org, monkeypatch):
+    test_org.webhook_url = ENDPOINT
+    test_org.webhook_secret = "s3cret"
+    db_session.commit()
+    monkeypatch.setattr(sync_user_service, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr("app.services.outbox.SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr("app.utils.urls.resolve", lambda host, port: ["93.184.216.34"])
+    return test_org
+
+
+def relay_with(handler) -> OutboxRelay:
+    return OutboxRelay(client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def queue_user_changes(db, org, user, count):
+    for i in range(count):
+        user.last_name = f"Change {i}"
+        record_change(db, org, "user.updated", user)
+    db.commit()
+
+
+def test_sync_records_change_with_the_write(db_session, feed_org):
+    response = ExternalUserSuccessResponse(
+        status="success",
+        data={**user_event["data"], "manager_id": None, "last_updated": None},
+    )
+    sync_user(UserServiceEvent(**user_event), response)
+
+    db_session.expire_all()
+    event = db_session.query(OutboxEvent).one()
+    assert (event.event_type, event.entity_type) == ("user.created", "user")
+    assert event.payload["external_id"] == user_event["data"]["user_id"]
+    assert event.payload["status"] == "pending"
+
+    feed_org.webhook_url = None
+    db_session.commit()
+    sync_user(
+        UserServiceEvent(**{**user_event, "event_type": "user.updated"}), response
+    )
+    assert db_session.query(OutboxEvent).count() == 1
+
+
+def test_relay_batches_by_entity_in_order(
+    db_session, feed_org, test_user, initial_admin_user
+):
+    queue_user_changes(db_session, feed_org, test_user, 3)
+    queue_user_changes(db_session, feed_org, initial_admin_user, 2)
+    requests = []
+
+    def handler(request: httpx.Request):
+        digest = hmac.new(b"s3cret", request.content, hashlib.sha256).hexdigest()
+        assert request.headers[SIGNATURE_HEADER] == f"sha256={digest}"
+        requests.append(json.loads(request.content)["events"])
+        return httpx.Response(200)
+
+    with patch.object(settings, "OUTBOX_ENDPOINT_CONCURRENCY", 2):
+        relay = relay_with(handler)
+        assert relay.relay_once() == 5
+        relay.close()
+
+    db_session.expire_all()
+    by_entity = {}
+    for batch in requests:
+        for event in batch:
+            by_entity.setdefault(event["data"]["id"], []).append(
+                event["data"]["last_name"]
+            )
+    assert by_entity == {
+        str(test_user.id): ["Change 0", "Change 1", "Change 2"],
+        str(initial_admin_user.id): ["Change 0", "Change 1"],
+    }
+    assert len(requests) <= 2
+    assert db_session.query(OutboxEvent).count() == 0
+
+
+def test_failed_delivery_backs_off_and_blocks_entity(db_session, feed_org, test_user):
+    queue_user_changes(db_session, feed_org, test_user, 1)
+    relay = relay_with(lambda request: httpx.Response(503))
+    assert relay.relay_once() == 0
+
+    db_session.expire_all()
+    failed = db_session.query(OutboxEvent).one()
+    assert failed.attempts == 1
+    assert failed.next_attempt_at > datetime.now(timezone.utc)
+    assert "503" in failed.last_error
+
+    # A later change of the same entity waits for the one backing off
+    queue_user_changes(db_session, feed_org, test_user, 1)
+    assert relay.relay_once() == 0
+    db_session.expire_all()
+    assert db_session.query(OutboxEvent).filter_by(attempts=0).count() == 1
+
+    failed.attempts = settings.OUTBOX_MAX_ATTEMPTS - 1
+    failed.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+    assert relay.relay_once() == 0
+    relay.close()
+
+    db_session.expire_all()
+    statuses = [event.status for event in db_session.query(OutboxEvent).order_by("id")]
+    assert statuses[0] == OutboxStatus.failed
+
+
+def test_relay_refuses_internal_endpoint(db_session, feed_org, test_user, monkeypatch):
+    queue_user_changes(db_session, feed_org, test_user, 1)
+    monkeypatch.setattr("app.utils.urls.resolve", lambda host, port: ["10.0.0.7"])
+    posted = []
+    relay = relay_with(lambda request: posted.append(request) or httpx.Response(200))
+    assert relay.relay_once() == 0
+    relay.close()
+
+    db_session.expire_all()
+    assert posted == []
+    assert "private" in db_session.query(OutboxEvent).one().last_error
@@ -0,0 +1,177 @@
+"""
+Event Parking Tests
+
+This suite focuses on events that arrive before an entity they refer to.
+
+Coverage Summary:
+- A subscription event for an unsynced customer is parked, not logged, and re-enqueued when the customer is created.
+- A dependency synced while the event was being parked releases it right away.
+- Parked events past their TTL are logged as failed and counted in the parked gauge sweep.
+- Events whose release failed are released by the sweep instead of expiring.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.core.enums import EventDependency, ServiceType, WebhookStatus
+from app.core.metrics import PARKED_EVENTS
+from app.models.parked_event import ParkedEvent
+from app.models.user import User
+from app.models.webhooks import WebhookLog
+from app.schemas.external_api_responses import (
+    ExternalSubscriptionSuccessResponse,
+    ExternalUserSuccessResponse,
+)
+from app.schemas.webhooks import PaymentServiceEvent, UserServiceEvent
+from app.services import sync_payment_service, sync_user_service, tasks
+from app.services.parking import (
+    MissingDependency,
+    expire_parked,
+    observe_parked,
+    park_event,
+    release_synced,
+)
+from app.services.sync_user_service import sync_user
+from tests.data.sample_webhook_events import payment_event, user_event
+
+CUSTOMER_ID = "cust_parked_001"
+
+subscription_event = {
+    **payment_event,
+    "event_id": "evt_park_sub_001",
+    "organization_id": "org_001",
+    "data": {**payment_event["data"], "customer_id": CUSTOMER_ID},
+}
+subscription_response = ExternalSubscriptionSuccessResponse(
+    status="success",
+    data={
+        "subscription_id": payment_event["data"]["subscription_id"],
+        "customer_id": CUSTOMER_ID,
+        "plan": "professional",
+        "status": "active",
+        "current_period_start": None,
+        "current_period_end": None,
+        "amount": 299.99,
+        "currency": "USD",
+        "payment_method": None,
+    },
+)
+
+
+@pytest.fixture
+def parking_db(db_session, monkeypatch, test_org):
+    monkeypatch.setattr(sync_payment_service, "SessionLocal", lambda: db_session)
+    monkeypatch.setattr(sync_user_service, "SessionLocal", lambda: db_session)
+    yield db_session
+    db_session.query(ParkedEvent).delete()
+    db_session.query(WebhookLog).filter(WebhookLog.event_id.like("evt_park%")).delete(
+        synchronize_session=False
+    )
+    db_session.commit()
+
+
+def park_subscription_event(db) -> bool:
+    return tasks.sync_or_park(
+        db,
+        subscription_event,
+        ServiceType.PAYMENT,
+        PaymentServiceEvent(**subscription_event),
+        subscription_response,
+    )
+
+
+def create_customer():
+    event = {
+        **user_event,
+        "event_id": "evt_park_user_001",
+        "data": {**user_event["data"], "user_id": CUSTOMER_ID},
+    }
+    response = ExternalUserSuccessResponse(
+        status="success",
+        data={
+            **user_event["data"],
+            "user_id": CUSTOMER_ID,
+            "manager_id": None,
+            "last_updated": None,
+        },
+    )
+    sync_user(UserServiceEvent(**event), response)
+
+
+def test_event_parked_until_customer_is_synced(parking_db):
+    with patch("app.services.parking.requeue_event") as requeue:
+        assert park_subscription_event(parking_db) is False
+        requeue.assert_not_called()
+
+        parked = parking_db.query(ParkedEvent).one()
+        assert (parked.dependency, parked.dependency_key) == (
+            EventDependency.customer,
+            CUSTOMER_ID,
+        )
+        assert parked.payload == subscription_event
+
+        create_customer()
+
+    requeue.assert_called_once_with(subscription_event, ServiceType.PAYMENT)
+    assert parking_db.query(ParkedEvent).count() == 0
+
+
+def test_dependency_synced_while_parking_releases_at_once(parking_db):
+    create_customer()
+    customer = parking_db.query(User).filter_by(external_id=CUSTOMER_ID).one()
+
+    with patch("app.services.parking.requeue_event") as requeue:
+        park_event(
+            parking_db,
+            subscription_event,
+            ServiceType.PAYMENT,
+            MissingDependency(EventDependency.customer, customer.external_id),
+        )
+
+    requeue.assert_called_once()
+    assert parking_db.query(ParkedEvent).count() == 0
+
+
+def test_expired_parked_event_is_logged_as_failed(parking_db):
+    park_subscription_event(parking_db)
+    parking_db.query(ParkedEvent).update(
+        {ParkedEvent.expires_at: datetime.now(timezone.utc) - timedelta(seconds=1)}
+    )
+    parking_db.commit()
+
+    with patch("app.services.parking.requeue_event") as requeue:
+        assert expire_parked(parking_db) == 1
+        create_customer()
+
+    requeue.assert_not_called()
+    log = parking_db.query(WebhookLog).filter_by(event_id="evt_park_sub_001").one()
+    assert log.status == WebhookStatus.failed
+    assert log.payload["data"]["customer_id"] == CUSTOMER_ID
+
+    observe_parked(parking_db)
+    assert PARKED_EVENTS.labels("customer")._value.get() == 0
+
+
+def test_failed_release_is_retried_by_the_sweep(parking_db):
+    park_subscription_event(parking_db)
+    with patch(
+        "app.services.parking.requeue_event", side_effect=ConnectionError("down")
+    ):
+        create_customer()
+    assert parking_db.query(ParkedEvent).count() == 1
+
+    parking_db.query(ParkedEvent).update(
+        {ParkedEvent.expires_at: datetime.now(timezone.utc) - timedelta(seconds=1)}
+    )
+    parking_db.commit()
+    with patch("app.services.parking.requeue_event") as requeue:
+        assert expire_parked(parking_db) == 0
+        assert release_synced(parking_db) == 1
+
+    requeue.assert_called_once_with(subscription_event, ServiceType.PAYMENT)
+    assert parking_db.query(ParkedEvent).count() == 0
+    assert (
+        parking_db.query(WebhookLog).filter_by(event_id="evt_park_sub_001").count() == 0
+    )
@@ -0,0 +1,146 @@
+"""
+Task Payload Tests
+
+This suite focuses on keeping broker messages small.
+
+Coverage Summary:
+- The `+zlib` serializers compress only messages above the threshold and round-trip both forms.
+- Selecting msgpack without the package installed fails fast.
+- Large events are offloaded to Redis once and enqueued by reference; small ones stay inline.
+- process_event resolves references, and logs events whose stored payload expired as failed.
+- Offloading falls back to inline events when Redis is unavailable.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from kombu.serialization import dumps, loads, prepare_accept_content
+from redis.exceptions import ConnectionError
+
+from app.core.config import settings
+from app.core.enums import ServiceType, WebhookStatus
+from app.core.serialization import ACCEPTED_SERIALIZERS, task_serializer
+from app.services.payloads import PAYLOAD_REF, offload_event, resolve_event
+from app.services.tasks import process_event
+from tests.data.sample_webhook_events import communication_event
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+
+class DownRedis:
+    def set(self, *args, **kwargs):
+        raise ConnectionError("Redis is down")
+
+
+def large_event():
+    return {
+        **communication_event,
+        "data": {**communication_event["data"], "template": "t" * 2000},
+    }
+
+
+@pytest.fixture
+def redis_store():
+    fake = FakeRedis()
+    with (
+        patch("app.services.payloads.get_broker_redis", return_value=fake),
+        patch.object(settings, "PAYLOAD_OFFLOAD_THRESHOLD_BYTES", 1000),
+    ):
+        yield fake
+
+
+@pytest.mark.parametrize("size, flag", [(10, b"\x00"), (5000, b"\x01")])
+def test_compressed_serializer_round_trips(size, flag):
+    data = {"event": {"data": "x" * size}}
+    with patch.object(settings, "CELERY_COMPRESSION_THRESHOLD_BYTES", 1024):
+        content_type, encoding, body = dumps(data, serializer="json+zlib")
+
+    assert body[:1] == flag
+    if size > 1024:
+        assert len(body) < size
+    accept = prepare_accept_content(ACCEPTED_SERIALIZERS)
+    assert loads(body, content_type, encoding, accept=accept) == data
+
+
+def test_task_serializer_setting():
+    with patch.object(settings, "CELERY_COMPRESSION_THRESHOLD_BYTES", 1024):
+        assert task_serializer() == "json+zlib"
+    assert task_serializer() == "json"
+
+    with (
+        patch.object(settings, "CELERY_TASK_SERIALIZER", "msgpack"),
+        patch.dict("sys.modules", {"msgpack": None}),
+    ):
+        with pytest.raises(RuntimeError):
+            task_serializer()
+
+
+@pytest.mark.asyncio
+async def test_large_event_is_enqueued_by_reference(client, redis_store):
+    large = large_event()
+
+    with patch("app.services.tasks.process_event.apply_async") as mocked_apply:
+        for payload in (large, large, communication_event):
+            resp = await client.post("/webhooks/communication-service", json=payload)
+            assert resp.status_code == 202
+
+    offloaded, repeated, small = [
+        call.args[0][0] for call in mocked_apply.call_args_list
+    ]
+    assert offloaded == repeated
+    assert offloaded == {
+        PAYLOAD_REF: offloaded[PAYLOAD_REF],
+        "event_id": large["event_id"],
+        "organization_id": large["organization_id"],
+    }
+    assert len(redis_store.values) == 1
+    assert resolve_event(offloaded)["data"]["template"] == "t" * 2000
+    assert PAYLOAD_REF not in small
+
+
+def test_process_event_resolves_reference(redis_store):
+    large = large_event()
+    message = offload_event(large)
+    assert PAYLOAD_REF in message
+
+    with (
+        patch("app.services.tasks.check_if_event_processed", return_value=False),
+        patch("app.services.tasks.sync_communication") as mocked_sync,
+        patch("app.services.tasks.create_webhook_log") as mocked_log,
+    ):
+        process_event(message, ServiceType.COMMUNICATION.value)
+
+        parsed = mocked_sync.call_args.args[0]
+        assert parsed.event_id == large["event_id"]
+        assert mocked_log.call_args.kwargs["payload"]["data"]["template"] == "t" * 2000
+
+        redis_store.values.clear()
+        mocked_sync.reset_mock()
+        process_event(message, ServiceType.COMMUNICATION.value)
+        mocked_sync.assert_not_called()
+        failed = mocked_log.call_args.kwargs
+        assert failed["status"] == WebhookStatus.failed
+        assert failed["event_id"] == large["event_id"]
+        assert failed["org_id"] == large["organization_id"]
+        assert failed["payload"] == message
+
+
+def test_offload_falls_back_inline_when_redis_is_down():
+    large = large_event()
+    with (
+        patch("app.services.payloads.get_broker_redis", return_value=DownRedis()),
+        patch.object(settings, "PAYLOAD_OFFLOAD_THRESHOLD_BYTES", 1000),
+    ):
+        assert offload_event(large) is large
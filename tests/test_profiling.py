@@ -0,0 +1,252 @@
+"""
+Profiling Tests
+
+This suite focuses on the admin-armed profiling switch and slow-task capture.
+
+Coverage Summary:
+- Only superadmins can arm, list and disarm profiling.
+- Arming validates the target and format.
+- An armed service profiles exactly its next N tasks, as pstats or collapsed stacks.
+- An armed route profiles its next request as collapsed stacks.
+- Tasks slower than PROFILE_SLOW_TASK_SECONDS are captured without arming.
+- Profiling stays off when Redis is unavailable.
+- The armed set is polled on a background thread, never by the caller.
+"""
+
+import pstats
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.core.config import settings
+from app.core.enums import ProfileFormat, ProfileTarget, ServiceType
+from app.core.profiling import profiling_switch
+from app.services.tasks import process_event
+from tests.data.sample_webhook_events import communication_event, user_event
+
+
+class FakeRedis:
+    """
+    The handful of hash commands the switch uses, kept in memory.
+    """
+
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field.encode()] = str(value).encode()
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field.encode())
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        value = int(fields.get(field.encode(), 0)) + amount
+        fields[field.encode()] = str(value).encode()
+        return value
+
+    def hdel(self, key, field):
+        self.hashes.get(key, {}).pop(field.encode(), None)
+
+    def expire(self, key, seconds):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.calls.append((name, args))
+
+        return queue
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.calls]
+
+
+class DownRedis:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("Redis is down")
+
+        return fail
+
+
+@pytest.fixture
+def profiles(tmp_path):
+    fake = FakeRedis()
+    profiling_switch.reset()
+    with (
+        patch("app.core.profiling.get_redis", return_value=fake),
+        patch.object(settings, "PROFILE_DIR", str(tmp_path)),
+        patch.object(settings, "PROFILE_SAMPLE_INTERVAL_SECONDS", 0.001),
+    ):
+        yield tmp_path
+    profiling_switch.reset()
+
+
+async def login(client, email, password):
+    resp = await client.post(
+        "/users/login", data={"username": email, "password": password}
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def run_communication_task(db_session, delay=0.0):
+    with (
+        patch(
+            "app.services.tasks.sync_communication",
+            side_effect=lambda event: time.sleep(delay),
+        ),
+        patch("app.services.tasks.check_if_event_processed", return_value=False),
+        patch("app.services.tasks.create_webhook_log"),
+        patch("app.services.tasks.SessionLocal", return_value=db_session),
+        patch.object(db_session, "close"),
+    ):
+        process_event.apply(args=(communication_event, ServiceType.COMMUNICATION.value))
+
+
+@pytest.mark.asyncio
+async def test_superadmin_arms_lists_and_disarms(client, superadmin_user, profiles):
+    headers = await login(
+        client, settings.INITIAL_SUPERADMIN_EMAIL, settings.INITIAL_SUPERADMIN_PASSWORD
+    )
+
+    resp = await client.post(
+        "/profiling/",
+        json={"kind": "service", "target": "payment_service", "count": 3},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    assert resp.json()["format"] == "collapsed"
+
+    resp = await client.get("/profiling/", headers=headers)
+    assert resp.json() == [
+        {
+            "kind": "service",
+            "target": "payment_service",
+            "remaining": 3,
+            "format": "collapsed",
+        }
+    ]
+
+    resp = await client.delete(
+        "/profiling/",
+        params={"kind": "service", "target": "payment_service"},
+        headers=headers,
+    )
+    assert resp.status_code == 204
+    assert (await client.get("/profiling/", headers=headers)).json() == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"kind": "service", "target": "fax_service"},
+        {"kind": "route", "target": "/webhooks/user-service", "format": "pstats"},
+    ],
+)
+async def test_arm_rejects_invalid_targets(client, superadmin_user, profiles, body):
+    headers = await login(
+        client, settings.INITIAL_SUPERADMIN_EMAIL, settings.INITIAL_SUPERADMIN_PASSWORD
+    )
+    resp = await client.post("/profiling/", json=body, headers=headers)
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_admin_cannot_arm_profiling(client, initial_admin_user, profiles):
+    headers = await login(
+        client, settings.INITIAL_ADMIN_EMAIL, settings.INITIAL_ADMIN_PASSWORD
+    )
+    resp = await client.post(
+        "/profiling/",
+        json={"kind": "service", "target": "user_service"},
+        headers=headers,
+    )
+    assert resp.status_code == 403
+
+
+def test_armed_service_profiles_next_n_tasks(db_session, profiles):
+    profiling_switch.arm(
+        ProfileTarget.service,
+        ServiceType.COMMUNICATION.value,
+        1,
+        ProfileFormat.pstats,
+    )
+
+    run_communication_task(db_session)
+    run_communication_task(db_session)
+
+    written = list(profiles.glob("task-communication_service-*.prof"))
+    assert len(written) == 1
+    functions = {name for _, _, name in pstats.Stats(str(written[0])).stats}
+    assert "run_event" in functions
+    assert profiling_switch.armed() == []
+
+
+def test_slow_task_is_captured_without_arming(db_session, profiles):
+    with patch.object(settings, "PROFILE_SLOW_TASK_SECONDS", 0.05):
+        run_communication_task(db_session)
+        assert list(profiles.iterdir()) == []
+
+        run_communication_task(db_session, delay=0.1)
+
+    (written,) = profiles.glob("task-communication_service-*.collapsed")
+    stacks = written.read_text().splitlines()
+    assert any("run_event" in line for line in stacks)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+
+
+@pytest.mark.asyncio
+async def test_armed_route_profiles_next_request(client, profiles):
+    profiling_switch.arm(
+        ProfileTarget.route, "/webhooks/user-service", 1, ProfileFormat.collapsed
+    )
+
+    with patch("app.services.tasks.process_event.apply_async"):
+        resp = await client.post("/webhooks/user-service", json=user_event)
+        assert resp.status_code == 202
+
+    (written,) = profiles.glob("route-webhooks_user-service-*.collapsed")
+    assert written.exists()
+
+
+def test_profiling_is_off_when_redis_is_down(tmp_path):
+    profiling_switch.reset()
+    with patch("app.core.profiling.get_redis", return_value=DownRedis()):
+        profiling_switch._armed = {"service:user_service": 1}
+        profiling_switch._next_poll_at = time.monotonic() + 60
+        assert profiling_switch.claim(ProfileTarget.service, "user_service") is None
+        assert profiling_switch.claim(ProfileTarget.service, "user_service") is None
+    profiling_switch.reset()
+
+
+def test_armed_set_is_polled_in_the_background(profiles):
+    polled_from = []
+
+    class WatchedRedis(FakeRedis):
+        def hgetall(self, key):
+            polled_from.append(threading.get_ident())
+            return {b"route:/users/me": b"1"}
+
+    with patch("app.core.profiling.get_redis", return_value=WatchedRedis()):
+        profiling_switch.is_armed(ProfileTarget.route, "/users/me")
+        with profiling_switch._polling:
+            pass
+
+    assert polled_from and threading.get_ident() not in polled_from
+    assert profiling_switch.is_armed(ProfileTarget.route, "/users/me")
@@ -8,6 +8,8 @@ Coverage Summary:
 - Confirms correct 429 Too Many Requests response is returned when limit is exceeded.
 - Ensures rate limiting integrates properly with authentication (JWT-protected routes).
 - Uses patching to bypass Celery task execution, focusing purely on request-level rate limit behavior.
+- Verifies batches are charged per event, and that budgets are keyed by organization and service.
+- Verifies a rejected batch hands back what its other tenants were charged.
 
 Highlights:
 - Fully tests the end-to-end rate limiting logic (from request count tracking to blocking).
@@ -15,13 +17,14 @@ Highlights:
 - Ensures real-world simulation of repeated requests from the same authenticated client.
 """
 
+import copy
 from unittest.mock import patch
 
 import pytest
 from fastapi import status
 
 from app.core.config import settings
-from tests.data.sample_webhook_events import communication_event
+from tests.data.sample_webhook_events import communication_event, user_event
 
 
 @pytest.mark.asyncio
@@ -53,3 +56,75 @@ async def test_rate_limit_exceeded(client, superadmin_user, test_org):
         )
         assert resp.status_code == status.HTTP_429_TOO_MANY_REQUESTS
         assert "Rate limit exceeded" in resp.text
+
+
+def make_batch(event: dict, count: int, organization_id: str) -> dict:
+    events = []
+    for i in range(count):
+        item = copy.deepcopy(event)
+        item["event_id"] = f"{event['event_id']}_{organization_id}_{i}"
+        item["organization_id"] = organization_id
+        events.append(item)
+    return {"events": events}
+
+
+@pytest.mark.asyncio
+async def test_batch_is_charged_per_event(client):
+    limit = settings.WEBHOOK_RATE_LIMIT_COUNT
+
+    with patch("app.services.tasks.process_event.apply_async") as mocked_apply:
+        resp = await client.post(
+            "/webhooks/user-service",
+            json=make_batch(user_event, limit + 1, "org_batch"),
+        )
+        assert resp.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(resp.headers["retry-after"]) >= 1
+        mocked_apply.assert_not_called()
+
+        resp = await client.post(
+            "/webhooks/user-service", json=make_batch(user_event, limit, "org_batch")
+        )
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+
+        resp = await client.post(
+            "/webhooks/user-service", json=make_batch(user_event, 1, "org_batch")
+        )
+        assert resp.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_budgets_are_keyed_by_organization_and_service(client):
+    limit = settings.WEBHOOK_RATE_LIMIT_COUNT
+
+    with patch("app.services.tasks.process_event.apply_async"):
+        resp = await client.post(
+            "/webhooks/user-service", json=make_batch(user_event, limit, "org_a")
+        )
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+
+        resp = await client.post(
+            "/webhooks/user-service", json=make_batch(user_event, limit, "org_b")
+        )
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+
+        resp = await client.post(
+            "/webhooks/communication-service",
+            json=make_batch(communication_event, 1, "org_a"),
+        )
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_hands_back_other_tenants_budget(client):
+    limit = settings.WEBHOOK_RATE_LIMIT_COUNT
+
+    with patch("app.services.tasks.process_event.apply_async"):
+        batch = make_batch(user_event, 1, "org_a")
+        batch["events"] += make_batch(user_event, limit + 1, "org_b")["events"]
+        resp = await client.post("/webhooks/user-service", json=batch)
+        assert resp.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        resp = await client.post(
+            "/webhooks/user-service", json=make_batch(user_event, limit, "org_a")
+        )
+        assert resp.status_code == status.HTTP_202_ACCEPTED
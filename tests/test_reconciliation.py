@@ -0,0 +1,198 @@
+"""
+User Reconciliation Tests
+
+This suite focuses on resyncing an organization's users from the external directory.
+
+Coverage Summary:
+- Pages are fetched concurrently and only new or changed users are written.
+- Users owned by another organization, or emails held by another user or repeated on a page, are counted as conflicts.
+- A failed run keeps its checkpoint and the next run resumes from it.
+- A run another worker is still checkpointing is left alone.
+- Incremental sync reads only users changed since the watermark and resumes from it after a failure.
+- Directory users without last_updated are counted as conflicts and do not hold the watermark back.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.enums import ReconciliationStatus, ServiceType, UserStatus
+from app.models.reconciliation import UserReconciliation
+from app.models.sync_watermark import SyncWatermark
+from app.models.user import User
+from app.services.external_mocks.user_service import directory_user, list_users
+from app.services.reconciliation import reconcile_org, sync_changed_users
+
+
+@pytest.fixture(autouse=True)
+def small_directory():
+    with (
+        patch.object(settings, "EXTERNAL_MOCK_DIRECTORY_SIZE", 25),
+        patch.object(settings, "RECONCILE_PAGE_SIZE", 10),
+        patch.object(settings, "RECONCILE_PAGE_CONCURRENCY", 2),
+        patch.object(settings, "RECONCILE_FETCH_RETRIES", 0),
+    ):
+        yield
+
+
+def org_users(db_session, org):
+    return db_session.query(User).filter(User.org_id == org.id).count()
+
+
+def test_reconcile_writes_only_changes(db_session, test_org, test_user):
+    stale = directory_user(test_org.slug, 3)
+    current = directory_user(test_org.slug, 4)
+    taken = directory_user(test_org.slug, 5)
+    for user, last_name in ((stale, "Stale"), (current, current.last_name)):
+        db_session.add(
+            User(
+                external_id=user.user_id,
+                email=user.email,
+                first_name=user.first_name,
+                last_name=last_name,
+                status=UserStatus.active,
+                org_id=test_org.id,
+            )
+        )
+    test_user.email = taken.email
+    db_session.commit()
+
+    run = reconcile_org(db_session, test_org.id)
+
+    assert run.status == ReconciliationStatus.completed
+    assert (run.next_page, run.total_pages) == (4, 3)
+    assert run.fetched_count == 25
+    assert (run.created_count, run.updated_count, run.conflict_count) == (22, 1, 1)
+    assert org_users(db_session, test_org) == 25
+    db_session.expire_all()
+    updated = db_session.query(User).filter_by(external_id=stale.user_id).one()
+    assert updated.last_name == stale.last_name
+
+    again = reconcile_org(db_session, test_org.id)
+    assert again.id != run.id
+    assert (again.created_count, again.updated_count) == (0, 0)
+
+
+def test_repeated_email_on_a_page_is_a_conflict(db_session, test_org):
+    def shared_email_directory_user(organization_id, index):
+        user = directory_user(organization_id, index)
+        if index in (11, 12):
+            user.email = directory_user(organization_id, 10).email
+        return user
+
+    with patch(
+        "app.services.external_mocks.user_service.directory_user",
+        shared_email_directory_user,
+    ):
+        run = reconcile_org(db_session, test_org.id)
+
+    assert run.status == ReconciliationStatus.completed
+    assert (run.created_count, run.conflict_count) == (23, 2)
+    assert org_users(db_session, test_org) == 23
+
+
+def test_failed_run_resumes_from_checkpoint(db_session, test_org):
+    def flaky_list_users(organization_id, page, per_page):
+        if page == 3:
+            raise Exception("Directory unavailable")
+        return list_users(organization_id, page=page, per_page=per_page)
+
+    with patch("app.services.reconciliation.list_users", flaky_list_users):
+        failed = reconcile_org(db_session, test_org.id)
+
+    assert failed.status == ReconciliationStatus.failed
+    assert failed.next_page == 3
+    assert org_users(db_session, test_org) == 20
+
+    resumed = reconcile_org(db_session, test_org.id)
+    assert resumed.id == failed.id
+    assert resumed.status == ReconciliationStatus.completed
+    assert resumed.created_count == 25
+    assert org_users(db_session, test_org) == 25
+
+
+def test_running_reconciliation_is_not_taken_over(db_session, test_org):
+    db_session.add(
+        UserReconciliation(
+            org_id=test_org.id,
+            status=ReconciliationStatus.running,
+            next_page=2,
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+    db_session.commit()
+
+    assert reconcile_org(db_session, test_org.id) is None
+    assert org_users(db_session, test_org) == 0
+
+
+def watermark(db_session, org):
+    db_session.expire_all()
+    row = db_session.get(SyncWatermark, (org.id, ServiceType.USER))
+    return row.watermark_id
+
+
+def test_incremental_sync_reads_only_changes(db_session, test_org):
+    first = sync_changed_users(db_session, test_org.id)
+    assert first == {"fetched": 25, "created": 25, "updated": 0, "conflict": 0}
+    assert watermark(db_session, test_org) == directory_user(test_org.slug, 24).user_id
+
+    assert sync_changed_users(db_session, test_org.id)["fetched"] == 0
+
+    def renamed_directory_user(organization_id, index):
+        user = directory_user(organization_id, index)
+        if index in (3, 7):
+            user.last_name = "Renamed"
+            user.last_updated += timedelta(days=1)
+        return user
+
+    with patch(
+        "app.services.external_mocks.user_service.directory_user",
+        renamed_directory_user,
+    ):
+        changed = sync_changed_users(db_session, test_org.id)
+
+    assert changed == {"fetched": 2, "created": 0, "updated": 2, "conflict": 0}
+    assert watermark(db_session, test_org) == directory_user(test_org.slug, 7).user_id
+    assert db_session.query(User).filter_by(last_name="Renamed").count() == 2
+
+
+def test_failed_incremental_sync_resumes_from_watermark(db_session, test_org):
+    calls = []
+
+    def flaky_list_users(organization_id, page, per_page, **cursor):
+        calls.append(cursor["after_id"])
+        if len(calls) == 2:
+            raise Exception("Directory unavailable")
+        return list_users(organization_id, page=page, per_page=per_page, **cursor)
+
+    with patch("app.services.reconciliation.list_users", flaky_list_users):
+        assert sync_changed_users(db_session, test_org.id) is None
+
+    assert org_users(db_session, test_org) == 10
+    assert watermark(db_session, test_org) == directory_user(test_org.slug, 9).user_id
+
+    resumed = sync_changed_users(db_session, test_org.id)
+    assert resumed["fetched"] == 15
+    assert org_users(db_session, test_org) == 25
+
+
+def test_incremental_sync_skips_users_without_last_updated(db_session, test_org):
+    undated = directory_user(test_org.slug, 99)
+    undated.last_updated = None
+
+    def list_users_with_undated(organization_id, page, per_page, **cursor):
+        response = list_users(organization_id, page=page, per_page=per_page, **cursor)
+        response.data.users.append(undated)
+        return response
+
+    with patch(
+        "app.services.reconciliation.list_users", list_users_with_undated
+    ), patch.object(settings, "RECONCILE_PAGE_SIZE", 30):
+        counts = sync_changed_users(db_session, test_org.id)
+
+    assert counts == {"fetched": 26, "created": 25, "updated": 0, "conflict": 1}
+    assert watermark(db_session, test_org) == directory_user(test_org.slug, 24).user_id
+    assert db_session.query(User).filter_by(external_id=undated.user_id).count() == 0
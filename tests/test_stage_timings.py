@@ -0,0 +1,111 @@
+"""
+Stage Timing Tests
+
+This suite focuses on per-event pipeline timings and the latency report.
+
+Coverage Summary:
+- EventTimeline turns API and worker marks into per-stage milliseconds.
+- process_event stores the timings and received_at with the event's log row.
+- /webhook-logs/latency reports per-stage percentiles per service, scoped to the caller's org.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.enums import ServiceType, WebhookStatus
+from app.models.integration_health import IntegrationHealth
+from app.models.webhooks import WebhookLog
+from app.services.tasks import process_event
+from app.services.webhook_log_helpers import create_webhook_log
+from app.utils.timeline import STAGES, EventTimeline
+from tests.data.sample_webhook_events import communication_event
+
+
+def test_timeline_stage_durations():
+    timeline = EventTimeline(received_at=100.0, enqueued_at=100.25)
+    timeline.marks.update(started=102.25, external_done=102.75, committed=102.8)
+
+    assert timeline.stage_ms() == [250, 2000, 500, 50]
+    assert timeline.received_at.timestamp() == 100.0
+
+
+def test_timeline_without_external_call_or_headers():
+    timeline = EventTimeline()
+    timeline.marks.update(started=10.0, committed=10.1)
+
+    assert timeline.stage_ms() == [None, None, None, 100]
+    assert timeline.received_at is None
+
+
+def test_process_event_stores_stage_timings(db_session):
+    db_session.query(WebhookLog).delete()
+    db_session.commit()
+
+    with (
+        patch("app.services.tasks.check_if_event_processed", return_value=False),
+        patch("app.services.tasks.sync_communication"),
+        patch("app.services.tasks.SessionLocal", return_value=db_session),
+        patch.object(db_session, "close"),
+    ):
+        process_event(communication_event, ServiceType.COMMUNICATION.value)
+
+    log = (
+        db_session.query(WebhookLog)
+        .filter_by(event_id=communication_event["event_id"])
+        .one()
+    )
+    assert len(log.stage_ms) == len(STAGES)
+    assert log.stage_ms[-1] is not None
+    assert log.received_at is not None
+
+
+@pytest.mark.asyncio
+async def test_latency_report_per_stage_and_service(
+    client, db_session, initial_admin_user, test_org
+):
+    db_session.query(WebhookLog).delete()
+    db_session.query(IntegrationHealth).delete()
+    db_session.commit()
+
+    for i in range(1, 101):
+        create_webhook_log(
+            db=db_session,
+            event_id=f"evt_latency_{i}",
+            service=ServiceType.USER,
+            org_id=test_org.slug,
+            status=WebhookStatus.processed,
+            payload={},
+            stage_ms=[1, i, None, 2],
+        )
+    create_webhook_log(
+        db=db_session,
+        event_id="evt_latency_other_org",
+        service=ServiceType.USER,
+        org_id="someone_else",
+        status=WebhookStatus.processed,
+        payload={},
+        stage_ms=[1, 100_000, None, 2],
+    )
+
+    login_resp = await client.post(
+        "/users/login",
+        data={
+            "username": settings.INITIAL_ADMIN_EMAIL,
+            "password": settings.INITIAL_ADMIN_PASSWORD,
+        },
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+    resp = await client.get("/webhook-logs/latency", headers=headers)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert set(report) == {ServiceType.USER.value}
+
+    queue = report[ServiceType.USER.value]["queue"]
+    assert queue["count"] == 100
+    assert queue["p50"] == pytest.approx(50.5)
+    assert queue["p99"] == pytest.approx(99.01)
+    assert report[ServiceType.USER.value]["external"]["count"] == 0
+    assert report[ServiceType.USER.value]["total"]["p50"] == pytest.approx(53.5)
@@ -0,0 +1,51 @@
+"""
+Task Result Tests
+
+This suite focuses on keeping process_event fire-and-forget.
+
+Coverage Summary:
+- By default process_event ignores its result and does not track STARTED.
+- Run the way a worker runs it, the task writes nothing to the result backend.
+- Re-enabling results and state tracking brings back both writes.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from celery.app.trace import build_tracer
+
+from app.core.config import settings
+from app.services.tasks import process_event
+from app.worker import celery_app
+
+
+def run_like_worker():
+    with (
+        patch.object(celery_app.backend, "store_result") as mocked_store,
+        patch("app.services.tasks.run_event"),
+    ):
+        tracer = build_tracer(process_event.name, process_event, app=celery_app)
+        tracer("task-1", ({"event_id": "evt_1"}, "user_service"), {}, {"headers": {}})
+    return [call.args[2] for call in mocked_store.call_args_list]
+
+
+def test_results_ignored_by_default():
+    assert settings.CELERY_IGNORE_RESULTS and not settings.CELERY_TRACK_STARTED
+    assert process_event.ignore_result is True
+    assert process_event.track_started is False
+    assert run_like_worker() == []
+
+
+@pytest.mark.parametrize(
+    "ignore_result, track_started, expected",
+    [
+        (False, False, ["SUCCESS"]),
+        (False, True, ["STARTED", "SUCCESS"]),
+    ],
+)
+def test_results_can_be_re_enabled(ignore_result, track_started, expected):
+    with (
+        patch.object(process_event, "ignore_result", ignore_result),
+        patch.object(process_event, "track_started", track_started),
+    ):
+        assert run_like_worker() == expected
@@ -0,0 +1,134 @@
+"""
+Tracing Tests
+
+This suite focuses on trace propagation from the webhook request through the Celery task to SQL.
+
+Coverage Summary:
+- traceparent parsing follows the W3C format.
+- The enqueue span injects its traceparent into the task headers, under the HTTP request's trace.
+- process_event continues the trace from its headers, with stage and SQL child spans tagged with the correlation id.
+- Unsampled traces record nothing.
+- The file exporter writes OTLP/JSON documents.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.enums import ServiceType
+from app.core.tracing import Span, SpanExporter, parse_traceparent, tracer
+from app.services.tasks import process_event
+from tests.data.sample_webhook_events import communication_event, user_event
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class CollectingExporter(SpanExporter):
+    def __init__(self):
+        super().__init__()
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def spans():
+    exporter = CollectingExporter()
+    with (
+        patch.object(settings, "TRACING_ENABLED", True),
+        patch.object(settings, "TRACE_SAMPLE_RATIO", 1.0),
+        patch.object(tracer, "exporter", exporter),
+    ):
+        yield exporter.spans
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (
+        TRACE_ID,
+        PARENT_ID,
+        True,
+    )
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00")[2] is False
+    assert parse_traceparent("garbage") is None
+
+
+@pytest.mark.asyncio
+async def test_webhook_propagates_trace_into_task_headers(client, spans):
+    with patch("app.services.tasks.process_event.apply_async") as mocked_apply:
+        resp = await client.post(
+            "/webhooks/user-service",
+            json=user_event,
+            headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+        )
+        assert resp.status_code == 202
+
+    traceparent = mocked_apply.call_args.kwargs["headers"]["traceparent"]
+    assert traceparent.split("-")[1] == TRACE_ID
+
+    by_name = {span.name: span for span in spans}
+    http_span = by_name["HTTP POST /webhooks/user-service"]
+    enqueue_span = by_name["celery.enqueue"]
+    assert http_span.parent_id == PARENT_ID
+    assert enqueue_span.parent_id == http_span.span_id
+    assert traceparent.split("-")[2] == enqueue_span.span_id
+    assert enqueue_span.attributes["correlation_id"] == (
+        user_event["metadata"]["correlation_id"]
+    )
+
+
+def test_task_continues_trace_with_stage_and_sql_spans(db_session, spans):
+    with (
+        patch("app.services.tasks.sync_communication"),
+        patch("app.services.tasks.SessionLocal", return_value=db_session),
+        patch.object(db_session, "close"),
+    ):
+        process_event.apply(
+            args=(communication_event, ServiceType.COMMUNICATION.value),
+            headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+        )
+
+    assert spans and all(span.trace_id == TRACE_ID for span in spans)
+    task_span = next(span for span in spans if span.name == "process_event")
+    assert task_span.parent_id == PARENT_ID
+
+    names = {span.name for span in spans}
+    assert {"process_event.parse", "process_event.sync", "process_event.log"} <= names
+    sql_spans = [span for span in spans if span.name == "db.query"]
+    assert sql_spans
+    assert "webhook_logs" in " ".join(s.attributes["db.statement"] for s in sql_spans)
+    assert task_span.attributes["correlation_id"] == (
+        communication_event["metadata"]["correlation_id"]
+    )
+
+
+def test_unsampled_trace_records_nothing(spans):
+    with tracer.start_span("root", traceparent=f"00-{TRACE_ID}-{PARENT_ID}-00") as span:
+        assert span.traceparent.endswith("-00")
+        with tracer.start_span("child"):
+            pass
+    assert spans == []
+
+
+def test_file_exporter_writes_otlp_json(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    span = Span(
+        name="unit",
+        trace_id=TRACE_ID,
+        span_id=PARENT_ID,
+        parent_id=None,
+        sampled=True,
+        attributes={"service": "user_service", "retries": 0},
+        end_ns=1,
+    )
+
+    with patch.object(settings, "TRACE_FILE_PATH", str(path)):
+        SpanExporter().write([span])
+
+    document = json.loads(path.read_text().splitlines()[0])
+    written = document["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert written["traceId"] == TRACE_ID
+    assert {"key": "retries", "value": {"intValue": "0"}} in written["attributes"]
@@ -0,0 +1,140 @@
+"""
+Bulk User Import Tests
+
+This suite focuses on POST /users/import.
+
+Coverage Summary:
+- NDJSON rows are imported in chunks; invalid rows, repeated and registered emails are reported without stopping the import.
+- One audit entry with the import's counts is written for the whole import.
+- A streamed CSV body with a BOM is decoded across chunk boundaries.
+- Rows end at newlines only, so values may contain U+2028 and other line separators.
+- A CSV body without an email column is rejected before anything is imported.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.enums import AuditAction, ExportFormat, UserRole, UserStatus
+from app.models.audit_log import AuditLog
+from app.models.user import User
+from app.services.user_import import iter_lines, iter_records
+
+
+async def admin_headers(client):
+    resp = await client.post(
+        "/users/login",
+        data={
+            "username": settings.INITIAL_ADMIN_EMAIL,
+            "password": settings.INITIAL_ADMIN_PASSWORD,
+        },
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def test_iter_lines_splits_across_chunks():
+    body = "﻿email,first_name\r\nzoë@example.com,Zoë\nlast@example.com,Last".encode()
+    chunks = [body[i : i + 3] for i in range(0, len(body), 3)]
+    assert list(iter_lines(chunks)) == [
+        "email,first_name\r\n",
+        "zoë@example.com,Zoë\n",
+        "last@example.com,Last",
+    ]
+
+
+@pytest.mark.parametrize(
+    "import_format, body",
+    [
+        (
+            ExportFormat.ndjson,
+            json.dumps(
+                {"email": "a@b.co", "first_name": "A\u2028B\x0cC"}, ensure_ascii=False
+            )
+            + "\n",
+        ),
+        (ExportFormat.csv, "email,first_name\r\na@b.co,A\u2028B\x0cC\r\n"),
+    ],
+)
+def test_values_may_contain_line_separators(import_format, body):
+    records = list(iter_records([body.encode()], import_format))
+    assert [record for _, record in records] == [
+        {"email": "a@b.co", "first_name": "A\u2028B\x0cC"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_reports_row_errors(
+    client, db_session, initial_admin_user, test_org
+):
+    rows = [
+        {"email": "one@testorg.com", "password": "OnePass123!", "first_name": "One"},
+        {"email": "not-an-email"},
+        {"email": "two@testorg.com", "role": "admin", "department": "Engineering"},
+        {"email": "three@testorg.com", "role": "superadmin"},
+        {"email": "one@testorg.com"},
+        {"email": settings.INITIAL_ADMIN_EMAIL},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n[1, 2]\n\n"
+
+    with patch.object(settings, "USER_IMPORT_CHUNK_SIZE", 2):
+        resp = await client.post(
+            "/users/import", content=body, headers=await admin_headers(client)
+        )
+    assert resp.status_code == 200
+    result = resp.json()
+    assert (result["created"], result["failed"]) == (2, 5)
+    assert [error["row"] for error in result["errors"]] == [2, 4, 5, 6, 7]
+    assert result["errors"][2]["error"] == "Email already registered."
+
+    imported = {
+        user.email: user
+        for user in db_session.query(User).filter(User.org_id == test_org.id)
+    }
+    assert imported["one@testorg.com"].status == UserStatus.active
+    assert imported["one@testorg.com"].hashed_password
+    assert imported["two@testorg.com"].status == UserStatus.pending
+    assert imported["two@testorg.com"].role == UserRole.admin
+
+    audit = db_session.query(AuditLog).filter_by(action=AuditAction.IMPORTED_USERS)
+    entry = audit.one()
+    assert entry.user_id == initial_admin_user.id
+    assert entry.details == {"created": 2, "failed": 5, "format": "ndjson"}
+
+
+@pytest.mark.asyncio
+async def test_import_streamed_csv(client, db_session, initial_admin_user, test_org):
+    body = (
+        "﻿Email,First_Name,Password\r\n"
+        "csv1@testorg.com,Ann,AnnPass123!\r\n"
+        "csv2@testorg.com,,\r\n"
+    ).encode()
+
+    async def stream():
+        for i in range(0, len(body), 7):
+            yield body[i : i + 7]
+
+    resp = await client.post(
+        "/users/import?format=csv",
+        content=stream(),
+        headers=await admin_headers(client),
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"created": 2, "failed": 0, "errors": []}
+
+    ann = db_session.query(User).filter_by(email="csv1@testorg.com").one()
+    assert (ann.first_name, ann.org_id) == ("Ann", test_org.id)
+    blank = db_session.query(User).filter_by(email="csv2@testorg.com").one()
+    assert (blank.first_name, blank.status) == (None, UserStatus.pending)
+
+
+@pytest.mark.asyncio
+async def test_import_csv_requires_email_column(client, db_session, initial_admin_user):
+    resp = await client.post(
+        "/users/import?format=csv",
+        content="name\nNo Email\n",
+        headers=await admin_headers(client),
+    )
+    assert resp.status_code == 400
+    assert db_session.query(AuditLog).count() == 0